@@ -0,0 +1,203 @@
+# abfrageplaene.py
+# Zeigt für JEDE SQL-Abfrage, die das Programm macht, den EXPLAIN QUERY PLAN.
+#
+# Für dumme:
+# - Aufruf: python abfrageplaene.py
+# - Wir rufen alle Daten-Funktionen einmal auf und zeichnen dabei das SQL auf.
+# - Schreibende Funktionen laufen in einer Transaktion, die am Ende
+#   zurückgerollt wird -> in der DB ändert sich NICHTS.
+# - Steht irgendwo "SCAN <tabelle>" ohne Index, wird das markiert.
+
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+
+import datenbank
+from datenbank import abfragen_aufzeichnen, abfrageplan, ist_scan, transaktion
+
+
+ERWARTETE_SCANS = {
+    # Funktionen, die absichtlich ALLE Zeilen einer Tabelle lesen (komplette Liste)
+    "alle_tests",
+    # "die letzten N Tests": SCAN tests ORDER BY id DESC LIMIT N hört nach N Zeilen auf
+    "test_generieren",
+    # lädt absichtlich ALLE Fragen und Tests (Index für Auswertungen)
+    "fragenindex.laden",
+    # eine Zeile pro Kategorie (klein), bzw. alle Kategorien mit ihren Zahlen
+    "statistik.gesamt",
+    "kategorien_statistik",
+    # SCAN nur über die N Zeilen der Unterabfrage (Top-N kommt aus dem Index)
+    "meistbenutzte_fragen",
+    # alle Partner (eine Zeile pro anderer DB)
+    "sync.status",
+}
+
+
+class _Zurueckrollen(Exception):
+    """Nur intern: damit transaktion() am Ende ROLLBACK macht."""
+
+
+def _beispiel_ids():
+    """
+    Sucht vorhandene IDs, damit die Abfragen echte Werte bekommen.
+    Leere DB -> einfach 1 (der Plan hängt nicht von den Daten ab).
+    """
+
+    conn = datenbank.verbindung()
+
+    def erste(sql):
+        row = conn.execute(sql).fetchone()
+        return int(row[0]) if row and row[0] is not None else 1
+
+    return {
+        "kategorie": erste("SELECT MIN(id) FROM categories;"),
+        "frage": erste("SELECT MIN(id) FROM questions;"),
+        "test": erste("SELECT MIN(id) FROM tests;"),
+    }
+
+
+def _fremdes_delta_einspielen(abgleich):
+    """
+    Spielt ein kleines Delta "aus einer anderen DB" ein (neu, ändern, löschen),
+    damit die Pläne vom Import auch dabei sind.
+    """
+
+    saetze = [
+        {"format": abgleich.FORMAT, "version": abgleich.VERSION, "kennung": "__plan_check__", "von": 0, "bis": 1},
+        ["c", [None, 1], ["__plan_check__"]],
+        ["q", [None, 1], ["__plan_check__", "", [None, 1]]],
+        ["t", [None, 1], ["__plan_check__", None]],
+        ["tq", [[None, 1], [None, 1]], 1],
+        ["q", [None, 1], ["__plan_check__ (geändert)", "", [None, 1]]],
+        ["tq", [[None, 1], [None, 1]], None],
+        ["q", [None, 1], None],
+    ]
+    with tempfile.TemporaryDirectory() as ordner:
+        pfad = os.path.join(ordner, "delta.gz")
+        with gzip.open(pfad, "wt", encoding="utf-8") as f:
+            f.writelines(json.dumps(satz) + "\n" for satz in saetze)
+        abgleich.delta_importieren(pfad)
+
+
+def app_aufrufe():
+    """
+    Liste aller Daten-Funktionen mit Beispiel-Argumenten.
+    Rückgabe: Liste von (name, funktion_ohne_argumente, schreibt)
+    """
+
+    import abgleich
+    import duplikate
+    import fragen
+    import fragenindex
+    import kategorien
+    import rendern
+    import statistik
+    import testgenerator
+    import tests
+    import varianten
+
+    ids = _beispiel_ids()
+    k, q, t = ids["kategorie"], ids["frage"], ids["test"]
+    seq = max(0, abgleich.status()["seq"] - 5)
+
+    return [
+        ("alle_kategorien", kategorien.alle_kategorien, False),
+        ("kategorie_name", lambda: kategorien.kategorie_name(k), False),
+        ("kategorien_seite", lambda: kategorien.kategorien_seite("a", 20), False),
+        ("kategorie_anlegen", lambda: kategorien.kategorie_anlegen("__plan_check__"), True),
+        ("fragen_von_kategorie", lambda: fragen.fragen_von_kategorie(k), False),
+        ("fragen_von_kategorie_seite", lambda: fragen.fragen_von_kategorie_seite(k, q, 20), False),
+        ("frage_holen", lambda: fragen.frage_holen(q), False),
+        ("fragen_suchen", lambda: fragen.fragen_suchen("frage*"), False),
+        ("fragen_suchen+kategorie", lambda: fragen.fragen_suchen("frage*", category_id=k), False),
+        ("frage_anlegen", lambda: fragen.frage_anlegen("__plan_check__", "", k), True),
+        ("frage_update", lambda: fragen.frage_update(q, "__plan_check__", ""), True),
+        ("frage_update (version)", lambda: fragen.frage_update(q, "__plan_check__", "", version=fragen.frage_holen(q, mit_version=True)[4]), True),
+        ("fragen_update_mehrere", lambda: fragen.fragen_update_mehrere([(q, "__plan_check__", "")]), True),
+        ("duplikate.index_aktualisieren", lambda: (fragen.frage_update(q, "__plan_check__", ""), duplikate.index_aktualisieren()), True),
+        ("aehnliche_fragen", lambda: duplikate.aehnliche_fragen(q), False),
+        ("neue_duplikate", lambda: duplikate.neue_duplikate(10**9), False),
+        ("alle_tests", tests.alle_tests, False),
+        ("tests_seite", lambda: tests.tests_seite(t, 20), False),
+        ("test_holen", lambda: tests.test_holen(t), False),
+        ("test_anlegen", lambda: tests.test_anlegen("__plan_check__", None), True),
+        ("test_update", lambda: tests.test_update(t, "__plan_check__", None), True),
+        ("test_update (version)", lambda: tests.test_update(t, "__plan_check__", None, version=tests.test_holen(t, mit_version=True)[3]), True),
+        ("frage_zu_test", lambda: tests.frage_zu_test(t, q), True),
+        ("fragen_zu_test", lambda: tests.fragen_zu_test(t, [q, q + 1, 10**9]), True),
+        ("fragen_ids_von_test", lambda: tests.fragen_ids_von_test(t), False),
+        ("test_anzeigen", lambda: tests.test_anzeigen(t), False),
+        ("test_fragen_setzen", lambda: tests.test_fragen_setzen(t, [q]), True),
+        ("test_rendern", lambda: rendern.test_rendern(t, "html", mit_loesung=True), True),
+        ("varianten_erzeugen", lambda: varianten.varianten_erzeugen(t, 3, arbeiter=1), True),
+        ("variante_holen", lambda: varianten.variante_holen(t, 1), False),
+        ("varianten_von_test", lambda: varianten.varianten_von_test(t), False),
+        ("fragenindex.laden", fragenindex.laden, False),
+        ("frage_statistik", lambda: statistik.frage_statistik(q), False),
+        ("statistik.gesamt", statistik.gesamt, False),
+        ("kategorien_statistik", statistik.kategorien_statistik, False),
+        ("meistbenutzte_fragen", lambda: statistik.meistbenutzte_fragen(10), False),
+        ("unbenutzte_fragen_seite", lambda: statistik.unbenutzte_fragen_seite(q, 20), False),
+        ("sync.status", abgleich.status, False),
+        ("delta_exportieren", lambda: abgleich.delta_exportieren(os.devnull, seq), False),
+        ("delta_importieren", lambda: _fremdes_delta_einspielen(abgleich), True),
+        ("test_generieren", lambda: testgenerator.test_generieren("__plan_check__", None, [(k, 1)], seed=1, ohne_letzte_tests=3), True),
+    ]
+
+
+def plaene_sammeln():
+    """
+    Führt alle App-Aufrufe aus und sammelt die Pläne.
+    Rückgabe: Liste von (funktionsname, sql, [plan-zeilen])
+    """
+
+    ergebnis = []
+
+    for name, aufruf, schreibt in app_aufrufe():
+        with abfragen_aufzeichnen() as befehle:
+            if schreibt:
+                try:
+                    with transaktion():
+                        aufruf()
+                        raise _Zurueckrollen()
+                except (_Zurueckrollen, sqlite3.IntegrityError, ValueError):
+                    pass
+            else:
+                aufruf()
+
+        for sql in befehle:
+            ergebnis.append((name, sql, abfrageplan(sql)))
+
+    return ergebnis
+
+
+def _einzeilig(sql):
+    """SQL für die Ausgabe auf eine Zeile bringen (ohne -- Kommentare)."""
+    zeilen = [z.strip() for z in sql.splitlines() if not z.strip().startswith("--")]
+    return " ".join(z for z in zeilen if z)
+
+
+def main():
+    probleme = 0
+
+    for name, sql, plan in plaene_sammeln():
+        print(f"\n[{name}] {_einzeilig(sql)}")
+        for detail in plan:
+            markierung = ""
+            if ist_scan(detail):
+                if name in ERWARTETE_SCANS:
+                    markierung = "   (Scan erwartet: komplette Liste)"
+                else:
+                    markierung = "   <-- SCAN ohne Index!"
+                    probleme += 1
+            print(f"    {detail}{markierung}")
+
+    print(f"\n{probleme} unerwartete Scan(s).")
+    return 1 if probleme else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
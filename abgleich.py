@@ -0,0 +1,520 @@
+# abgleich.py
+# Änderungen zwischen zwei Datenbanken abgleichen (z.B. jede Lehrkraft hat
+# ihre eigene datenbank.db).
+#
+# Für dumme:
+# - Bisher: ganze Datei kopieren. Das dauert bei großen DBs, und was der
+#   andere inzwischen geändert hat, ist danach weg.
+# - Jetzt: Trigger (Migration 7 in datenbank.py) schreiben bei JEDER Änderung
+#   an categories, questions, tests und test_questions einen Eintrag ins
+#   change_log: "Tabelle X, Zeile Y hat sich geändert" + fortlaufende Nummer (seq).
+#   Pro Zeile gibt es nur EINEN Eintrag (immer der neueste).
+# - delta_exportieren("delta.gz", seit=120) schreibt alles mit seq > 120 in eine
+#   kleine Datei (gzip, eine JSON-Zeile pro Änderung). Gelesen wird nur das
+#   Geänderte, nicht die ganze DB.
+# - delta_importieren("delta.gz") spielt diese Datei in einer ANDEREN DB ein.
+#
+# IDs: Frage 17 in DB A ist in DB B vielleicht Frage 803. Darum hat jede DB eine
+# zufällige Kennung (sync_status.kennung). In der Datei steht jede Zeile als
+# [Kennung der DB, in der sie entstanden ist, ID dort]; sync_ids merkt sich,
+# welche ID sie hier bekommen hat. Kategorien mit gleichem Namen werden
+# zusammengelegt (Namen sind ja eindeutig), ebenso Fragen/Tests mit gleicher ID
+# und gleichem Inhalt (DBs, die früher durch Kopieren der Datei entstanden sind).
+#
+# Konflikte: wurde eine Zeile HIER seit dem letzten Import vom selben Partner
+# auch geändert (und sieht jetzt anders aus), ist das ein Konflikt:
+#   bei_konflikt="lokal"     -> unsere Version bleibt (Standard)
+#   bei_konflikt="fremd"     -> die Version aus der Datei gewinnt
+#   bei_konflikt="abbrechen" -> gar nichts wird übernommen (AbgleichKonflikt)
+# Im Bericht stehen die Konflikte immer drin.
+#
+# Ablauf (B holt die Änderungen von A):
+#   B: python start.py sync status                   -> "a1b2...: übernommen bis 120"
+#   A: python start.py sync export delta.gz --seit 120
+#   B: python start.py sync import delta.gz
+#
+# Beim Import schreiben die Trigger NICHT ins change_log (protokollieren = 0),
+# sonst würde B die Änderungen von A beim nächsten Export an A zurückschicken.
+# Weitergegeben werden Änderungen darum nur von der DB, in der sie gemacht wurden.
+#
+# WICHTIG: Eine kopierte DB-Datei hat dieselbe Kennung wie das Original.
+# In der Kopie einmal kennung_erneuern() aufrufen ("sync neue-kennung").
+
+import gzip
+import io
+import json
+import secrets
+import sys
+import time
+
+from datenbank import transaktion, verbindung
+from kategorien import cache_leeren
+
+
+FORMAT = "testapp-delta"
+VERSION = 1
+# Steht in der ersten Zeile jeder Delta-Datei
+
+KONFLIKT_REGELN = ("lokal", "fremd", "abbrechen")
+
+_KURZ = {"categories": "c", "questions": "q", "tests": "t", "test_questions": "tq"}
+_LANG = {kurz: tabelle for tabelle, kurz in _KURZ.items()}
+
+_LESEN = {
+    "categories": "SELECT name FROM categories WHERE id = ?;",
+    "questions": "SELECT question_text, solution, category_id FROM questions WHERE id = ?;",
+    "tests": "SELECT title, test_date FROM tests WHERE id = ?;",
+}
+_ANLEGEN = {
+    "categories": "INSERT INTO categories (name) VALUES (?);",
+    "questions": "INSERT INTO questions (question_text, solution, category_id) VALUES (?, ?, ?);",
+    "tests": "INSERT INTO tests (title, test_date) VALUES (?, ?);",
+}
+_AENDERN = {
+    "categories": "UPDATE categories SET name = ? WHERE id = ?;",
+    "questions": "UPDATE questions SET question_text = ?, solution = ?, category_id = ? WHERE id = ?;",
+    "tests": "UPDATE tests SET title = ?, test_date = ? WHERE id = ?;",
+}
+_BENUTZT = {
+    # Wird die Zeile hier noch gebraucht? Dann darf sie nicht einfach weg (Foreign Key).
+    "categories": "SELECT 1 FROM questions WHERE category_id = ? LIMIT 1;",
+    "questions": "SELECT 1 FROM test_questions WHERE question_id = ? LIMIT 1;",
+    "tests": "SELECT 1 FROM test_questions WHERE test_id = ? LIMIT 1;",
+}
+_ZUORDNUNGEN_LOESCHEN = {
+    # nur bei bei_konflikt="fremd": die Zuordnungen hier fliegen mit raus
+    "questions": "DELETE FROM test_questions WHERE question_id = ?;",
+    "tests": "DELETE FROM test_questions WHERE test_id = ?;",
+}
+
+
+class AbgleichFehler(ValueError):
+    """Die Delta-Datei passt nicht zu dieser DB (Format, Lücke, eigene Kennung, ...)."""
+
+
+class AbgleichKonflikt(AbgleichFehler):
+    """bei_konflikt="abbrechen" und es gab Konflikte -> nichts wurde übernommen."""
+
+    def __init__(self, konflikte):
+        super().__init__(f"{len(konflikte)} Konflikt(e), nichts übernommen.")
+        self.konflikte = konflikte
+
+
+def kennung(conn=None):
+    """Die Kennung dieser DB (16 Hex-Zeichen)."""
+    conn = conn or verbindung()
+    return conn.execute("SELECT kennung FROM sync_status WHERE id = 1;").fetchone()[0]
+
+
+def status():
+    """
+    Rückgabe: {"kennung": ..., "seq": neueste seq im change_log,
+               "partner": [(kennung, bis_seq, zeitpunkt), ...]}
+    bis_seq = so weit sind die Änderungen des Partners hier übernommen
+    (= was man beim Partner als --seit angeben muss).
+    """
+
+    conn = verbindung()
+    return {
+        "kennung": kennung(conn),
+        "seq": conn.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log;").fetchone()[0],
+        "partner": conn.execute(
+            "SELECT kennung, bis_seq, zeitpunkt FROM sync_partner ORDER BY zeitpunkt DESC;"
+        ).fetchall(),
+    }
+
+
+def kennung_erneuern():
+    """
+    Gibt dieser DB eine neue Kennung (nach dem Kopieren der Datei!).
+    Die schon vorhandenen Zeilen behalten ihre alte Herkunft, damit andere DBs
+    sie weiter wiedererkennen. Rückgabe: die neue Kennung
+    """
+
+    neu = secrets.token_hex(8)
+    with transaktion() as conn:
+        alt = kennung(conn)
+        for tabelle in ("categories", "questions", "tests"):
+            # Alles im change_log ohne Herkunft ist HIER entstanden (Importiertes steht in sync_ids)
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO sync_ids (tabelle, herkunft, fremde_id, lokale_id)
+                SELECT tabelle, ?, zeile, zeile FROM change_log c
+                WHERE tabelle = ?
+                  AND NOT EXISTS (SELECT 1 FROM sync_ids s WHERE s.tabelle = c.tabelle AND s.lokale_id = c.zeile);
+                """,
+                (alt, tabelle),
+            )
+        conn.execute("UPDATE sync_status SET kennung = ? WHERE id = 1;", (neu,))
+    return neu
+
+
+# --------------------------------------------
+# Export
+# --------------------------------------------
+def _schluessel(conn, eigene, tabelle, lokale_id, cache):
+    """
+    [herkunft, id] einer Zeile für die Datei. herkunft None = "aus der DB,
+    die die Datei geschrieben hat" (spart Platz).
+    """
+
+    k = (tabelle, lokale_id)
+    if k not in cache:
+        row = conn.execute(
+            "SELECT herkunft, fremde_id FROM sync_ids WHERE tabelle = ? AND lokale_id = ? LIMIT 1;", k
+        ).fetchone()
+        if row is None:
+            cache[k] = [None, lokale_id]
+        else:
+            cache[k] = [None if row[0] == eigene else row[0], row[1]]
+    return cache[k]
+
+
+def _satz(conn, eigene, tabelle, zeile, zeile2, cache):
+    """Eine Zeile der Datei: [kurz, schlüssel, daten]. daten None = gelöscht."""
+    if tabelle == "test_questions":
+        schluessel = [
+            _schluessel(conn, eigene, "tests", zeile, cache),
+            _schluessel(conn, eigene, "questions", zeile2, cache),
+        ]
+        da = conn.execute(
+            "SELECT 1 FROM test_questions WHERE test_id = ? AND question_id = ?;", (zeile, zeile2)
+        ).fetchone()
+        return [_KURZ[tabelle], schluessel, 1 if da else None]
+
+    row = conn.execute(_LESEN[tabelle], (zeile,)).fetchone()
+    daten = None if row is None else list(row)
+    if daten is not None and tabelle == "questions":
+        daten[2] = _schluessel(conn, eigene, "categories", daten[2], cache)
+    return [_KURZ[tabelle], _schluessel(conn, eigene, tabelle, zeile, cache), daten]
+
+
+def delta_exportieren(ziel, seit=0):
+    """
+    Schreibt alle Änderungen mit seq > seit nach `ziel` ("-" = stdout).
+
+    Reihenfolge in der Datei: erst Neues/Geändertes (Kategorien vor Fragen,
+    Tests vor Zuordnungen), dann Gelöschtes rückwärts. So kann der Import
+    einfach von oben nach unten durchgehen.
+
+    Rückgabe: {"kennung": ..., "von": seit, "bis": seq, "aenderungen": n}
+    """
+
+    seit = max(0, int(seit))
+    conn = verbindung()
+    eigene_transaktion = not conn.in_transaction
+    if eigene_transaktion:
+        conn.execute("BEGIN;")  # alles aus demselben Stand lesen
+    try:
+        eigene = kennung(conn)
+        bis = conn.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log;").fetchone()[0]
+        geaendert = {tabelle: [] for tabelle in _KURZ}
+        geloescht = {tabelle: [] for tabelle in _KURZ}
+        cache = {}
+        for tabelle, zeile, zeile2 in conn.execute(
+            "SELECT tabelle, zeile, zeile2 FROM change_log WHERE seq > ? ORDER BY seq;", (seit,)
+        ):
+            satz = _satz(conn, eigene, tabelle, zeile, zeile2, cache)
+            (geaendert if satz[2] is not None else geloescht)[tabelle].append(satz)
+    finally:
+        if eigene_transaktion:
+            conn.execute("COMMIT;")
+
+    saetze = (
+        geaendert["categories"] + geaendert["questions"] + geaendert["tests"]
+        + geloescht["test_questions"] + geaendert["test_questions"]
+        + geloescht["tests"] + geloescht["questions"] + geloescht["categories"]
+    )
+    kopf = {"format": FORMAT, "version": VERSION, "kennung": eigene, "von": seit, "bis": bis, "anzahl": len(saetze)}
+
+    roh = sys.stdout.buffer if ziel == "-" else open(ziel, "wb")
+    try:
+        # mtime=0: gleicher Inhalt -> byte-gleiche Datei
+        with gzip.GzipFile(fileobj=roh, mode="wb", mtime=0) as gz, io.TextIOWrapper(gz, encoding="utf-8") as f:
+            for zeile in [kopf] + saetze:
+                f.write(json.dumps(zeile, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+    finally:
+        if roh is not sys.stdout.buffer:
+            roh.close()
+
+    return {"kennung": eigene, "von": seit, "bis": bis, "aenderungen": len(saetze)}
+
+
+# --------------------------------------------
+# Import
+# --------------------------------------------
+class _Einspielen:
+    """Zustand während EINES Imports (alles in einer Transaktion)."""
+
+    def __init__(self, conn, eigene, partner, lokal_seq, regel, bericht):
+        self.conn = conn
+        self.eigene = eigene
+        self.partner = partner
+        self.lokal_seq = lokal_seq
+        self.regel = regel
+        self.bericht = bericht
+        self.ids = {}
+
+    # ---------- Hilfen ----------
+    def lokal(self, tabelle, schluessel):
+        """ID hier zu [herkunft, id] aus der Datei, None = kennen wir (noch) nicht."""
+        herkunft = schluessel[0] or self.partner
+        k = (tabelle, herkunft, schluessel[1])
+        if k not in self.ids:
+            row = self.conn.execute(
+                "SELECT lokale_id FROM sync_ids WHERE tabelle = ? AND herkunft = ? AND fremde_id = ?;", k
+            ).fetchone()
+            if row is not None:
+                self.ids[k] = row[0]
+            else:
+                self.ids[k] = schluessel[1] if herkunft == self.eigene else None
+        return self.ids[k]
+
+    def merken(self, tabelle, schluessel, lokale_id):
+        herkunft = schluessel[0] or self.partner
+        self.ids[(tabelle, herkunft, schluessel[1])] = lokale_id
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sync_ids (tabelle, herkunft, fremde_id, lokale_id) VALUES (?, ?, ?, ?);",
+            (tabelle, herkunft, schluessel[1], lokale_id),
+        )
+
+    def hier_geaendert(self, tabelle, zeile, zeile2=0):
+        """Wurde die Zeile hier seit dem letzten Import von diesem Partner geändert?"""
+        row = self.conn.execute(
+            "SELECT seq FROM change_log WHERE tabelle = ? AND zeile = ? AND zeile2 = ?;",
+            (tabelle, zeile, zeile2),
+        ).fetchone()
+        return row is not None and row[0] > self.lokal_seq
+
+    def konflikt(self, tabelle, lokale_id, grund, erlaubt=True):
+        """
+        Meldet einen Konflikt. Rückgabe True = trotzdem die fremde Version nehmen
+        (nur bei regel "fremd" und wenn das überhaupt geht -> erlaubt).
+        """
+        self.bericht["konflikte"].append((tabelle, lokale_id, grund))
+        return erlaubt and self.regel == "fremd"
+
+    def zaehlen(self, was):
+        self.bericht[was] += 1
+
+    # ---------- categories / questions / tests ----------
+    def zeile(self, tabelle, schluessel, daten):
+        conn = self.conn
+        lid = self.lokal(tabelle, schluessel)
+        row = None if lid is None else conn.execute(_LESEN[tabelle], (lid,)).fetchone()
+
+        if daten is None:
+            if row is None:
+                return  # gibt es hier schon nicht mehr
+            if self.hier_geaendert(tabelle, lid) and not self.konflikt(tabelle, lid, "hier geändert, dort gelöscht"):
+                return
+            if conn.execute(_BENUTZT[tabelle], (lid,)).fetchone():
+                loeschen = _ZUORDNUNGEN_LOESCHEN.get(tabelle)
+                if not self.konflikt(tabelle, lid, "dort gelöscht, hier noch benutzt", loeschen is not None):
+                    return
+                conn.execute(loeschen, (lid,))
+            conn.execute(f"DELETE FROM {tabelle} WHERE id = ?;", (lid,))
+            self.zaehlen("geloescht")
+            return
+
+        daten = list(daten)
+        if tabelle == "questions":
+            cid = self.lokal("categories", daten[2])
+            if cid is None or conn.execute(_LESEN["categories"], (cid,)).fetchone() is None:
+                self.konflikt(tabelle, lid, "Kategorie fehlt hier", False)
+                return
+            daten[2] = cid
+
+        if tabelle == "categories":
+            # Namen sind eindeutig: gleicher Name = dieselbe Kategorie
+            gleich = conn.execute("SELECT id FROM categories WHERE name = ?;", (daten[0],)).fetchone()
+            if gleich is not None and gleich[0] != lid:
+                if row is not None:
+                    self.konflikt(tabelle, lid, f"Name {daten[0]!r} gibt es hier schon", False)
+                    return
+                self.merken(tabelle, schluessel, gleich[0])
+                self.zaehlen("unveraendert")
+                return
+
+        if row is not None:
+            if list(row) == daten:
+                self.zaehlen("unveraendert")
+                return
+            if self.hier_geaendert(tabelle, lid) and not self.konflikt(tabelle, lid, "hier und dort geändert"):
+                return
+            conn.execute(_AENDERN[tabelle], daten + [lid])
+            self.zaehlen("geaendert")
+            return
+
+        if lid is None:
+            # Gemeinsame Vorgeschichte (DB-Datei früher einfach kopiert):
+            # gleiche ID und gleicher Inhalt -> dieselbe Zeile, nicht doppelt anlegen
+            gleich = conn.execute(_LESEN[tabelle], (schluessel[1],)).fetchone()
+            if gleich is not None and list(gleich) == daten:
+                self.merken(tabelle, schluessel, schluessel[1])
+                self.zaehlen("unveraendert")
+                return
+        elif not self.konflikt(tabelle, lid, "hier gelöscht, dort geändert"):
+            return
+        neu = conn.execute(_ANLEGEN[tabelle], daten).lastrowid
+        self.merken(tabelle, schluessel, neu)
+        self.zaehlen("neu")
+
+    # ---------- test_questions ----------
+    def zuordnung(self, schluessel, daten):
+        conn = self.conn
+        tid = self.lokal("tests", schluessel[0])
+        qid = self.lokal("questions", schluessel[1])
+
+        if daten is None:
+            if tid is None or qid is None:
+                return
+            cur = conn.execute("SELECT 1 FROM test_questions WHERE test_id = ? AND question_id = ?;", (tid, qid))
+            if cur.fetchone() is None:
+                return
+            if self.hier_geaendert("test_questions", tid, qid) and not self.konflikt(
+                "test_questions", tid, f"Frage {qid}: hier wieder hinzugefügt, dort entfernt"
+            ):
+                return
+            conn.execute("DELETE FROM test_questions WHERE test_id = ? AND question_id = ?;", (tid, qid))
+            self.zaehlen("geloescht")
+            return
+
+        if (
+            tid is None or qid is None
+            or conn.execute("SELECT 1 FROM tests WHERE id = ?;", (tid,)).fetchone() is None
+            or conn.execute("SELECT 1 FROM questions WHERE id = ?;", (qid,)).fetchone() is None
+        ):
+            self.konflikt("test_questions", tid, "Test oder Frage fehlt hier", False)
+            return
+        if self.hier_geaendert("test_questions", tid, qid) and conn.execute(
+            "SELECT 1 FROM test_questions WHERE test_id = ? AND question_id = ?;", (tid, qid)
+        ).fetchone() is None:
+            # Hier absichtlich entfernt, dort (wieder) drin
+            if not self.konflikt("test_questions", tid, f"Frage {qid}: hier entfernt, dort im Test"):
+                return
+        cur = conn.execute("INSERT OR IGNORE INTO test_questions (test_id, question_id) VALUES (?, ?);", (tid, qid))
+        self.zaehlen("neu" if cur.rowcount else "unveraendert")
+
+    def satz(self, satz):
+        kurz, schluessel, daten = satz
+        tabelle = _LANG[kurz]
+        if tabelle == "test_questions":
+            self.zuordnung(schluessel, daten)
+        else:
+            self.zeile(tabelle, schluessel, daten)
+
+
+def _kopf_lesen(f):
+    try:
+        kopf = json.loads(f.readline())
+    except (OSError, EOFError, ValueError) as e:
+        raise AbgleichFehler(f"Keine Delta-Datei ({e})") from e
+    if not isinstance(kopf, dict) or kopf.get("format") != FORMAT:
+        raise AbgleichFehler("Keine Delta-Datei (erste Zeile passt nicht)")
+    if kopf.get("version") != VERSION:
+        raise AbgleichFehler(f"Delta-Version {kopf.get('version')} wird nicht unterstützt (erwartet {VERSION})")
+    return kopf
+
+
+def delta_importieren(quelle, bei_konflikt="lokal"):
+    """
+    Spielt eine Delta-Datei (von delta_exportieren) ein ("-" = stdin).
+    Alles in EINER Transaktion: bei einem Fehler bleibt die DB wie vorher.
+
+    Rückgabe: Dict
+      {"kennung": Partner, "von": n, "bis": n, "neu": n, "geaendert": n,
+       "geloescht": n, "unveraendert": n, "konflikte": [(tabelle, lokale_id, grund), ...],
+       "schon_uebernommen": bool, "sekunden": s}
+
+    Fehler: AbgleichFehler (Datei passt nicht), AbgleichKonflikt (nur bei "abbrechen")
+    """
+
+    if bei_konflikt not in KONFLIKT_REGELN:
+        raise ValueError(f"Unbekannte Regel: {bei_konflikt} (erlaubt: {', '.join(KONFLIKT_REGELN)})")
+
+    start = time.perf_counter()
+    roh = sys.stdin.buffer if quelle == "-" else open(quelle, "rb")
+    try:
+        f = io.TextIOWrapper(gzip.GzipFile(fileobj=roh, mode="rb"), encoding="utf-8")
+        kopf = _kopf_lesen(f)
+        partner = kopf["kennung"]
+        bericht = {
+            "kennung": partner, "von": kopf["von"], "bis": kopf["bis"],
+            "neu": 0, "geaendert": 0, "geloescht": 0, "unveraendert": 0,
+            "konflikte": [], "schon_uebernommen": False, "sekunden": 0.0,
+        }
+
+        with transaktion() as conn:
+            eigene = kennung(conn)
+            if partner == eigene:
+                raise AbgleichFehler(
+                    "Das Delta stammt aus dieser DB (gleiche Kennung). Ist eine der beiden "
+                    "eine Kopie? Dann dort einmal 'sync neue-kennung' ausführen."
+                )
+            row = conn.execute(
+                "SELECT bis_seq, lokal_seq FROM sync_partner WHERE kennung = ?;", (partner,)
+            ).fetchone()
+            bis_seq, lokal_seq = row or (0, 0)
+            if kopf["von"] > bis_seq:
+                raise AbgleichFehler(
+                    f"Es fehlen Änderungen: das Delta beginnt nach {kopf['von']}, übernommen ist erst "
+                    f"bis {bis_seq}. Beim Partner 'sync export --seit {bis_seq}' machen."
+                )
+            if kopf["bis"] <= bis_seq:
+                bericht["schon_uebernommen"] = True
+                bericht["sekunden"] = time.perf_counter() - start
+                return bericht
+
+            einspielen = _Einspielen(conn, eigene, partner, lokal_seq, bei_konflikt, bericht)
+            conn.execute("UPDATE sync_status SET protokollieren = 0 WHERE id = 1;")
+            try:
+                for nr, zeile in enumerate(f, start=2):
+                    try:
+                        satz = json.loads(zeile)
+                    except ValueError as e:
+                        raise AbgleichFehler(f"Zeile {nr}: kein gültiges JSON ({e})") from e
+                    einspielen.satz(satz)
+            finally:
+                conn.execute("UPDATE sync_status SET protokollieren = 1 WHERE id = 1;")
+
+            if bei_konflikt == "abbrechen" and bericht["konflikte"]:
+                raise AbgleichKonflikt(bericht["konflikte"])
+
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO sync_partner (kennung, bis_seq, lokal_seq, zeitpunkt)
+                VALUES (?, ?, (SELECT IFNULL(MAX(seq), 0) FROM change_log), datetime('now'));
+                """,
+                (partner, kopf["bis"]),
+            )
+    except (EOFError, gzip.BadGzipFile) as e:
+        raise AbgleichFehler(f"Delta-Datei ist kaputt ({e})") from e
+    finally:
+        if roh is not sys.stdin.buffer:
+            roh.close()
+        cache_leeren()  # evtl. Kategorien an kategorie_anlegen() vorbei angelegt
+
+    bericht["sekunden"] = time.perf_counter() - start
+    return bericht
+
+
+def bericht_ausgeben(bericht, max_konflikte=20):
+    """Gibt den Import-Bericht lesbar aus."""
+
+    if bericht["schon_uebernommen"]:
+        print(f"Nichts zu tun: Änderungen von {bericht['kennung']} bis {bericht['bis']} sind schon übernommen.")
+        return
+    print(
+        f"✅ Delta von {bericht['kennung']} ({bericht['von']}..{bericht['bis']}): "
+        f"{bericht['neu']} neu, {bericht['geaendert']} geändert, {bericht['geloescht']} gelöscht, "
+        f"{bericht['unveraendert']} unverändert ({bericht['sekunden']:.2f} s)"
+    )
+    konflikte = bericht["konflikte"]
+    if konflikte:
+        print(f"⚠️  {len(konflikte)} Konflikt(e):")
+        for tabelle, lid, grund in konflikte[:max_konflikte]:
+            print(f"  {tabelle} {lid if lid is not None else '-'}: {grund}")
+        if len(konflikte) > max_konflikte:
+            print(f"  ... und {len(konflikte) - max_konflikte} weitere")
@@ -0,0 +1,309 @@
+# async_api.py
+# asyncio-Version der Daten-Funktionen aus kategorien.py, fragen.py und tests.py.
+#
+# Für dumme:
+# - sqlite3 kann nicht "async". Ein normaler Aufruf wie alle_tests() blockiert,
+#   bis die Festplatte geantwortet hat. In einem async-Programm steht dann
+#   ALLES still (der Event-Loop kann nichts anderes machen).
+# - Darum schicken wir jeden Aufruf an ein paar feste DB-Threads ("Executor").
+#   Jeder dieser Threads hat seine eigene, dauerhaft offene Verbindung
+#   (das macht datenbank.verbindung() pro Thread sowieso).
+# - Benutzung:
+#       import async_api
+#       tests = await async_api.alle_tests()
+#       row = await async_api.frage_holen(12, timeout=2.0)
+#
+# Extras:
+# - timeout=...: nach so vielen Sekunden wird abgebrochen (asyncio.TimeoutError).
+#   Läuft die Abfrage schon, wird sie mit conn.interrupt() gestoppt.
+# - Abbrechen (task.cancel()) funktioniert genauso.
+# - Gleiche Lese-Aufrufe, die gleichzeitig laufen, werden zusammengelegt:
+#   100x gleichzeitig await test_anzeigen(5) -> EINE Abfrage, 100 Ergebnisse.
+#   Wartet mehr als einer, bekommt jeder seine eigene Kopie (Listen ändern
+#   stört die anderen nicht); der letzte bekommt das Original.
+#   Erst wenn der LETZTE Wartende aufgibt (Timeout/Abbruch), wird die
+#   Abfrage selbst abgebrochen.
+
+import asyncio
+import copy
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import datenbank
+import fragen
+import kategorien
+import tests
+
+
+ARBEITER = 4
+# So viele DB-Threads (= Verbindungen) gibt es.
+
+MAX_WARTEND = 256
+# So viele Aufträge dürfen gleichzeitig unterwegs sein. Mehr müssen warten,
+# damit sich die Warteschlange vom Executor nicht endlos füllt.
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_grenzen = {}
+# Event-Loop -> asyncio.Semaphore(MAX_WARTEND)
+
+_laufend = {}
+# (Event-Loop, Funktionsname, Argumente) -> {"fut", "abbruch", "wartende"}
+# Für das Zusammenlegen gleicher Lese-Aufrufe.
+
+
+def _executor_holen():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ARBEITER, thread_name_prefix="db")
+        return _executor
+
+
+def _grenze_holen(loop):
+    grenze = _grenzen.get(loop)
+    if grenze is None:
+        grenze = _grenzen[loop] = asyncio.Semaphore(MAX_WARTEND)
+    return grenze
+
+
+def _im_arbeiter(auftrag, funktion, args, kwargs):
+    """
+    Läuft im DB-Thread. Merkt sich die Verbindung, damit ein Abbruch
+    von außen conn.interrupt() aufrufen kann.
+    """
+
+    with auftrag["lock"]:
+        if auftrag["abgebrochen"]:
+            raise asyncio.CancelledError()
+        auftrag["conn"] = datenbank.verbindung()
+
+    try:
+        return funktion(*args, **kwargs)
+    finally:
+        with auftrag["lock"]:
+            auftrag["conn"] = None
+
+
+def _abbrechen(auftrag, cf):
+    """
+    Bricht einen Auftrag ab: noch nicht gestartet -> gar nicht starten,
+    läuft schon -> SQLite unterbrechen (wirft dort sqlite3.OperationalError,
+    transaktion() macht dann ROLLBACK).
+    """
+
+    cf.cancel()
+    with auftrag["lock"]:
+        auftrag["abgebrochen"] = True
+        if auftrag["conn"] is not None:
+            auftrag["conn"].interrupt()
+
+
+def _fehler_abholen(fut):
+    """
+    Holt den Fehler eines Auftrags ab, auf den keiner mehr wartet
+    (Timeout/Abbruch) -> sonst meckert asyncio "exception was never retrieved".
+    """
+
+    if not fut.cancelled():
+        fut.exception()
+
+
+async def _starten(funktion, args, kwargs):
+    """
+    Schickt einen Aufruf an den Executor. Gibt (asyncio-Future, Abbruch-Funktion) zurück.
+    """
+
+    loop = asyncio.get_running_loop()
+    grenze = _grenze_holen(loop)
+
+    await grenze.acquire()
+
+    auftrag = {"lock": threading.Lock(), "conn": None, "abgebrochen": False}
+    try:
+        cf = _executor_holen().submit(_im_arbeiter, auftrag, funktion, args, kwargs)
+    except BaseException:
+        grenze.release()
+        raise
+    cf.add_done_callback(lambda _: loop.call_soon_threadsafe(grenze.release))
+
+    fut = asyncio.wrap_future(cf, loop=loop)
+    fut.add_done_callback(_fehler_abholen)
+    return fut, functools.partial(_abbrechen, auftrag, cf)
+
+
+async def _warten(fut, abbruch, timeout, geteilt=False):
+    """
+    Wartet auf das Ergebnis (mit optionalem Timeout).
+    geteilt=True: andere warten auch darauf -> bei Abbruch/Timeout nur
+    selbst aufhören zu warten, den Auftrag aber weiterlaufen lassen.
+    """
+
+    try:
+        return await asyncio.wait_for(asyncio.shield(fut), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        if not geteilt:
+            abbruch()
+        raise
+
+
+async def ausfuehren(funktion, *args, timeout=None, **kwargs):
+    """
+    Führt eine beliebige (blockierende) DB-Funktion im DB-Executor aus.
+    """
+
+    fut, abbruch = await _starten(funktion, args, kwargs)
+    return await _warten(fut, abbruch, timeout)
+
+
+async def _zusammengelegt(funktion, args, kwargs, timeout):
+    """
+    Wie ausfuehren(), aber gleiche Aufrufe, die gerade laufen, werden geteilt.
+    """
+
+    loop = asyncio.get_running_loop()
+    try:
+        schluessel = (loop, funktion.__qualname__, funktion.__module__, args, tuple(sorted(kwargs.items())))
+        hash(schluessel)
+    except TypeError:
+        # z.B. eine Liste als Argument -> nicht zusammenlegbar
+        return await ausfuehren(funktion, *args, timeout=timeout, **kwargs)
+
+    eintrag = _laufend.get(schluessel)
+    if eintrag is None:
+        fut, abbruch = await _starten(funktion, args, kwargs)
+        eintrag = {"fut": fut, "abbruch": abbruch, "wartende": 0}
+        _laufend[schluessel] = eintrag
+        fut.add_done_callback(lambda _: _austragen(schluessel, eintrag))
+
+    eintrag["wartende"] += 1
+    try:
+        ergebnis = await _warten(eintrag["fut"], eintrag["abbruch"], timeout, geteilt=True)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        eintrag["wartende"] -= 1
+        if eintrag["wartende"] == 0 and not eintrag["fut"].done():
+            # Keiner wartet mehr -> Abfrage wirklich abbrechen, und neue
+            # Aufrufe sollen sich nicht an den abgebrochenen Auftrag hängen
+            _austragen(schluessel, eintrag)
+            eintrag["abbruch"]()
+        raise
+    eintrag["wartende"] -= 1
+    if eintrag["wartende"] == 0:
+        # Der letzte (meist der einzige) -> keiner teilt das Ergebnis mehr,
+        # neue Aufrufe hängen sich nicht mehr an (Eintrag ist ausgetragen)
+        return ergebnis
+    # Andere warten noch auf dasselbe Ergebnis -> eigene Kopie
+    return copy.deepcopy(ergebnis)
+
+
+def _austragen(schluessel, eintrag):
+    """Entfernt den Eintrag aus _laufend (nur wenn er dort noch derselbe ist)."""
+
+    if _laufend.get(schluessel) is eintrag:
+        del _laufend[schluessel]
+
+
+def _lesend(funktion):
+    """Async-Version einer LESE-Funktion (mit Zusammenlegen)."""
+
+    @functools.wraps(funktion)
+    async def wrapper(*args, timeout=None, **kwargs):
+        return await _zusammengelegt(funktion, args, kwargs, timeout)
+
+    return wrapper
+
+
+def _schreibend(funktion):
+    """Async-Version einer SCHREIB-Funktion (wird nie zusammengelegt)."""
+
+    @functools.wraps(funktion)
+    async def wrapper(*args, timeout=None, **kwargs):
+        return await ausfuehren(funktion, *args, timeout=timeout, **kwargs)
+
+    return wrapper
+
+
+# --------------------------------------------
+# kategorien.py
+# --------------------------------------------
+alle_kategorien = _lesend(kategorien.alle_kategorien)
+kategorien_seite = _lesend(kategorien.kategorien_seite)
+kategorie_name = _lesend(kategorien.kategorie_name)
+kategorie_id = _lesend(kategorien.kategorie_id)
+kategorie_anlegen = _schreibend(kategorien.kategorie_anlegen)
+
+# --------------------------------------------
+# fragen.py
+# --------------------------------------------
+fragen_von_kategorie = _lesend(fragen.fragen_von_kategorie)
+fragen_von_kategorie_seite = _lesend(fragen.fragen_von_kategorie_seite)
+frage_holen = _lesend(fragen.frage_holen)
+fragen_suchen = _lesend(fragen.fragen_suchen)
+frage_anlegen = _schreibend(fragen.frage_anlegen)
+frage_update = _schreibend(fragen.frage_update)
+
+# --------------------------------------------
+# tests.py
+# --------------------------------------------
+alle_tests = _lesend(tests.alle_tests)
+tests_seite = _lesend(tests.tests_seite)
+test_holen = _lesend(tests.test_holen)
+fragen_ids_von_test = _lesend(tests.fragen_ids_von_test)
+test_anzeigen = _lesend(tests.test_anzeigen)
+test_anlegen = _schreibend(tests.test_anlegen)
+test_update = _schreibend(tests.test_update)
+frage_zu_test = _schreibend(tests.frage_zu_test)
+fragen_zu_test = _schreibend(tests.fragen_zu_test)
+test_fragen_setzen = _schreibend(tests.test_fragen_setzen)
+
+
+# --------------------------------------------
+# Async-Iteratoren (Seite für Seite, wie die *_iter-Generatoren)
+# --------------------------------------------
+async def kategorien_iter(seitengroesse=500):
+    nach = None
+    while True:
+        seite = await kategorien_seite(nach, seitengroesse)
+        for row in seite:
+            yield row
+        if len(seite) < seitengroesse:
+            return
+        nach = seite[-1][1]
+
+
+async def fragen_von_kategorie_iter(category_id, seitengroesse=500):
+    nach = None
+    while True:
+        seite = await fragen_von_kategorie_seite(category_id, nach, seitengroesse)
+        for row in seite:
+            yield row
+        if len(seite) < seitengroesse:
+            return
+        nach = seite[-1][0]
+
+
+async def alle_tests_iter(seitengroesse=500):
+    vor = None
+    while True:
+        seite = await tests_seite(vor, seitengroesse)
+        for row in seite:
+            yield row
+        if len(seite) < seitengroesse:
+            return
+        vor = seite[-1][0]
+
+
+def schliessen():
+    """
+    Beendet die DB-Threads und schließt alle Verbindungen.
+    (Am Programmende passiert das sonst automatisch.)
+    """
+
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+    datenbank.verbindungen_schliessen()
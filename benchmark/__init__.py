@@ -0,0 +1,14 @@
+# benchmark/
+# Misst, wie schnell die Funktionen und Menü-Aktionen sind.
+#
+# Für dumme:
+# - "python -m benchmark" erzeugt eine Test-DB mit ausgedachten Daten
+#   (benchmark/daten.py) und misst dann jede Funktion viele Male
+#   (benchmark/faelle.py, benchmark/messen.py).
+# - Ergebnis: JSON mit Perzentilen (p50 = typischer Aufruf, p99 = die
+#   langsamsten 1%). Die Dateien von zwei Commits kann man vergleichen:
+#       python -m benchmark --skala mittel --ausgabe vorher.json
+#       ... Code ändern ...
+#       python -m benchmark --skala mittel --ausgabe nachher.json
+#       python -m benchmark vergleichen vorher.json nachher.json
+# - Die echte datenbank.db wird dabei NIE angefasst.
@@ -0,0 +1,198 @@
+# benchmark/__main__.py
+# Start: "python -m benchmark ..." (aus dem Projektordner)
+#
+#   python -m benchmark                          -> Skala "klein", Tabelle auf dem Bildschirm
+#   python -m benchmark --skala mittel --ausgabe ergebnis.json
+#   python -m benchmark --fragen 50000 --tests 500 --filter tests.
+#   python -m benchmark --speicher sync         -> DB im Arbeitsspeicher (schnappschuss.py)
+#   python -m benchmark vergleichen alt.json neu.json [--schwelle 1.25]
+#   python -m benchmark konkurrenz [--prozesse 4]  -> mehrere Schreib-Prozesse gleichzeitig (konkurrenz.py)
+#
+# Exit-Code 1, wenn ein Fall sein Ziel (z.B. kaltstart.*) überschreitet.
+# "vergleichen" gibt Exit-Code 1 zurück, wenn ein Fall langsamer geworden ist
+# (p50 mehr als schwelle-mal so langsam) -> kann man vor dem Deployen prüfen.
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import datenbank
+from benchmark import daten, faelle, kaltstart, konkurrenz, messen
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(datenbank.__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _zahlen_aus_db():
+    """Zahlen einer vorhandenen DB (für --vorhanden)."""
+
+    conn = datenbank.verbindung()
+
+    def eins(sql):
+        return conn.execute(sql).fetchone()[0] or 0
+
+    tests = eins("SELECT MAX(id) FROM tests;")
+    return {
+        "fragen": eins("SELECT MAX(id) FROM questions;"),
+        "tests": tests,
+        "kategorien": eins("SELECT MAX(id) FROM categories;"),
+        "pro_test": max(1, eins("SELECT COUNT(*) FROM test_questions;") // max(tests, 1)),
+        "seed": None,
+    }
+
+
+def laufen(argumente):
+    p = argparse.ArgumentParser(prog="python -m benchmark", description="Misst alle Funktionen und Menü-Aktionen.")
+    p.add_argument("--skala", choices=sorted(daten.SKALEN), default="klein")
+    p.add_argument("--fragen", type=int, help="überschreibt die Skala")
+    p.add_argument("--tests", type=int, help="überschreibt die Skala")
+    p.add_argument("--pro-test", type=int, default=25, help="Fragen pro Test")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--wiederholungen", type=int, default=30)
+    p.add_argument("--max-sekunden", type=float, default=5.0, help="Zeitgrenze pro Fall")
+    p.add_argument("--filter", default="", help="nur Fälle, deren Name das enthält")
+    p.add_argument("--db", help="Pfad der Benchmark-DB (Standard: im Temp-Ordner)")
+    p.add_argument("--ohne-kaltstart", action="store_true", help="Startzeit von start.py nicht messen")
+    p.add_argument("--vorhanden", action="store_true", help="DB nicht neu erzeugen (schneller, aber schon verändert)")
+    p.add_argument("--speicher", choices=("sync", "spaeter"), help="DB im Arbeitsspeicher halten (schnappschuss.py)")
+    p.add_argument("--ausgabe", help="JSON-Ergebnis in diese Datei ('-' = Bildschirm)")
+    a = p.parse_args(argumente)
+
+    fragen, tests = daten.SKALEN[a.skala]
+    fragen = a.fragen or fragen
+    tests = a.tests or tests
+    pfad = a.db or os.path.join(tempfile.gettempdir(), f"benchmark_{fragen}_{tests}.db")
+
+    if a.vorhanden and os.path.exists(pfad):
+        datenbank.datenbank_wechseln(pfad)
+        zahlen = _zahlen_aus_db()
+        erzeugt_in = None
+    else:
+        print(f"Erzeuge {fragen} Fragen, {tests} Tests in {pfad} ...", file=sys.stderr)
+        start = time.perf_counter()
+        zahlen = daten.erzeugen(pfad, fragen, tests, pro_test=a.pro_test, seed=a.seed)
+        erzeugt_in = round(time.perf_counter() - start, 2)
+
+    if a.speicher:
+        import schnappschuss
+        schnappschuss.einschalten(a.speicher)
+
+    k = dict(zahlen, rng=random.Random(a.seed), importdatei=faelle.importdatei_anlegen())
+
+    def ausgeben(name, r):
+        if a.ausgabe != "-":
+            ziel = ""
+            if "ziel_ms" in r:
+                ziel = f"   Ziel {r['ziel_ms']} ms " + ("ok" if r["p50_ms"] <= r["ziel_ms"] else "ÜBERSCHRITTEN")
+            print(f"{name:40} p50 {r['p50_ms']:9.3f} ms   p90 {r['p90_ms']:9.3f} ms   p99 {r['p99_ms']:9.3f} ms{ziel}")
+
+    ergebnisse = {}
+    try:
+        for name, fabrik in faelle.FAELLE:
+            if a.filter not in name:
+                continue
+            with faelle.stubs():
+                zeiten = messen.messen(fabrik(k), a.wiederholungen, max_sekunden=a.max_sekunden)
+            ergebnisse[name] = messen.zusammenfassen(zeiten)
+            ausgeben(name, ergebnisse[name])
+    finally:
+        os.remove(k["importdatei"])
+        if a.speicher:
+            schnappschuss.ausschalten()  # alles Offene auf die Datei (für kaltstart und die nächste Messung)
+
+    if not a.ohne_kaltstart:
+        datenbank.verbindungen_schliessen()  # Schreib-Fälle fertig auf die Platte
+        for name, r in kaltstart.messen_alle(pfad, filter=a.filter).items():
+            ergebnisse[name] = r
+            ausgeben(name, r)
+
+    ueberschritten = [n for n, r in ergebnisse.items() if r["p50_ms"] > r.get("ziel_ms", float("inf"))]
+
+    ergebnis = {
+        "meta": {
+            "commit": _commit(),
+            "zeit": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "system": platform.platform(),
+            "db": pfad,
+            "erzeugt_in_s": erzeugt_in,
+            "wiederholungen": a.wiederholungen,
+            "speicher": a.speicher,
+            **zahlen,
+        },
+        "faelle": ergebnisse,
+    }
+
+    if a.ausgabe == "-":
+        json.dump(ergebnis, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif a.ausgabe:
+        with open(a.ausgabe, "w", encoding="utf-8") as f:
+            json.dump(ergebnis, f, ensure_ascii=False, indent=2)
+        print(f"Ergebnis gespeichert: {a.ausgabe}", file=sys.stderr)
+
+    if ueberschritten:
+        print(f"Ziel überschritten: {', '.join(ueberschritten)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def vergleichen(argumente):
+    p = argparse.ArgumentParser(prog="python -m benchmark vergleichen")
+    p.add_argument("alt")
+    p.add_argument("neu")
+    p.add_argument("--schwelle", type=float, default=1.25, help="ab diesem Faktor gilt p50 als langsamer")
+    a = p.parse_args(argumente)
+
+    with open(a.alt, encoding="utf-8") as f:
+        alt = json.load(f)
+    with open(a.neu, encoding="utf-8") as f:
+        neu = json.load(f)
+
+    print(f"alt: {alt['meta'].get('commit')}  neu: {neu['meta'].get('commit')}")
+    langsamer = 0
+    for name, r in neu["faelle"].items():
+        vorher = alt["faelle"].get(name)
+        if vorher is None:
+            print(f"  {name:40} (neu)")
+            continue
+        faktor = r["p50_ms"] / vorher["p50_ms"] if vorher["p50_ms"] else float("inf")
+        markierung = ""
+        if faktor > a.schwelle:
+            markierung = "  <-- LANGSAMER"
+            langsamer += 1
+        elif faktor < 1 / a.schwelle:
+            markierung = "  (schneller)"
+        print(f"  {name:40} {vorher['p50_ms']:9.3f} -> {r['p50_ms']:9.3f} ms  x{faktor:5.2f}{markierung}")
+
+    print(f"\n{langsamer} Fall/Fälle langsamer als x{a.schwelle}.")
+    return 1 if langsamer else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["vergleichen"]:
+        return vergleichen(argv[1:])
+    if argv[:1] == ["konkurrenz"]:
+        return konkurrenz.main(argv[1:])
+    return laufen(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
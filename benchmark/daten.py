@@ -0,0 +1,116 @@
+# benchmark/daten.py
+# Erzeugt eine DB mit ausgedachten (aber realistischen) Daten.
+#
+# Für dumme:
+# - Fragen bestehen aus zufälligen Fachwörtern, unterschiedlich lang.
+# - Die Fragen sind zufällig auf die Kategorien verteilt.
+# - Jeder Test bekommt `pro_test` zufällige Fragen (dichte test_questions).
+# - Gleicher seed -> exakt gleiche DB (wichtig zum Vergleichen von Commits).
+# - Alles in EINER Transaktion mit executemany() -> auch 1 Mio. Fragen gehen.
+
+import os
+import random
+
+import datenbank
+from duplikate import index_aktualisieren
+
+
+SKALEN = {
+    # Name: (Fragen, Tests)
+    "klein": (1_000, 100),
+    "mittel": (100_000, 2_000),
+    "gross": (1_000_000, 10_000),
+}
+
+WOERTER = (
+    "Druck Kolben Ventil Pumpe Zylinder Leitung Hydraulik Elektrik Spannung Strom "
+    "Widerstand Schaltung Relais Sicherung Motor Getriebe Lager Welle Kupplung Bremse "
+    "Sensor Steuerung Regler Signal Frequenz Leistung Energie Temperatur Druckluft Filter "
+    "Dichtung Schraube Gewinde Toleranz Passung Werkstoff Stahl Aluminium Kunststoff Öl "
+    "Viskosität Durchfluss Rückschlagventil Wegeventil Drossel Speicher Manometer Schütz "
+    "Transformator Kondensator Diode Transistor Erdung Schutzleiter Isolation Prüfung "
+    "Wartung Inbetriebnahme Störung Ursache Messung Einheit Formel berechnen erklären "
+    "beschreiben nennen unterscheiden warum wie welche wann bei einer eines der die das"
+).split()
+
+KATEGORIE_NAMEN = (
+    "Grundlagen Hydraulik Pneumatik Elektrik Elektronik Steuerungstechnik Werkstoffkunde "
+    "Fertigung Messtechnik Sicherheit Instandhaltung Antriebstechnik"
+).split()
+
+
+def _satz(rng, von, bis):
+    return " ".join(rng.choice(WOERTER) for _ in range(rng.randint(von, bis)))
+
+
+def erzeugen(pfad, fragen=1_000, tests=100, kategorien=None, pro_test=25, seed=1, duplikat_index=True):
+    """
+    Legt eine NEUE DB-Datei `pfad` an (eine alte wird gelöscht) und füllt sie.
+    Danach zeigt datenbank auf diese Datei (datenbank_wechseln).
+
+    kategorien=None -> etwa Wurzel aus Fragen / 3 (mindestens 3)
+    duplikat_index  -> MinHash-Index gleich mitberechnen (sonst rechnen die
+                       ersten Duplikat-Suchen, z.B. "frage add", nach und
+                       verfälschen die Messung)
+
+    Rückgabe: dict mit den Zahlen (für die Metadaten im Ergebnis)
+    """
+
+    for endung in ("", "-wal", "-shm"):
+        if os.path.exists(pfad + endung):
+            os.remove(pfad + endung)
+
+    datenbank.datenbank_wechseln(pfad)
+    rng = random.Random(seed)
+
+    if kategorien is None:
+        kategorien = max(3, int(fragen ** 0.5 / 3))
+    pro_test = min(pro_test, fragen)
+
+    def kategorie_zeilen():
+        for i in range(kategorien):
+            basis = KATEGORIE_NAMEN[i % len(KATEGORIE_NAMEN)]
+            yield (basis if i < len(KATEGORIE_NAMEN) else f"{basis} {i // len(KATEGORIE_NAMEN) + 1}",)
+
+    def frage_zeilen():
+        for qid in range(1, fragen + 1):
+            yield (
+                qid,
+                _satz(rng, 6, 20) + "?",
+                _satz(rng, 3, 12) if rng.random() < 0.9 else None,
+                rng.randint(1, kategorien),
+            )
+
+    def test_zeilen():
+        for tid in range(1, tests + 1):
+            yield (tid, f"Test {tid}", f"20{rng.randint(18, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+
+    def test_frage_zeilen():
+        for tid in range(1, tests + 1):
+            for qid in rng.sample(range(1, fragen + 1), pro_test):
+                yield (tid, qid)
+
+    with datenbank.transaktion() as conn:
+        conn.executemany("INSERT INTO categories (name) VALUES (?);", kategorie_zeilen())
+        conn.executemany(
+            "INSERT INTO questions (id, question_text, solution, category_id) VALUES (?, ?, ?, ?);",
+            frage_zeilen(),
+        )
+        conn.executemany("INSERT INTO tests (id, title, test_date) VALUES (?, ?, ?);", test_zeilen())
+        conn.executemany(
+            "INSERT INTO test_questions (test_id, question_id) VALUES (?, ?);", test_frage_zeilen()
+        )
+
+    if duplikat_index:
+        index_aktualisieren(blockgroesse=20_000)
+
+    conn = datenbank.verbindung()
+    conn.execute("ANALYZE;")  # Statistiken wie in einer "eingelaufenen" DB
+
+    return {
+        "fragen": fragen,
+        "tests": tests,
+        "kategorien": kategorien,
+        "pro_test": pro_test,
+        "seed": seed,
+    }
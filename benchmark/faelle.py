@@ -0,0 +1,492 @@
+# benchmark/faelle.py
+# Alle Messfälle: jede öffentliche Funktion aus kategorien.py, fragen.py,
+# tests.py, rendern.py, varianten.py, fragenindex.py, statistik.py,
+# abgleich.py, der Stapel-Modus und die Menü-Aktionen aus start.py.
+#
+# Für dumme:
+# - Ein Fall ist eine Funktion fall(k), die eine Funktion aufruf(i) zurückgibt.
+#   k = Kontext (Zahlen der erzeugten DB + Zufallsgenerator), i = Aufruf-Nummer.
+# - Die Menü-Aktionen fragen normalerweise mit input() und öffnen nvim.
+#   Beides wird während der Messung ersetzt (stubs()):
+#   input() bekommt vorbereitete Antworten, der "Editor" ändert die Datei
+#   sofort selbst und ist fertig.
+
+import builtins
+import collections
+import contextlib
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import abgleich
+import fragen
+import fragenindex
+import kategorien
+import rendern
+import stapel
+import start
+import statistik
+import tests
+import varianten
+
+
+FAELLE = []
+# Liste von (Name, fall)
+
+
+def fall(name):
+    """Dekorator: meldet einen Messfall an."""
+
+    def anmelden(funktion):
+        FAELLE.append((name, funktion))
+        return funktion
+
+    return anmelden
+
+
+# --------------------------------------------
+# Ersatz für input() und den Editor
+# --------------------------------------------
+_antworten = collections.deque()
+
+
+def antworten(*werte):
+    """Legt fest, was die nächsten input()-Aufrufe zurückgeben."""
+    _antworten.clear()
+    _antworten.extend(str(w) for w in werte)
+
+
+def _input(prompt=""):
+    if prompt.lstrip().startswith("-- Seite"):
+        return ""  # beim Blättern: nicht weiterblättern
+    return _antworten.popleft() if _antworten else ""
+
+
+def _editor(args, *rest, **kwargs):
+    """
+    Tut so, als hätte jemand im Editor die erste Zeile (ohne # und
+    ohne "=== ID n ===") geändert.
+    """
+
+    datei = args[-1]
+    with open(datei, "r", encoding="utf-8") as f:
+        zeilen = f.read().splitlines()
+    for n, zeile in enumerate(zeilen):
+        if zeile.strip() and not zeile.startswith(("#", "===")):
+            zeilen[n] = zeile + " (b)"
+            break
+    with open(datei, "w", encoding="utf-8") as f:
+        f.write("\n".join(zeilen) + "\n")
+    return subprocess.CompletedProcess(args, 0)
+
+
+@contextlib.contextmanager
+def stubs():
+    """
+    input(), Editor und Bildschirmausgabe ersetzen (nur im with-Block).
+    """
+
+    alt_input, alt_run = builtins.input, subprocess.run
+    builtins.input, subprocess.run = _input, _editor
+    with open(os.devnull, "w", encoding="utf-8") as leer, contextlib.redirect_stdout(leer):
+        try:
+            yield
+        finally:
+            builtins.input, subprocess.run = alt_input, alt_run
+            sys.stdout.flush()
+
+
+def _frage(k):
+    return k["rng"].randint(1, k["fragen"])
+
+
+def _test(k):
+    return k["rng"].randint(1, k["tests"])
+
+
+def _kategorie(k):
+    return k["rng"].randint(1, k["kategorien"])
+
+
+# --------------------------------------------
+# kategorien.py
+# --------------------------------------------
+@fall("kategorien.alle_kategorien")
+def _(k):
+    return lambda i: kategorien.alle_kategorien()
+
+
+@fall("kategorien.alle_kategorien (kalt)")
+def _(k):
+    def aufruf(i):
+        kategorien.cache_leeren()
+        kategorien.alle_kategorien()
+    return aufruf
+
+
+@fall("kategorien.kategorien_seite")
+def _(k):
+    return lambda i: kategorien.kategorien_seite(None, 20)
+
+
+@fall("kategorien.kategorien_iter")
+def _(k):
+    return lambda i: collections.deque(kategorien.kategorien_iter(), maxlen=0)
+
+
+@fall("kategorien.kategorie_name")
+def _(k):
+    return lambda i: kategorien.kategorie_name(_kategorie(k))
+
+
+@fall("kategorien.kategorie_id")
+def _(k):
+    return lambda i: kategorien.kategorie_id("Hydraulik")
+
+
+@fall("kategorien.kategorie_anlegen")
+def _(k):
+    return lambda i: kategorien.kategorie_anlegen(f"Benchmark {i}")
+
+
+# --------------------------------------------
+# fragen.py
+# --------------------------------------------
+@fall("fragen.fragen_von_kategorie")
+def _(k):
+    return lambda i: fragen.fragen_von_kategorie(_kategorie(k))
+
+
+@fall("fragen.fragen_von_kategorie_seite")
+def _(k):
+    return lambda i: fragen.fragen_von_kategorie_seite(_kategorie(k), None, 20)
+
+
+@fall("fragen.fragen_von_kategorie_iter")
+def _(k):
+    return lambda i: collections.deque(fragen.fragen_von_kategorie_iter(_kategorie(k)), maxlen=0)
+
+
+@fall("fragen.fragen_suchen")
+def _(k):
+    return lambda i: fragen.fragen_suchen("druck ventil*")
+
+
+@fall("fragen.frage_holen")
+def _(k):
+    return lambda i: fragen.frage_holen(_frage(k))
+
+
+@fall("fragen.frage_anlegen")
+def _(k):
+    return lambda i: fragen.frage_anlegen(f"Benchmark-Frage {i} zu Druck und Kolben?", "Lösung", _kategorie(k))
+
+
+@fall("fragen.frage_update")
+def _(k):
+    return lambda i: fragen.frage_update(_frage(k), f"Geänderte Frage {i} zum Ventil?", "Neue Lösung")
+
+
+@fall("fragen.frage_update (mit Version)")
+def _(k):
+    def aufruf(i):
+        qid = _frage(k)
+        version = fragen.frage_holen(qid, mit_version=True)[4]
+        fragen.frage_update(qid, f"Geänderte Frage {i} zum Ventil?", "Neue Lösung", version=version)
+    return aufruf
+
+
+@fall("fragen.frage_bearbeiten_mit_editor")
+def _(k):
+    return lambda i: fragen.frage_bearbeiten_mit_editor(_frage(k))
+
+
+@fall("fragen.kategorie_fragen_bearbeiten")
+def _(k):
+    return lambda i: fragen.kategorie_fragen_bearbeiten(_kategorie(k))
+
+
+# --------------------------------------------
+# tests.py
+# --------------------------------------------
+@fall("tests.alle_tests")
+def _(k):
+    return lambda i: tests.alle_tests()
+
+
+@fall("tests.tests_seite")
+def _(k):
+    return lambda i: tests.tests_seite(None, 20)
+
+
+@fall("tests.alle_tests_iter")
+def _(k):
+    return lambda i: collections.deque(tests.alle_tests_iter(), maxlen=0)
+
+
+@fall("tests.test_holen")
+def _(k):
+    return lambda i: tests.test_holen(_test(k))
+
+
+@fall("tests.fragen_ids_von_test")
+def _(k):
+    return lambda i: tests.fragen_ids_von_test(_test(k))
+
+
+@fall("tests.test_anzeigen")
+def _(k):
+    return lambda i: tests.test_anzeigen(_test(k))
+
+
+@fall("tests.test_anlegen")
+def _(k):
+    return lambda i: tests.test_anlegen(f"Benchmark-Test {i}", "2024-01-01")
+
+
+@fall("tests.test_update")
+def _(k):
+    return lambda i: tests.test_update(_test(k), f"Umbenannt {i}", "2024-02-02")
+
+
+@fall("tests.test_update (mit Version)")
+def _(k):
+    def aufruf(i):
+        tid = _test(k)
+        tests.test_update(tid, f"Umbenannt {i}", "2024-02-02", version=tests.test_holen(tid, mit_version=True)[3])
+    return aufruf
+
+
+@fall("tests.frage_zu_test")
+def _(k):
+    return lambda i: tests.frage_zu_test(_test(k), _frage(k))
+
+
+@fall("tests.fragen_zu_test")
+def _(k):
+    return lambda i: tests.fragen_zu_test(_test(k), [_frage(k) for _ in range(10)])
+
+
+@fall("tests.test_fragen_setzen")
+def _(k):
+    return lambda i: tests.test_fragen_setzen(_test(k), [_frage(k) for _ in range(k["pro_test"])])
+
+
+@fall("tests.test_bearbeiten_mit_editor")
+def _(k):
+    return lambda i: tests.test_bearbeiten_mit_editor(_test(k))
+
+
+@fall("tests.test_fragen_bearbeiten")
+def _(k):
+    return lambda i: tests.test_fragen_bearbeiten(_test(k))
+
+
+# --------------------------------------------
+# rendern.py
+# --------------------------------------------
+@fall("rendern.test_rendern (html)")
+def _(k):
+    return lambda i: rendern.test_rendern(_test(k), "html")
+
+
+@fall("rendern.test_rendern (latex, Cache leer)")
+def _(k):
+    def aufruf(i):
+        rendern.cache_leeren()
+        rendern.test_rendern(_test(k), "latex", mit_loesung=True)
+    return aufruf
+
+
+# --------------------------------------------
+# varianten.py
+# --------------------------------------------
+@fall("varianten.varianten_erzeugen (100, nur DB)")
+def _(k):
+    return lambda i: varianten.varianten_erzeugen(_test(k), 100, seed=i)
+
+
+@fall("varianten.varianten_erzeugen (100 Dateien)")
+def _(k):
+    verzeichnis = tempfile.mkdtemp(prefix="benchmark_varianten_")
+    return lambda i: varianten.varianten_erzeugen(_test(k), 100, seed=i, verzeichnis=verzeichnis)
+
+
+@fall("varianten.variante_holen")
+def _(k):
+    return lambda i: varianten.variante_holen(_test(k), 1)
+
+
+# --------------------------------------------
+# fragenindex.py (Index einmal laden, dann nur noch im Speicher)
+# --------------------------------------------
+@fall("fragenindex.laden")
+def _(k):
+    return lambda i: fragenindex.laden()
+
+
+@fall("fragenindex.tests_mit_frage")
+def _(k):
+    index = fragenindex.laden()
+    return lambda i: index.tests_mit_frage(_frage(k))
+
+
+@fall("fragenindex.unbenutzte_fragen")
+def _(k):
+    index = fragenindex.laden()
+    return lambda i: index.unbenutzte_fragen()
+
+
+@fall("fragenindex.fragen_pro_kategorie")
+def _(k):
+    index = fragenindex.laden()
+    return lambda i: index.fragen_pro_kategorie()
+
+
+# --------------------------------------------
+# statistik.py
+# --------------------------------------------
+@fall("statistik.frage_statistik")
+def _(k):
+    return lambda i: statistik.frage_statistik(_frage(k))
+
+
+@fall("statistik.kategorien_statistik")
+def _(k):
+    return lambda i: statistik.kategorien_statistik()
+
+
+@fall("statistik.meistbenutzte_fragen")
+def _(k):
+    return lambda i: statistik.meistbenutzte_fragen(10)
+
+
+@fall("statistik.unbenutzte_fragen_seite")
+def _(k):
+    return lambda i: statistik.unbenutzte_fragen_seite(None, 50)
+
+
+# --------------------------------------------
+# abgleich.py
+# --------------------------------------------
+@fall("abgleich.delta_exportieren (letzte 1000 Änderungen)")
+def _(k):
+    seit = max(0, abgleich.status()["seq"] - 1000)
+    return lambda i: abgleich.delta_exportieren(os.devnull, seit)
+
+
+@fall("abgleich.delta_importieren (100 neue Fragen)")
+def _(k):
+    # Jeder Aufruf ist eine "andere DB" (eigene Kennung), sonst wäre alles schon übernommen
+    pfad = os.path.join(tempfile.mkdtemp(prefix="benchmark_abgleich_"), "delta.gz")
+    name = kategorien.kategorie_name(_kategorie(k))
+    saetze = [["c", [None, 1], [name]]] + [
+        ["q", [None, n], [f"Frage {n} aus einer anderen DB", "Lösung", [None, 1]]] for n in range(1, 101)
+    ]
+
+    def aufruf(i):
+        kopf = {"format": abgleich.FORMAT, "version": abgleich.VERSION, "kennung": f"benchmark{i}", "von": 0, "bis": 1}
+        with gzip.open(pfad, "wt", encoding="utf-8") as f:
+            f.writelines(json.dumps(z) + "\n" for z in [kopf] + saetze)
+        abgleich.delta_importieren(pfad)
+    return aufruf
+
+
+# --------------------------------------------
+# stapel.py
+# --------------------------------------------
+@fall("stapel.stapel_ausfuehren (100 Befehle)")
+def _(k):
+    def aufruf(i):
+        zeilen = [f't = test add "Stapel {i}" 2024-04-04']
+        for n in range(96):
+            zeilen.append(f'q{n} = frage add {_kategorie(k)} "Stapel-Frage {i}-{n} zum Kolben?" "Lösung"')
+        zeilen.append("test add-fragen $t " + " ".join(f"$q{n}" for n in range(0, 96, 4)))
+        zeilen.append(f'frage update $q0 "Geänderte Stapel-Frage {i}?"')
+        zeilen.append(f'test rename $t "Stapel {i} (neu)"')
+        stapel.stapel_ausfuehren(zeilen)
+    return aufruf
+
+
+# --------------------------------------------
+# start.py (Menü-Aktionen, mit vorbereiteten Eingaben)
+# --------------------------------------------
+def _aktion(aktion, *werte):
+    """Baut einen Fall: erst Antworten setzen, dann Aktion aufrufen."""
+
+    def fabrik(k):
+        def aufruf(i):
+            antworten(*(w(k, i) if callable(w) else w for w in werte))
+            aktion()
+        return aufruf
+
+    return fabrik
+
+
+fall("start.1 Kategorien anzeigen")(_aktion(start.aktion_kategorien_anzeigen))
+fall("start.2 Kategorie anlegen")(_aktion(start.aktion_kategorie_anlegen, lambda k, i: f"Menü {i}"))
+fall("start.3 Fragen anzeigen")(_aktion(start.aktion_fragen_anzeigen, lambda k, i: _kategorie(k)))
+fall("start.4 Frage anlegen")(_aktion(
+    start.aktion_frage_anlegen,
+    lambda k, i: _kategorie(k), lambda k, i: f"Menü-Frage {i} zur Pumpe?", "Lösung",
+))
+fall("start.5 Frage bearbeiten")(_aktion(start.aktion_frage_bearbeiten, lambda k, i: _frage(k)))
+fall("start.6 Tests anzeigen")(_aktion(start.aktion_tests_anzeigen))
+fall("start.7 Test anlegen")(_aktion(start.aktion_test_anlegen, lambda k, i: f"Menü-Test {i}", "2024-03-03"))
+fall("start.8 Test bearbeiten")(_aktion(start.aktion_test_bearbeiten, lambda k, i: _test(k)))
+fall("start.9 Fragen zu Test")(_aktion(
+    start.aktion_fragen_zu_test,
+    lambda k, i: _test(k), lambda k, i: " ".join(str(_frage(k)) for _ in range(10)),
+))
+fall("start.10 Test anzeigen")(_aktion(start.aktion_test_anzeigen_mit_fragen, lambda k, i: _test(k)))
+fall("start.11 Import")(_aktion(
+    start.aktion_fragen_importieren, lambda k, i: importdatei_schreiben(k["importdatei"], i),
+))
+fall("start.12 Export (Test)")(_aktion(
+    start.aktion_exportieren, "t", lambda k, i: _test(k), "markdown", os.devnull,
+))
+fall("start.13 Suche")(_aktion(start.aktion_fragen_suchen, "hydraulik druck", ""))
+fall("start.14 Test generieren")(_aktion(
+    start.aktion_test_generieren, "5 aus 1, 3 aus 2", lambda k, i: f"Zufall {i}", "", "", "3",
+))
+fall("start.15 Duplikate (eine Frage)")(_aktion(start.aktion_duplikate, lambda k, i: _frage(k)))
+fall("start.17 Viele Fragen bearbeiten (Test)")(_aktion(
+    start.aktion_fragen_sammel_bearbeiten, "t", lambda k, i: _test(k),
+))
+fall("start.18 Test drucken")(_aktion(
+    start.aktion_test_drucken, lambda k, i: _test(k), "markdown", "j", os.devnull,
+))
+fall("start.20 Statistik")(_aktion(start.aktion_statistik, "j"))
+fall("start.21 Abgleich")(_aktion(
+    start.aktion_abgleich, "e", lambda k, i: max(0, abgleich.status()["seq"] - 100), os.devnull,
+))
+
+
+def importdatei_anlegen():
+    """
+    Leere Temp-Datei für den Import-Fall. Rückgabe: Dateiname
+    """
+
+    fd, pfad = tempfile.mkstemp(suffix=".jsonl", prefix="benchmark_import_")
+    os.close(fd)
+    return pfad
+
+
+def importdatei_schreiben(pfad, i, anzahl=20):
+    """
+    Schreibt `anzahl` neue Fragen (Text enthält i, sonst würde jeder Aufruf
+    die gleichen Fragen importieren und die Duplikat-Suche immer teurer).
+    Rückgabe: Dateiname
+    """
+
+    with open(pfad, "w", encoding="utf-8") as f:
+        for n in range(anzahl):
+            f.write(
+                '{"category": "Hydraulik", '
+                f'"question_text": "Import {i}-{n}: Wie arbeitet ein Wegeventil mit {i * anzahl + n} bar?", '
+                '"solution": "Es schaltet den Ölstrom."}\n'
+            )
+    return pfad
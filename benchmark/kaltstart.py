@@ -0,0 +1,69 @@
+# benchmark/kaltstart.py
+# Misst, wie lange "python start.py <befehl>" vom Start bis zum Ende braucht.
+#
+# Für dumme:
+# - cron-Jobs und Shell-Skripte rufen das Programm tausende Male am Tag auf.
+#   Dann zählt vor allem die Startzeit (Python starten, Module importieren,
+#   DB öffnen), nicht die eigentliche Abfrage.
+# - Jeder Aufruf ist ein neuer Prozess (wie im echten Leben).
+# - "python (leer)" ist die Untergrenze: so lange braucht Python allein.
+# - "frage add" läuft wie direkt nach einem großen Import: vorher wird jedes
+#   Mal der ganze Duplikat-Index als offen markiert (nicht mitgemessen).
+
+import os
+import subprocess
+import sys
+
+import datenbank
+from benchmark import messen
+
+
+ZIEL_MS = 150
+# So lange (p50) darf ein einfacher Befehl höchstens dauern.
+
+START_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "start.py")
+
+BEFEHLE = {
+    "kaltstart.python (leer)": [sys.executable, "-c", "pass"],
+    "kaltstart.kategorien list": [sys.executable, START_PY, "kategorien", "list"],
+    "kaltstart.test show --json": [sys.executable, START_PY, "test", "show", "1", "--json"],
+    "kaltstart.frage show": [sys.executable, START_PY, "frage", "show", "1"],
+    "kaltstart.frage add": [sys.executable, START_PY, "frage", "add", "1", "Kaltstart-Frage zu Druck und Kolben?"],
+}
+
+
+def _alles_offen(i):
+    """Wie nach einem Import ohne --duplikate: alle Signaturen fehlen."""
+    with datenbank.transaktion() as conn:
+        conn.execute("INSERT OR IGNORE INTO question_minhash_offen (question_id) SELECT id FROM questions;")
+
+
+VORHER = {
+    "kaltstart.frage add": _alles_offen,
+}
+
+
+def messen_alle(db, wiederholungen=20, filter=""):
+    """
+    Rückgabe: {Name: Kennzahlen (+ "ziel_ms")}
+    Achtung: "frage add" schreibt in die DB `db` (datenbank muss schon darauf zeigen).
+    """
+
+    env = dict(os.environ, TESTAPP_DB=db)
+    env.pop("TESTAPP_MESSEN", None)  # Messung würde die Startzeit verfälschen
+
+    ergebnisse = {}
+    for name, befehl in BEFEHLE.items():
+        if filter not in name:
+            continue
+
+        def aufruf(i):
+            subprocess.run(befehl, env=env, stdout=subprocess.DEVNULL, check=True)
+
+        r = messen.zusammenfassen(
+            messen.messen(aufruf, wiederholungen, max_sekunden=10.0, vorher=VORHER.get(name))
+        )
+        if "(leer)" not in name:
+            r["ziel_ms"] = ZIEL_MS
+        ergebnisse[name] = r
+    return ergebnisse
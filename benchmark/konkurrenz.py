@@ -0,0 +1,183 @@
+# benchmark/konkurrenz.py
+# Mehrere PROZESSE schreiben gleichzeitig in dieselbe DB-Datei.
+#
+#   python -m benchmark konkurrenz                      -> 4 Prozesse, je Modus 3 Sekunden
+#   python -m benchmark konkurrenz --prozesse 8 --sekunden 5 --ausgabe -
+#
+# Für dumme:
+# - Jeder Prozess macht immer wieder: Frage lesen, Zähler im Text um 1
+#   erhöhen, zurückschreiben (wie der Editor, nur ohne Tippen).
+#   Alle kämpfen um dieselben HEISSE Fragen.
+# - Modus "blind":   frage_update() ohne Version (so war es früher).
+#                    Schreibt ein anderer zwischen Lesen und Schreiben,
+#                    geht dessen Erhöhung verloren ("verloren" > 0).
+# - Modus "version": frage_update(..., version=...) -> VersionsKonflikt,
+#                    dann neu lesen und nochmal. Nichts darf verloren gehen
+#                    und die Versionsnummer muss genau mitgezählt haben.
+# - "gesperrt" zählt "database is locked" (busy_timeout + Wiederholungen in
+#   datenbank.schreibsperre_holen() sollten das auf 0 halten).
+#
+# Exit-Code 1, wenn im Modus "version" etwas verloren ging oder gesperrt war.
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import datenbank
+import fragen
+from benchmark import daten, messen
+
+
+MODI = ("blind", "version")
+
+HEISSE = 4
+# Um so viele Fragen streiten sich alle Prozesse
+
+
+def _zaehler(text):
+    return int(text.rsplit(":", 1)[1])
+
+
+def _arbeiter(pfad, modus, heisse, sekunden, bereit, los, ergebnisse):
+    """Läuft in einem eigenen Prozess. Ergebnis als dict in die Queue `ergebnisse`."""
+
+    datenbank.datenbank_wechseln(pfad)
+    fragen.frage_holen(heisse[0])  # Verbindung schon vor dem Start öffnen
+    rng = random.Random(os.getpid())
+    erfolge = Counter()
+    konflikte = gesperrt = 0
+    zeiten = []
+
+    bereit.put(os.getpid())
+    los.wait()
+    ende = time.perf_counter() + sekunden
+
+    while time.perf_counter() < ende:
+        qid = rng.choice(heisse)
+        start = time.perf_counter()
+        try:
+            while True:
+                _, text, loesung, _, version = fragen.frage_holen(qid, mit_version=True)
+                try:
+                    fragen.frage_update(
+                        qid, f"Zähler: {_zaehler(text) + 1}", loesung,
+                        version=version if modus == "version" else None,
+                    )
+                    break
+                except datenbank.VersionsKonflikt:
+                    konflikte += 1  # jemand war schneller -> neu lesen
+        except sqlite3.OperationalError as e:
+            if not datenbank.ist_gesperrt(e):
+                raise
+            gesperrt += 1
+            continue
+        zeiten.append(time.perf_counter() - start)
+        erfolge[qid] += 1
+
+    datenbank.verbindungen_schliessen()
+    ergebnisse.put({"erfolge": dict(erfolge), "konflikte": konflikte, "gesperrt": gesperrt, "zeiten": zeiten})
+
+
+def _stand(heisse):
+    """{frage_id: (zähler, version)}"""
+    return {qid: (_zaehler(r[1]), r[4]) for qid in heisse for r in [fragen.frage_holen(qid, mit_version=True)]}
+
+
+def durchlauf(pfad, modus, prozesse=4, sekunden=3.0):
+    """
+    Ein Durchlauf mit `prozesse` gleichzeitigen Schreibern.
+    Rückgabe: dict mit Durchsatz, Konflikten, verlorenen Updates, Latenz (ms)
+    """
+
+    heisse = [r[0] for r in datenbank.verbindung().execute(
+        "SELECT id FROM questions ORDER BY id LIMIT ?;", (HEISSE,)
+    )]
+    for qid in heisse:
+        fragen.frage_update(qid, "Zähler: 0", "")
+    vorher = _stand(heisse)
+    datenbank.verbindungen_schliessen()
+
+    # "spawn" = frische Prozesse (kein geerbter Verbindungs-Zustand vom Elternprozess)
+    ctx = multiprocessing.get_context("spawn")
+    bereit, ergebnisse, los = ctx.Queue(), ctx.Queue(), ctx.Event()
+    alle = [
+        ctx.Process(target=_arbeiter, args=(pfad, modus, heisse, sekunden, bereit, los, ergebnisse))
+        for _ in range(prozesse)
+    ]
+    for p in alle:
+        p.start()
+    for _ in alle:
+        bereit.get()
+    start = time.perf_counter()
+    los.set()
+    teile = [ergebnisse.get() for _ in alle]
+    dauer = time.perf_counter() - start
+    for p in alle:
+        p.join()
+
+    nachher = _stand(heisse)
+    erfolge = Counter()
+    for t in teile:
+        erfolge.update({int(k): v for k, v in t["erfolge"].items()})
+    updates = sum(erfolge.values())
+    gezaehlt = sum(nachher[q][0] - vorher[q][0] for q in heisse)
+    falsche_version = [q for q in heisse if nachher[q][1] - vorher[q][1] != erfolge[q]]
+
+    zeiten = [z for t in teile for z in t["zeiten"]]
+    ergebnis = {
+        "modus": modus,
+        "prozesse": prozesse,
+        "updates": updates,
+        "updates_pro_s": round(updates / dauer, 1),
+        "konflikte": sum(t["konflikte"] for t in teile),
+        "gesperrt": sum(t["gesperrt"] for t in teile),
+        "verloren": updates - gezaehlt,
+        "version_falsch": falsche_version,
+    }
+    if zeiten:
+        ergebnis.update(messen.zusammenfassen(zeiten))
+    return ergebnis
+
+
+def main(argumente):
+    p = argparse.ArgumentParser(prog="python -m benchmark konkurrenz", description="Mehrere Schreib-Prozesse gleichzeitig.")
+    p.add_argument("--prozesse", type=int, default=4)
+    p.add_argument("--sekunden", type=float, default=3.0, help="Dauer pro Modus")
+    p.add_argument("--modus", choices=MODI, help="nur diesen Modus (Standard: beide)")
+    p.add_argument("--db", help="Pfad der Benchmark-DB (Standard: im Temp-Ordner, wird neu erzeugt)")
+    p.add_argument("--ausgabe", help="JSON-Ergebnis in diese Datei ('-' = Bildschirm)")
+    a = p.parse_args(argumente)
+
+    pfad = a.db or os.path.join(tempfile.gettempdir(), "benchmark_konkurrenz.db")
+    daten.erzeugen(pfad, fragen=200, tests=10, duplikat_index=False)
+
+    ergebnisse = []
+    for modus in ([a.modus] if a.modus else MODI):
+        r = durchlauf(pfad, modus, a.prozesse, a.sekunden)
+        ergebnisse.append(r)
+        if a.ausgabe != "-":
+            latenz = f"p50 {r['p50_ms']:8.3f} ms   p99 {r['p99_ms']:8.3f} ms" if "p50_ms" in r else ""
+            print(
+                f"{modus:8} {r['prozesse']} Prozesse  {r['updates_pro_s']:8.1f} Updates/s   "
+                f"Konflikte {r['konflikte']:6}   gesperrt {r['gesperrt']:3}   verloren {r['verloren']:6}   {latenz}"
+            )
+
+    if a.ausgabe == "-":
+        json.dump(ergebnisse, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    elif a.ausgabe:
+        with open(a.ausgabe, "w", encoding="utf-8") as f:
+            json.dump(ergebnisse, f, ensure_ascii=False, indent=2)
+
+    kaputt = [r for r in ergebnisse if r["modus"] == "version" and (r["verloren"] or r["gesperrt"] or r["version_falsch"])]
+    if kaputt:
+        print("Modus version: Updates verloren, Version falsch oder DB gesperrt!", file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,69 @@
+# benchmark/messen.py
+# Zeit messen und in Perzentile umrechnen.
+
+import time
+
+
+def messen(aufruf, wiederholungen=30, aufwaermen=2, max_sekunden=5.0, vorher=None):
+    """
+    Ruft aufruf(i) erst `aufwaermen` Mal ohne Messung auf (Caches füllen),
+    dann bis zu `wiederholungen` Mal mit Messung.
+    Dauert es insgesamt länger als max_sekunden, hören wir früher auf
+    (aber nie mit weniger als 3 Messungen).
+    vorher(i) läuft vor JEDEM Aufruf und wird nicht mitgemessen.
+
+    i zählt immer weiter hoch, damit Schreib-Fälle eindeutige Namen bauen können.
+    Rückgabe: Liste von Sekunden
+    """
+
+    for i in range(aufwaermen):
+        if vorher is not None:
+            vorher(i)
+        aufruf(i)
+
+    zeiten = []
+    ende = time.perf_counter() + max_sekunden
+    for i in range(aufwaermen, aufwaermen + wiederholungen):
+        if vorher is not None:
+            vorher(i)
+        start = time.perf_counter()
+        aufruf(i)
+        jetzt = time.perf_counter()
+        zeiten.append(jetzt - start)
+        if jetzt > ende and len(zeiten) >= 3:
+            break
+    return zeiten
+
+
+def perzentil(sortiert, p):
+    """
+    p-tes Perzentil (0..100) einer SORTIERTEN Liste, linear interpoliert.
+    """
+
+    if len(sortiert) == 1:
+        return sortiert[0]
+    pos = (len(sortiert) - 1) * p / 100
+    unten = int(pos)
+    oben = min(unten + 1, len(sortiert) - 1)
+    return sortiert[unten] + (sortiert[oben] - sortiert[unten]) * (pos - unten)
+
+
+def zusammenfassen(zeiten):
+    """
+    Macht aus den Einzelzeiten die Kennzahlen in Millisekunden.
+    """
+
+    s = sorted(zeiten)
+
+    def ms(sekunden):
+        return round(sekunden * 1000, 4)
+
+    return {
+        "n": len(s),
+        "min_ms": ms(s[0]),
+        "p50_ms": ms(perzentil(s, 50)),
+        "p90_ms": ms(perzentil(s, 90)),
+        "p99_ms": ms(perzentil(s, 99)),
+        "max_ms": ms(s[-1]),
+        "mittel_ms": ms(sum(s) / len(s)),
+    }
@@ -2,27 +2,558 @@
 # Hier kommt ALLES rein, was mit der Datenbank zu tun hat.
 # Der Rest vom Programm soll nur Funktionen aus dieser Datei benutzen.
 
-import sqlite3  # Standard-Modul von Python für SQLite (keine Extra-Installation nötig)
+import atexit       # Damit wir beim Programmende alle Verbindungen sauber schließen
+import os           # Für den Pfad zu vorlage.sql
+import queue        # Für den Pool mit Lese-Verbindungen
+import random       # Zufällige Wartezeit, wenn die DB gerade gesperrt ist
+import sqlite3      # Standard-Modul von Python für SQLite (keine Extra-Installation nötig)
+import threading    # Jeder Thread bekommt seine eigene Verbindung
+import time
+from contextlib import contextmanager
 
 
-DB_DATEI = "datenbank.db"
+DB_DATEI = os.environ.get("TESTAPP_DB", "datenbank.db")
 # Das ist einfach der Dateiname der SQLite-Datenbank.
 # Weil alle Dateien im gleichen Ordner liegen, reicht der Name.
 # Wichtig: SQLite erstellt diese Datei automatisch, wenn sie noch nicht existiert.
+# Mit der Umgebungsvariable TESTAPP_DB kann man eine andere Datei nehmen
+# (z.B. für Skripte/cron: TESTAPP_DB=/pfad/zur.db python start.py ...).
 
+STATEMENT_CACHE = 256
+# Wie viele vorbereitete SQL-Befehle sqlite3 pro Verbindung merkt.
+# Für dumme: derselbe SQL-Text muss dann nicht jedes Mal neu "übersetzt" werden.
 
-def verbindung():
+PRAGMAS = {
+    "busy_timeout": 2000,        # ms: so lange wartet SQLite selbst, wenn ein anderer gerade schreibt
+    "journal_mode": "WAL",       # Leser blockieren Schreiber nicht (und umgekehrt)
+    "synchronous": "NORMAL",     # Mit WAL sicher genug und viel schneller als FULL
+    "cache_size": -64000,        # negativ = KiB -> ca. 64 MB Seiten-Cache
+    "mmap_size": 268435456,      # 256 MB der Datei direkt in den Speicher mappen
+    "temp_store": "MEMORY",      # Temp-Tabellen/Sortierungen im RAM
+}
+# Diese PRAGMAs werden EINMAL pro Verbindung gesetzt (nicht bei jedem Aufruf).
+
+SCHREIB_VERSUCHE = 5
+WARTEN_START = 0.05
+# Bekommt transaktion() die Schreibsperre auch nach busy_timeout nicht
+# ("database is locked"), wird es so oft neu versucht. Vor jedem neuen Versuch
+# wird zufällig zwischen 0 und WARTEN_START * 2^versuch Sekunden gewartet.
+# Für dumme: würden alle wartenden Programme gleich lange warten, würden sie
+# auch alle gleichzeitig wieder anklopfen (und sich wieder gegenseitig sperren).
+
+VERBINDUNGS_KLASSE = sqlite3.Connection
+# Klasse für neue Verbindungen. messung.einschalten() tauscht sie gegen eine
+# messende Klasse aus. Normal bleibt es die ganz normale sqlite3-Verbindung
+# (also kein Extra-Aufwand, wenn nicht gemessen wird).
+
+LESE_POOL = 8
+# So viele Lese-Verbindungen hält leseverbindung() höchstens offen
+# (z.B. für den HTTP-Server: viele Threads teilen sich diese Verbindungen).
+
+VORLAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vorlage.sql")
+# Das Grund-Schema (Tabellen). Wird automatisch ausgeführt, wenn die DB neu ist.
+
+MIGRATIONEN = [
+    # (Version, SQL)
+    # Für dumme:
+    # - Jede Änderung am Schema bekommt eine fortlaufende Nummer.
+    # - Die Nummer der DB steht in "PRAGMA user_version".
+    # - Beim Start werden alle Migrationen mit größerer Nummer ausgeführt.
+    # - NIE eine alte Migration ändern, immer eine neue hinten anhängen!
+    (1, """
+        -- Fragen einer Kategorie (fragen_von_kategorie) ohne Full-Table-Scan
+        CREATE INDEX IF NOT EXISTS idx_questions_category
+            ON questions (category_id, id);
+
+        -- Rückwärts: in welchen Tests ist Frage X? (PRIMARY KEY hilft nur test_id -> question_id)
+        CREATE INDEX IF NOT EXISTS idx_test_questions_question
+            ON test_questions (question_id, test_id);
+    """),
+    (2, """
+        -- Volltextsuche (FTS5) über Fragetext und Lösung.
+        -- content='questions' = FTS speichert die Texte NICHT doppelt,
+        -- sondern nur den Such-Index. Die Texte kommen aus questions.
+        CREATE VIRTUAL TABLE IF NOT EXISTS questions_fts USING fts5(
+            question_text,
+            solution,
+            content='questions',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+
+        -- Trigger halten den Index automatisch aktuell (egal wer schreibt)
+        CREATE TRIGGER IF NOT EXISTS questions_fts_ai AFTER INSERT ON questions BEGIN
+            INSERT INTO questions_fts (rowid, question_text, solution)
+            VALUES (new.id, new.question_text, new.solution);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS questions_fts_ad AFTER DELETE ON questions BEGIN
+            INSERT INTO questions_fts (questions_fts, rowid, question_text, solution)
+            VALUES ('delete', old.id, old.question_text, old.solution);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS questions_fts_au AFTER UPDATE OF question_text, solution ON questions BEGIN
+            INSERT INTO questions_fts (questions_fts, rowid, question_text, solution)
+            VALUES ('delete', old.id, old.question_text, old.solution);
+            INSERT INTO questions_fts (rowid, question_text, solution)
+            VALUES (new.id, new.question_text, new.solution);
+        END;
+
+        -- Relevanz (rank) = bm25, Treffer im Fragetext zählen 10x mehr als in der Lösung.
+        -- Mit "ORDER BY rank" sortiert FTS5 dann selbst (kein extra Sortieren).
+        INSERT INTO questions_fts (questions_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)');
+
+        -- Bereits vorhandene Fragen einmalig in den Index übernehmen
+        INSERT INTO questions_fts (questions_fts) VALUES ('rebuild');
+    """),
+    (3, """
+        -- Duplikat-Erkennung (duplikate.py): MinHash-Signatur pro Frage ...
+        CREATE TABLE IF NOT EXISTS question_minhash (
+            question_id INTEGER PRIMARY KEY,   -- zeigt auf questions.id
+            signatur BLOB NOT NULL             -- 64 Zahlen a 8 Byte
+        );
+
+        -- ... und die LSH-Eimer: Fragen im selben (band, bucket) sind Kandidaten
+        CREATE TABLE IF NOT EXISTS question_lsh (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            question_id INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, question_id)
+        ) WITHOUT ROWID;
+
+        CREATE INDEX IF NOT EXISTS idx_question_lsh_question
+            ON question_lsh (question_id);
+
+        -- Fragen, deren Signatur (neu) berechnet werden muss.
+        -- Die Trigger tragen hier ein, duplikate.index_aktualisieren() arbeitet es ab.
+        CREATE TABLE IF NOT EXISTS question_minhash_offen (
+            question_id INTEGER PRIMARY KEY
+        );
+
+        CREATE TRIGGER IF NOT EXISTS question_minhash_ai AFTER INSERT ON questions BEGIN
+            INSERT OR IGNORE INTO question_minhash_offen (question_id) VALUES (new.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS question_minhash_au AFTER UPDATE OF question_text ON questions BEGIN
+            DELETE FROM question_minhash WHERE question_id = old.id;
+            DELETE FROM question_lsh WHERE question_id = old.id;
+            INSERT OR IGNORE INTO question_minhash_offen (question_id) VALUES (new.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS question_minhash_ad AFTER DELETE ON questions BEGIN
+            DELETE FROM question_minhash WHERE question_id = old.id;
+            DELETE FROM question_lsh WHERE question_id = old.id;
+            DELETE FROM question_minhash_offen WHERE question_id = old.id;
+        END;
+
+        -- Alle schon vorhandenen Fragen müssen einmal berechnet werden
+        INSERT OR IGNORE INTO question_minhash_offen (question_id) SELECT id FROM questions;
+    """),
+    (4, """
+        -- Fertig gerenderte Fragen (rendern.py) für HTML/Markdown/LaTeX.
+        -- schluessel = Hash über Format + Fragetext + Lösung: ändert sich die
+        -- Frage, passt der alte Eintrag einfach nicht mehr (kein Trigger nötig).
+        CREATE TABLE IF NOT EXISTS render_cache (
+            schluessel TEXT NOT NULL UNIQUE,
+            fragment TEXT NOT NULL
+        );
+    """),
+    (5, """
+        -- Varianten eines Tests (varianten.py): pro Schüler eine eigene Reihenfolge.
+        -- Gespeichert wird nur die Reihenfolge (JSON), nicht der ganze Text:
+        --   [[frage_id, [antwort-reihenfolge]], ...]
+        CREATE TABLE IF NOT EXISTS test_variants (
+            test_id INTEGER NOT NULL REFERENCES tests(id) ON DELETE CASCADE,
+            nummer INTEGER NOT NULL,     -- 1, 2, 3, ... (z.B. pro Schüler)
+            seed INTEGER NOT NULL,       -- damit man die Variante nachbauen kann
+            reihenfolge TEXT NOT NULL,
+            PRIMARY KEY (test_id, nummer)
+        ) WITHOUT ROWID;
+    """),
+    (6, """
+        -- Nutzungs-Statistik (statistik.py): fertige Zahlen statt GROUP BY über alles.
+        -- Die Trigger unten halten sie aktuell, egal wer schreibt.
+        CREATE TABLE IF NOT EXISTS question_stats (
+            question_id INTEGER PRIMARY KEY,          -- zeigt auf questions.id
+            anzahl_tests INTEGER NOT NULL DEFAULT 0,  -- in so vielen Tests ist die Frage
+            letzter_test INTEGER                      -- neuester Test (größte ID) mit der Frage, NULL = nie benutzt
+        );
+
+        -- "nie benutzt" (anzahl_tests = 0) und "am häufigsten" ohne alles zu lesen
+        CREATE INDEX IF NOT EXISTS idx_question_stats_anzahl
+            ON question_stats (anzahl_tests, question_id);
+
+        CREATE TABLE IF NOT EXISTS category_stats (
+            category_id INTEGER PRIMARY KEY,             -- zeigt auf categories.id
+            anzahl_fragen INTEGER NOT NULL DEFAULT 0,
+            anzahl_nutzungen INTEGER NOT NULL DEFAULT 0,  -- Summe von anzahl_tests aller Fragen
+            unbenutzte_fragen INTEGER NOT NULL DEFAULT 0
+        );
+
+        -- Neue Frage: noch in keinem Test
+        CREATE TRIGGER IF NOT EXISTS statistik_questions_ai AFTER INSERT ON questions BEGIN
+            INSERT OR REPLACE INTO question_stats (question_id, anzahl_tests, letzter_test)
+            VALUES (new.id, 0, NULL);
+            INSERT INTO category_stats (category_id, anzahl_fragen, unbenutzte_fragen)
+            VALUES (new.category_id, 1, 1)
+            ON CONFLICT (category_id) DO UPDATE SET
+                anzahl_fragen = anzahl_fragen + 1,
+                unbenutzte_fragen = unbenutzte_fragen + 1;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS statistik_questions_ad AFTER DELETE ON questions BEGIN
+            UPDATE category_stats SET
+                anzahl_fragen = anzahl_fragen - 1,
+                anzahl_nutzungen = anzahl_nutzungen
+                    - IFNULL((SELECT anzahl_tests FROM question_stats WHERE question_id = old.id), 0),
+                unbenutzte_fragen = unbenutzte_fragen
+                    - IFNULL((SELECT anzahl_tests = 0 FROM question_stats WHERE question_id = old.id), 0)
+            WHERE category_id = old.category_id;
+            DELETE FROM question_stats WHERE question_id = old.id;
+        END;
+
+        -- Frage wechselt die Kategorie: ihre Zahlen wandern mit
+        CREATE TRIGGER IF NOT EXISTS statistik_questions_au AFTER UPDATE OF category_id ON questions
+        WHEN old.category_id IS NOT new.category_id BEGIN
+            UPDATE category_stats SET
+                anzahl_fragen = anzahl_fragen - 1,
+                anzahl_nutzungen = anzahl_nutzungen
+                    - IFNULL((SELECT anzahl_tests FROM question_stats WHERE question_id = new.id), 0),
+                unbenutzte_fragen = unbenutzte_fragen
+                    - IFNULL((SELECT anzahl_tests = 0 FROM question_stats WHERE question_id = new.id), 0)
+            WHERE category_id = old.category_id;
+            INSERT INTO category_stats (category_id, anzahl_fragen, anzahl_nutzungen, unbenutzte_fragen)
+            SELECT new.category_id, 1, anzahl_tests, anzahl_tests = 0
+            FROM question_stats WHERE question_id = new.id
+            ON CONFLICT (category_id) DO UPDATE SET
+                anzahl_fragen = anzahl_fragen + 1,
+                anzahl_nutzungen = anzahl_nutzungen + excluded.anzahl_nutzungen,
+                unbenutzte_fragen = unbenutzte_fragen + excluded.unbenutzte_fragen;
+        END;
+
+        -- Frage kommt in einen Test (Kategorie zuerst: braucht den ALTEN anzahl_tests)
+        CREATE TRIGGER IF NOT EXISTS statistik_test_questions_ai AFTER INSERT ON test_questions BEGIN
+            UPDATE category_stats SET
+                anzahl_nutzungen = anzahl_nutzungen + 1,
+                unbenutzte_fragen = unbenutzte_fragen
+                    - IFNULL((SELECT anzahl_tests = 0 FROM question_stats WHERE question_id = new.question_id), 0)
+            WHERE category_id = (SELECT category_id FROM questions WHERE id = new.question_id);
+            UPDATE question_stats SET
+                anzahl_tests = anzahl_tests + 1,
+                letzter_test = MAX(IFNULL(letzter_test, new.test_id), new.test_id)
+            WHERE question_id = new.question_id;
+        END;
+
+        -- Frage fliegt aus einem Test. War es der neueste, den nächstneuesten
+        -- suchen (über idx_test_questions_question, kein Scan).
+        CREATE TRIGGER IF NOT EXISTS statistik_test_questions_ad AFTER DELETE ON test_questions BEGIN
+            UPDATE category_stats SET
+                anzahl_nutzungen = anzahl_nutzungen - 1,
+                unbenutzte_fragen = unbenutzte_fragen
+                    + IFNULL((SELECT anzahl_tests = 1 FROM question_stats WHERE question_id = old.question_id), 0)
+            WHERE category_id = (SELECT category_id FROM questions WHERE id = old.question_id);
+            UPDATE question_stats SET
+                anzahl_tests = anzahl_tests - 1,
+                letzter_test = CASE WHEN letzter_test = old.test_id
+                    THEN (SELECT MAX(test_id) FROM test_questions WHERE question_id = old.question_id)
+                    ELSE letzter_test END
+            WHERE question_id = old.question_id;
+        END;
+
+        -- Zeile geändert = alte Zuordnung weg + neue dazu
+        CREATE TRIGGER IF NOT EXISTS statistik_test_questions_au AFTER UPDATE ON test_questions
+        WHEN old.test_id IS NOT new.test_id OR old.question_id IS NOT new.question_id BEGIN
+            UPDATE category_stats SET
+                anzahl_nutzungen = anzahl_nutzungen - 1,
+                unbenutzte_fragen = unbenutzte_fragen
+                    + IFNULL((SELECT anzahl_tests = 1 FROM question_stats WHERE question_id = old.question_id), 0)
+            WHERE category_id = (SELECT category_id FROM questions WHERE id = old.question_id);
+            UPDATE question_stats SET
+                anzahl_tests = anzahl_tests - 1,
+                letzter_test = (SELECT MAX(test_id) FROM test_questions WHERE question_id = old.question_id)
+            WHERE question_id = old.question_id;
+            UPDATE category_stats SET
+                anzahl_nutzungen = anzahl_nutzungen + 1,
+                unbenutzte_fragen = unbenutzte_fragen
+                    - IFNULL((SELECT anzahl_tests = 0 FROM question_stats WHERE question_id = new.question_id), 0)
+            WHERE category_id = (SELECT category_id FROM questions WHERE id = new.question_id);
+            UPDATE question_stats SET
+                anzahl_tests = anzahl_tests + 1,
+                letzter_test = (SELECT MAX(test_id) FROM test_questions WHERE question_id = new.question_id)
+            WHERE question_id = new.question_id;
+        END;
+
+        -- Einmalig: Zahlen für alle schon vorhandenen Fragen
+        INSERT OR REPLACE INTO question_stats (question_id, anzahl_tests, letzter_test)
+        SELECT q.id, COUNT(tq.test_id), MAX(tq.test_id)
+        FROM questions q
+        LEFT JOIN test_questions tq ON tq.question_id = q.id
+        GROUP BY q.id;
+
+        INSERT OR REPLACE INTO category_stats (category_id, anzahl_fragen, anzahl_nutzungen, unbenutzte_fragen)
+        SELECT q.category_id, COUNT(*), SUM(s.anzahl_tests), SUM(s.anzahl_tests = 0)
+        FROM questions q
+        JOIN question_stats s ON s.question_id = q.id
+        GROUP BY q.category_id;
+    """),
+    (7, """
+        -- Abgleich zwischen Datenbanken (abgleich.py).
+        -- Eine Zeile: zufällige Kennung dieser DB + Schalter für die Trigger unten.
+        CREATE TABLE IF NOT EXISTS sync_status (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            kennung TEXT NOT NULL,                     -- 16 Hex-Zeichen, pro DB verschieden
+            protokollieren INTEGER NOT NULL DEFAULT 1  -- 0 = Trigger schreiben nichts (beim Import)
+        );
+        INSERT OR IGNORE INTO sync_status (id, kennung, protokollieren)
+        VALUES (1, lower(hex(randomblob(8))), 1);
+
+        -- Welche Zeilen haben sich geändert? Pro Zeile nur EIN Eintrag:
+        -- die Trigger löschen den alten, der neue bekommt eine neue (größere) seq.
+        -- (Nicht INSERT OR REPLACE: bei "INSERT OR IGNORE INTO test_questions"
+        -- würde SQLite im Trigger auch IGNORE draus machen!)
+        -- "Alles seit seq 120" = Bereich im Primärschlüssel, egal wie groß die DB ist.
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tabelle TEXT NOT NULL,             -- categories, questions, tests, test_questions
+            zeile INTEGER NOT NULL,            -- id (bei test_questions: test_id)
+            zeile2 INTEGER NOT NULL DEFAULT 0, -- nur test_questions: question_id
+            UNIQUE (tabelle, zeile, zeile2)
+        );
+
+        -- Zeilen aus anderen DBs: (Kennung dort, ID dort) -> ID hier
+        CREATE TABLE IF NOT EXISTS sync_ids (
+            tabelle TEXT NOT NULL,
+            herkunft TEXT NOT NULL,
+            fremde_id INTEGER NOT NULL,
+            lokale_id INTEGER NOT NULL,
+            PRIMARY KEY (tabelle, herkunft, fremde_id)
+        ) WITHOUT ROWID;
+
+        -- Andersrum (beim Export): woher stammt unsere Zeile X?
+        CREATE INDEX IF NOT EXISTS idx_sync_ids_lokal
+            ON sync_ids (tabelle, lokale_id);
+
+        -- Bis wohin sind die Änderungen eines Partners schon übernommen?
+        CREATE TABLE IF NOT EXISTS sync_partner (
+            kennung TEXT PRIMARY KEY,
+            bis_seq INTEGER NOT NULL,    -- seq im change_log DES PARTNERS
+            lokal_seq INTEGER NOT NULL,  -- unser change_log beim letzten Import (für Konflikte)
+            zeitpunkt TEXT NOT NULL
+        ) WITHOUT ROWID;
+
+        -- Jede Änderung -> Eintrag im change_log (außer beim Import: protokollieren = 0)
+        CREATE TRIGGER IF NOT EXISTS change_log_categories_ai AFTER INSERT ON categories
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'categories' AND zeile = new.id AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('categories', new.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_categories_au AFTER UPDATE ON categories
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'categories' AND zeile IN (old.id, new.id) AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) SELECT 'categories', old.id WHERE old.id IS NOT new.id;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('categories', new.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_categories_ad AFTER DELETE ON categories
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'categories' AND zeile = old.id AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('categories', old.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_questions_ai AFTER INSERT ON questions
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'questions' AND zeile = new.id AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('questions', new.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_questions_au AFTER UPDATE ON questions
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'questions' AND zeile IN (old.id, new.id) AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) SELECT 'questions', old.id WHERE old.id IS NOT new.id;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('questions', new.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_questions_ad AFTER DELETE ON questions
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'questions' AND zeile = old.id AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('questions', old.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_tests_ai AFTER INSERT ON tests
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'tests' AND zeile = new.id AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('tests', new.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_tests_au AFTER UPDATE ON tests
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'tests' AND zeile IN (old.id, new.id) AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) SELECT 'tests', old.id WHERE old.id IS NOT new.id;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('tests', new.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_tests_ad AFTER DELETE ON tests
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log WHERE tabelle = 'tests' AND zeile = old.id AND zeile2 = 0;
+            INSERT INTO change_log (tabelle, zeile) VALUES ('tests', old.id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_test_questions_ai AFTER INSERT ON test_questions
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log
+            WHERE tabelle = 'test_questions' AND zeile = new.test_id AND zeile2 = new.question_id;
+            INSERT INTO change_log (tabelle, zeile, zeile2) VALUES ('test_questions', new.test_id, new.question_id);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_test_questions_au AFTER UPDATE ON test_questions
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log
+            WHERE tabelle = 'test_questions' AND zeile = old.test_id AND zeile2 = old.question_id;
+            DELETE FROM change_log
+            WHERE tabelle = 'test_questions' AND zeile = new.test_id AND zeile2 = new.question_id;
+            INSERT INTO change_log (tabelle, zeile, zeile2) VALUES ('test_questions', old.test_id, old.question_id);
+            INSERT INTO change_log (tabelle, zeile, zeile2) SELECT 'test_questions', new.test_id, new.question_id
+            WHERE old.test_id IS NOT new.test_id OR old.question_id IS NOT new.question_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS change_log_test_questions_ad AFTER DELETE ON test_questions
+        WHEN (SELECT protokollieren FROM sync_status) BEGIN
+            DELETE FROM change_log
+            WHERE tabelle = 'test_questions' AND zeile = old.test_id AND zeile2 = old.question_id;
+            INSERT INTO change_log (tabelle, zeile, zeile2) VALUES ('test_questions', old.test_id, old.question_id);
+        END;
+
+        -- Einmalig: alles, was es schon gibt, zählt als "geändert"
+        -- (der erste Export mit seit=0 enthält dann die ganze DB)
+        INSERT OR IGNORE INTO change_log (tabelle, zeile) SELECT 'categories', id FROM categories ORDER BY id;
+        INSERT OR IGNORE INTO change_log (tabelle, zeile) SELECT 'questions', id FROM questions ORDER BY id;
+        INSERT OR IGNORE INTO change_log (tabelle, zeile) SELECT 'tests', id FROM tests ORDER BY id;
+        INSERT OR IGNORE INTO change_log (tabelle, zeile, zeile2)
+        SELECT 'test_questions', test_id, question_id FROM test_questions ORDER BY test_id, question_id;
+    """),
+    (8, """
+        -- Versionsnummer pro Frage und Test (optimistisches Sperren).
+        -- Für dumme:
+        -- - Der Editor liest eine Frage MIT Version (z.B. 4), man tippt ein paar
+        --   Minuten, dann: UPDATE ... SET version = version + 1 WHERE id = ? AND version = 4.
+        -- - Hat inzwischen jemand anderes gespeichert, steht dort schon 5 ->
+        --   0 Zeilen geändert -> VersionsKonflikt statt fremde Änderung überschreiben.
+        -- - Version gilt nur in DIESER DB (wird beim Abgleich nicht übertragen).
+        ALTER TABLE questions ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+        ALTER TABLE tests ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+
+        -- Wer OHNE Version schreibt (Stapel, Import, Abgleich, Kategorie ändern, ...),
+        -- zählt trotzdem hoch. Wer selbst version = version + 1 setzt, wird hier
+        -- nicht doppelt gezählt (new.version ist dann schon größer).
+        CREATE TRIGGER IF NOT EXISTS questions_version_au
+        AFTER UPDATE OF question_text, solution, category_id ON questions
+        WHEN new.version = old.version AND (
+            new.question_text IS NOT old.question_text
+            OR new.solution IS NOT old.solution
+            OR new.category_id IS NOT old.category_id
+        ) BEGIN
+            UPDATE questions SET version = old.version + 1 WHERE id = new.id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS tests_version_au
+        AFTER UPDATE OF title, test_date ON tests
+        WHEN new.version = old.version AND (
+            new.title IS NOT old.title OR new.test_date IS NOT old.test_date
+        ) BEGIN
+            UPDATE tests SET version = old.version + 1 WHERE id = new.id;
+        END;
+    """),
+    (9, """
+        -- LSH-Eimer (duplikate.py) kamen aus Pythons hash() -> hängt von der
+        -- Python-Version ab. Jetzt crc32: alles einmal neu berechnen lassen
+        -- (macht der nächste duplikate.index_aktualisieren()).
+        DELETE FROM question_lsh;
+        DELETE FROM question_minhash;
+        INSERT OR IGNORE INTO question_minhash_offen (question_id) SELECT id FROM questions;
+    """),
+]
+
+
+class VersionsKonflikt(Exception):
     """
-    Öffnet eine Verbindung zur SQLite-Datenbank und gibt sie zurück.
+    Eine Zeile wurde geändert (oder gelöscht), seit sie gelesen wurde.
+    Kommt von version_pruefen(), wenn ein UPDATE mit "AND version = ?" nichts trifft.
 
-    Für dumme:
-    - Eine Verbindung (conn) ist wie "ein offener Kanal" zur DB.
-    - Solange die Verbindung offen ist, können wir SQL-Befehle ausführen.
-    - Am Ende muss man die Verbindung wieder schließen: conn.close()
+    tabelle, zeile = welche Zeile (id)
+    gelesen        = Stand beim Lesen (meist die Versionsnummer)
+    jetzt          = Stand in der DB (None = gibt es nicht mehr)
+    Bei fragen.fragen_update_mehrere() ist zeile eine Liste von IDs und
+    gelesen/jetzt sind Dicts {id: Version} (None = gelöscht).
+    """
+
+    def __init__(self, tabelle, zeile, gelesen, jetzt):
+        self.tabelle = tabelle
+        self.zeile = zeile
+        self.gelesen = gelesen
+        self.jetzt = jetzt
+        if jetzt is None:
+            text = f"{tabelle} {zeile} gibt es nicht mehr"
+        else:
+            text = f"{tabelle} {zeile} wurde inzwischen geändert (gelesen: {gelesen}, jetzt: {jetzt})"
+        super().__init__(text)
+
+
+_lokal = threading.local()
+# Für dumme:
+# threading.local() ist wie ein "Fach pro Thread".
+# Jeder Thread sieht hier nur seine eigene Verbindung.
+
+_alle_verbindungen = {}
+_alle_lock = threading.Lock()
+# Merkt sich alle offenen Verbindungen (Thread-ID -> Verbindung),
+# damit verbindungen_schliessen() am Ende wirklich alles zumachen kann.
+
+_pool = queue.LifoQueue()
+_pool_alle = []
+_pool_offen = 0
+# Lese-Verbindungen für leseverbindung(): _pool = gerade frei, _pool_alle = alle,
+# _pool_offen = Anzahl (inkl. gerade im Aufbau).
+# LIFO = die zuletzt benutzte Verbindung kommt zuerst wieder dran (Cache ist noch warm).
+
+_version_conn = None
+_version_lock = threading.Lock()
+# Eigene Verbindung NUR für data_version() (siehe dort).
+
+_rollback_hooks = []
+# Funktionen, die nach jedem ROLLBACK aufgerufen werden (siehe nach_rollback()).
+
+_schema_geprueft = False
+# Das Schema prüfen wir nur EINMAL pro Programmlauf (nicht bei jeder Verbindung).
+
+_schnappschuss = None
+# Das Modul schnappschuss, solange die DB als Kopie im Arbeitsspeicher liegt
+# (schnappschuss.einschalten()). Sonst None -> alles direkt auf die Datei.
+
+
+def _neue_verbindung():
+    """
+    Öffnet eine NEUE Verbindung und stellt sie einmalig ein.
     """
 
-    conn = sqlite3.connect(DB_DATEI)
-    # Öffnet datenbank.db (oder erstellt sie, wenn sie nicht existiert)
+    ziel, klasse = DB_DATEI, VERBINDUNGS_KLASSE
+    if _schnappschuss is not None:
+        ziel, klasse = _schnappschuss.ziel(VERBINDUNGS_KLASSE)
+        # Für dumme: lesen aus dem Speicher, Schreiben geht zusätzlich auf die Datei
+
+    conn = sqlite3.connect(
+        ziel,
+        cached_statements=STATEMENT_CACHE,
+        check_same_thread=False,
+        # Für dumme: wir passen selbst auf, dass jeder Thread nur seine eigene
+        # Verbindung benutzt. Das Abschalten braucht es nur, damit
+        # verbindungen_schliessen() am Programmende alle zumachen darf.
+        isolation_level=None,
+        # Für dumme: kein "heimliches" BEGIN von Python.
+        # Transaktionen machen wir selbst mit transaktion() (siehe unten).
+        factory=klasse,
+        uri=_schnappschuss is not None,
+    )
 
     conn.text_factory = str
     # Für dumme:
@@ -31,7 +562,430 @@ def verbindung():
     conn.execute("PRAGMA foreign_keys = ON;")
     # Foreign Keys aktivieren (wichtig!)
 
+    for name, wert in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {wert};")
+
+    global _schema_geprueft
+    if not _schema_geprueft:
+        with _alle_lock:
+            if not _schema_geprueft:
+                schema_aktualisieren(conn)
+                _schema_geprueft = True
+
+    return conn
+
+
+def _sql_befehle(skript):
+    """
+    Zerlegt ein SQL-Skript in einzelne Befehle.
+
+    Für dumme:
+    - conn.executescript() würde vorher automatisch COMMIT machen.
+    - Wir wollen aber jede Migration in EINER Transaktion (alles oder nichts).
+    - sqlite3.complete_statement() sagt uns, wann ein Befehl fertig ist
+      (auch bei Triggern mit mehreren ; zwischen BEGIN und END).
+    """
+
+    teil = ""
+    for zeile in skript.splitlines(keepends=True):
+        teil += zeile
+        if sqlite3.complete_statement(teil):
+            yield teil
+            teil = ""
+
+    # Was übrig bleibt, dürfen nur noch Kommentare/Leerzeilen sein
+    for zeile in teil.splitlines():
+        if zeile.strip() and not zeile.strip().startswith("--"):
+            raise ValueError(f"Unvollständiger SQL-Befehl am Ende vom Skript: {teil.strip()!r}")
+
+
+def schema_version(conn=None):
+    """
+    Gibt die Schema-Version der DB zurück (PRAGMA user_version).
+    0 = ganz neue / leere DB.
+    """
+
+    conn = conn or verbindung()
+    return int(conn.execute("PRAGMA user_version;").fetchone()[0])
+
+
+def schema_aktualisieren(conn):
+    """
+    Bringt das Schema auf den neuesten Stand.
+
+    Ablauf:
+    1) Version 0 -> vorlage.sql ausführen (Tabellen anlegen)
+    2) Alle Migrationen mit größerer Nummer der Reihe nach ausführen
+    3) Nach jeder Migration "PRAGMA user_version" hochzählen
+
+    Jeder Schritt ist eine eigene Transaktion. Wenn zwei Programme gleichzeitig
+    starten, wartet das zweite (BEGIN IMMEDIATE) und prüft die Version neu.
+    """
+
+    schritte = [(0, None)] + sorted(MIGRATIONEN)
+
+    for version, sql in schritte:
+        if schema_version(conn) >= max(version, 1):
+            continue  # schon erledigt (Version 0 = vorlage.sql gilt ab Version 1 als erledigt)
+
+        schreibsperre_holen(conn)
+        try:
+            aktuell = schema_version(conn)
+            if version == 0:
+                if aktuell == 0:
+                    with open(VORLAGE, "r", encoding="utf-8") as f:
+                        for befehl in _sql_befehle(f.read()):
+                            conn.execute(befehl)
+            elif aktuell < version:
+                for befehl in _sql_befehle(sql):
+                    conn.execute(befehl)
+                conn.execute(f"PRAGMA user_version = {int(version)};")
+            conn.execute("COMMIT;")  # im try, wie in transaktion()
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK;")
+            raise
+
+
+def _ist_offen(conn):
+    """
+    Prüft billig, ob eine Verbindung noch benutzbar ist
+    (jemand könnte von außen conn.close() aufgerufen haben).
+    """
+    try:
+        conn.total_changes
+    except sqlite3.ProgrammingError:
+        return False
+    return True
+
+
+def verbindung():
+    """
+    Gibt die Verbindung zur SQLite-Datenbank für den aktuellen Thread zurück.
+
+    Für dumme:
+    - Eine Verbindung (conn) ist wie "ein offener Kanal" zur DB.
+    - Früher haben wir bei JEDEM Aufruf neu verbunden und wieder geschlossen.
+      Das kostet Zeit (Datei öffnen, PRAGMAs, leerer Cache).
+    - Jetzt bleibt die Verbindung pro Thread offen und wird wiederverwendet.
+    - Darum: die Verbindung NICHT selbst schließen. Das macht
+      verbindungen_schliessen() beim Programmende.
+    """
+
+    conn = getattr(_lokal, "conn", None)
+    if conn is not None and _ist_offen(conn):
+        return conn
+
+    conn = _neue_verbindung()
+    _lokal.conn = conn
+    _lokal.tiefe = 0
+
+    with _alle_lock:
+        _alle_verbindungen[threading.get_ident()] = conn
+
     return conn
 
     # Wir geben die Verbindung zurück, damit andere Dateien damit arbeiten können.
 
+
+@contextmanager
+def leseverbindung():
+    """
+    Leiht dem aktuellen Thread eine Verbindung aus dem Lese-Pool.
+
+    Benutzung:
+        with leseverbindung():
+            test_anzeigen(5)   # benutzt intern verbindung() -> bekommt die Pool-Verbindung
+
+    Für dumme:
+    - Ein Server startet für jede Anfrage einen neuen Thread. Jeder Thread
+      würde mit verbindung() seine EIGENE neue Verbindung öffnen (langsam,
+      und bei hunderten Anfragen hunderte offene Verbindungen).
+    - Hier gibt es höchstens LESE_POOL Verbindungen. Sind alle ausgeliehen,
+      wartet der Thread, bis eine zurückkommt.
+    - Die Verbindungen sind "query_only": Schreiben gibt einen Fehler.
+    """
+
+    global _pool_offen
+
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        with _alle_lock:
+            neu = _pool_offen < LESE_POOL
+            if neu:
+                _pool_offen += 1  # Platz reservieren, geöffnet wird ohne Lock
+        if not neu:
+            conn = _pool.get()  # warten, bis eine zurückkommt
+        else:
+            try:
+                conn = _neue_verbindung()
+                conn.execute("PRAGMA query_only = ON;")
+            except BaseException:
+                with _alle_lock:
+                    _pool_offen -= 1
+                raise
+            with _alle_lock:
+                _pool_alle.append(conn)
+
+    vorher = (getattr(_lokal, "conn", None), getattr(_lokal, "tiefe", 0))
+    _lokal.conn = conn
+    _lokal.tiefe = 0
+    try:
+        yield conn
+    finally:
+        _lokal.conn, _lokal.tiefe = vorher
+        if conn.in_transaction:
+            conn.execute("ROLLBACK;")  # falls eine Abfrage mittendrin abgebrochen wurde
+        _pool.put(conn)
+
+
+def data_version():
+    """
+    Zahl, die sich ändert, sobald irgendwer etwas in die DB COMMITet.
+
+    Für dumme:
+    - "PRAGMA data_version" zählt nur Änderungen von ANDEREN Verbindungen.
+      Darum fragen wir immer dieselbe eigene Verbindung, die selbst nie schreibt
+      (mit Lock, weil viele Threads fragen).
+    - Nach einem Neustart fängt die Zahl wieder klein an.
+    """
+
+    global _version_conn
+    with _version_lock:
+        if _version_conn is None:
+            _version_conn = _neue_verbindung()
+        return _version_conn.execute("PRAGMA data_version;").fetchone()[0]
+
+
+def ist_gesperrt(fehler):
+    """SQLITE_BUSY: ein anderes Programm hält die Schreibsperre."""
+    return str(fehler).startswith("database is locked")
+
+
+def schreibsperre_holen(conn):
+    """
+    BEGIN IMMEDIATE, bei "database is locked" mit Wiederholungen.
+
+    Für dumme:
+    - SQLite wartet schon selbst bis zu busy_timeout (siehe PRAGMAS).
+    - Schreibt ein anderes Programm noch länger (oder warten viele
+      gleichzeitig), versuchen wir es noch SCHREIB_VERSUCHE mal, jedes Mal
+      mit zufälliger, wachsender Pause (siehe WARTEN_START).
+    - Wiederholt wird NUR das BEGIN: bis dahin ist noch nichts passiert.
+    """
+
+    for versuch in range(SCHREIB_VERSUCHE):
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            return
+        except sqlite3.OperationalError as e:
+            if not ist_gesperrt(e) or versuch == SCHREIB_VERSUCHE - 1:
+                raise
+        time.sleep(random.uniform(0, WARTEN_START * 2 ** versuch))
+
+
+@contextmanager
+def transaktion():
+    """
+    Führt einen Block als EINE Transaktion aus.
+
+    Benutzung:
+        with transaktion() as conn:
+            conn.execute("INSERT ...")
+            conn.execute("UPDATE ...")
+
+    Für dumme:
+    - Geht alles gut -> COMMIT (alles gespeichert).
+    - Gibt es einen Fehler -> ROLLBACK (nichts gespeichert), Fehler geht weiter.
+    - Verschachtelt (transaktion() in transaktion()) ist erlaubt:
+      dann zählt nur die äußerste, die inneren machen einfach mit.
+    """
+
+    conn = verbindung()
+
+    if _lokal.tiefe > 0:
+        # Wir sind schon in einer Transaktion -> einfach mitmachen
+        _lokal.tiefe += 1
+        try:
+            yield conn
+        finally:
+            _lokal.tiefe -= 1
+        return
+
+    schreibsperre_holen(conn)
+    # IMMEDIATE = Schreibsperre gleich am Anfang holen (nicht erst beim 1. INSERT)
+    _lokal.tiefe = 1
+    try:
+        yield conn
+        # COMMIT gehört mit ins try: scheitert er (z.B. "database is locked"),
+        # bleibt sonst die Transaktion offen hängen
+        conn.execute("COMMIT;")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK;")
+        for hook in _rollback_hooks:
+            hook()
+        raise
+    finally:
+        _lokal.tiefe = 0
+
+
+def nach_rollback(funktion):
+    """
+    Meldet eine Funktion an, die nach jedem ROLLBACK von transaktion() läuft.
+
+    Für dumme:
+    - Caches (z.B. in kategorien.py) merken sich Daten aus der DB.
+    - Wurde eine Transaktion zurückgerollt, kann der Cache Dinge enthalten,
+      die es in der DB gar nicht mehr gibt -> Cache muss geleert werden.
+    """
+    _rollback_hooks.append(funktion)
+    return funktion
+
+
+def version_pruefen(cur, tabelle, zeile, gelesen):
+    """
+    Nach "UPDATE <tabelle> SET ..., version = version + 1 WHERE id = ? AND version = ?":
+    Hat das UPDATE keine Zeile getroffen -> VersionsKonflikt (mit der Version von jetzt).
+    """
+
+    if cur.rowcount > 0:
+        return
+    row = cur.connection.execute(f"SELECT version FROM {tabelle} WHERE id = ?;", (zeile,)).fetchone()
+    raise VersionsKonflikt(tabelle, zeile, gelesen, row[0] if row else None)
+
+
+def abfrageplan(sql, params=(), conn=None):
+    """
+    Gibt den EXPLAIN QUERY PLAN einer Abfrage zurück.
+    Rückgabe: Liste von Texten, z.B. ["SEARCH questions USING INDEX idx_questions_category (category_id=?)"]
+    """
+
+    conn = conn or verbindung()
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    # Jede Zeile: (id, parent, notused, detail) -> uns interessiert nur detail
+    return [r[3] for r in rows]
+
+
+def ist_scan(detail):
+    """
+    True, wenn eine Plan-Zeile eine ganze Tabelle durchläuft (ohne Index).
+
+    Für dumme:
+    - "SEARCH ... USING INDEX"          -> gut (springt direkt hin)
+    - "SCAN t USING COVERING INDEX ..." -> ok (liest nur den kleinen Index)
+    - "SCAN t"                          -> liest JEDE Zeile der Tabelle
+    - "SCAN t VIRTUAL TABLE INDEX ..." -> ok (z.B. FTS5 sucht in seinem eigenen Index)
+    """
+    if " VIRTUAL TABLE " in detail:
+        return False
+    return detail.startswith("SCAN ") and " USING " not in detail
+
+
+@contextmanager
+def abfragen_aufzeichnen():
+    """
+    Merkt sich alle SQL-Befehle, die im with-Block auf der Verbindung
+    dieses Threads ausgeführt werden (jeden Text nur einmal).
+
+    Benutzung:
+        with abfragen_aufzeichnen() as befehle:
+            alle_kategorien()
+        for sql in befehle: print(abfrageplan(sql))
+    """
+
+    conn = verbindung()
+    befehle = []
+    gesehen = set()
+
+    def merken(sql):
+        text = sql.lstrip()
+        if text == "" or text.startswith("--"):
+            return  # leer oder Trigger-Kommentar
+        if "'main'." in text:
+            return  # interne Abfragen von SQLite selbst (z.B. FTS5-Hilfstabellen)
+        if text.split(None, 1)[0].rstrip(";").upper() in ("BEGIN", "COMMIT", "ROLLBACK", "PRAGMA", "SAVEPOINT", "RELEASE"):
+            return
+        if sql not in gesehen:
+            gesehen.add(sql)
+            befehle.append(sql)
+
+    conn.set_trace_callback(merken)
+    try:
+        yield befehle
+    finally:
+        conn.set_trace_callback(None)
+
+
+def verbindungen_schliessen():
+    """
+    Schließt ALLE Verbindungen, die verbindung(), leseverbindung() und
+    data_version() geöffnet haben.
+    Wird beim Programmende automatisch aufgerufen (atexit).
+    """
+
+    global _pool_offen, _version_conn
+
+    with _alle_lock:
+        offen = list(_alle_verbindungen.values())
+        _alle_verbindungen.clear()
+        offen += _pool_alle
+        _pool_alle.clear()
+        _pool_offen = 0
+    while not _pool.empty():
+        _pool.get_nowait()
+    with _version_lock:
+        if _version_conn is not None:
+            offen.append(_version_conn)
+            _version_conn = None
+
+    for conn in offen:
+        try:
+            conn.execute("PRAGMA optimize;")
+            # Für dumme: SQLite aktualisiert dabei kurz seine Statistiken
+        except sqlite3.Error:
+            pass
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    _lokal.conn = None
+    _lokal.tiefe = 0
+
+
+def datenbank_wechseln(pfad):
+    """
+    Schaltet auf eine andere DB-Datei um (z.B. Benchmark mit erzeugten Daten).
+
+    Für dumme:
+    - Alle offenen Verbindungen werden geschlossen, danach öffnet verbindung()
+      (in jedem Thread) automatisch eine neue zur neuen Datei.
+    - Caches (z.B. Kategorien) werden geleert, sie gehören ja zur alten Datei.
+    """
+
+    global DB_DATEI, _schema_geprueft
+
+    if _schnappschuss is not None:
+        _schnappschuss.leeren()  # Offenes noch in die ALTE Datei schreiben
+    verbindungen_schliessen()
+    DB_DATEI = pfad
+    _schema_geprueft = False
+    if _schnappschuss is not None:
+        _schnappschuss.neu_laden()  # die neue Datei in den Speicher
+    for hook in _rollback_hooks:
+        hook()
+
+
+atexit.register(verbindungen_schliessen)
+
+if os.environ.get("TESTAPP_MESSEN") == "1":
+    # SQL-Zeiten von Anfang an messen (siehe messung.py)
+    import messung
+    messung.einschalten()
+
+if os.environ.get("TESTAPP_SPEICHER"):
+    # Ganze DB beim Start in den Arbeitsspeicher laden (siehe schnappschuss.py)
+    import schnappschuss
+    schnappschuss.einschalten(os.environ["TESTAPP_SPEICHER"])
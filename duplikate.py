@@ -0,0 +1,415 @@
+# duplikate.py
+# Findet (fast) doppelte Fragen.
+#
+# Für dumme:
+# - Zwei Fragen sind "fast gleich", wenn sie sich nur in Leerzeichen,
+#   Groß/Kleinschreibung oder ein paar Wörtern unterscheiden.
+# - Jede Frage mit jeder zu vergleichen geht nicht: bei 200.000 Fragen wären
+#   das 20 Milliarden Vergleiche.
+#
+# Wie es trotzdem schnell geht:
+# 1) Shingles: der Text wird in überlappende 5-Zeichen-Stücke zerlegt.
+#    Ähnliche Texte haben viele gleiche Stücke (Jaccard-Ähnlichkeit).
+# 2) MinHash: aus den Stücken wird eine kurze Signatur (64 Zahlen).
+#    Der Anteil gleicher Zahlen zweier Signaturen schätzt die Ähnlichkeit.
+#    (Wir benutzen "One Permutation Hashing": EIN Hash pro Stück, verteilt
+#    auf 64 Fächer -> viel schneller als 64 verschiedene Hashfunktionen.)
+# 3) LSH: die Signatur wird in 16 Bänder a 4 Zahlen geteilt. Jedes Band kommt
+#    in einen "Eimer" (bucket). Nur Fragen, die sich mindestens einen Eimer
+#    teilen, werden überhaupt verglichen.
+#
+# Die Signaturen liegen in der DB (question_minhash, question_lsh).
+# Trigger merken sich neue/geänderte Fragen in question_minhash_offen,
+# index_aktualisieren() rechnet dann nur diese nach.
+# Die Suchen (aehnliche_fragen, duplikat_cluster, ...) schreiben NICHTS:
+# wer den neuesten Stand braucht, ruft vorher index_aktualisieren() auf
+# (z.B. das Menü, siehe start.aktion_duplikate()).
+
+import json
+import operator
+import re
+import zlib
+from array import array
+
+from datenbank import transaktion, verbindung
+
+
+FAECHER = 64          # Länge der Signatur
+BAENDER = 16          # LSH-Bänder
+ZEILEN = FAECHER // BAENDER   # Zahlen pro Band (4)
+SHINGLE = 5           # Zeichen pro Stück
+
+WARN_SCHWELLE = 0.7
+# Ab dieser geschätzten Ähnlichkeit gilt eine Frage als "wahrscheinlich doppelt".
+
+NEBENBEI_MAX = 50
+# So viele offene Fragen rechnet ein einzelnes "frage anlegen" nebenbei nach.
+# Für dumme: nach einem großen Import (oder Migration 9) sind zehntausende
+# Fragen offen. Alle auf einmal nachzurechnen würde jedes "frage add" um
+# Sekunden verlangsamen. Den Rest erledigen nach und nach die nächsten
+# Aufrufe, oder ganz auf einmal das Menü "Duplikate" / import --duplikate.
+
+EIMER_MAX = 50
+# Aus einem Eimer werden höchstens so viele Fragen verglichen.
+# Für dumme: landen sehr viele Fragen im selben Eimer (z.B. alle nach derselben
+# Vorlage "Was ist ein ...?"), müsste sonst jede mit allen anderen verglichen
+# werden (quadratisch). Auch bei 1000 gleichen Fragen reicht EINE davon, um
+# "wahrscheinlich doppelt" zu melden.
+
+_LEER = (1 << 64) - 1  # "noch kein Wert in diesem Fach"
+
+_SALZ = 0x9E3779B9
+# Zweiter Startwert für crc32: zwei crc32 zusammen ergeben einen 64-Bit-Hash.
+# (crc32 ist in C geschrieben und viel schneller als hashlib, und anders als
+# Pythons hash() für Texte in jedem Prozess gleich.)
+
+
+def _normalisieren(text):
+    """
+    Kleinbuchstaben, Satzzeichen weg, alle Leerzeichen zu EINEM.
+    """
+
+    text = (text or "").lower()
+    text = re.sub(r"[\W_]+", " ", text)
+    return " ".join(text.split())
+
+
+def _shingles(text):
+    """
+    Menge aller überlappenden SHINGLE-Byte-Stücke (vom UTF-8-Text).
+    Sehr kurze Texte -> der ganze Text ist ein Stück.
+    """
+
+    t = _normalisieren(text).encode("utf-8")
+    if len(t) <= SHINGLE:
+        return {t} if t else set()
+    return {t[i:i + SHINGLE] for i in range(len(t) - SHINGLE + 1)}
+
+
+def signatur(text):
+    """
+    Berechnet die MinHash-Signatur (Liste mit FAECHER Zahlen).
+    Leerer Text -> None
+    """
+
+    stuecke = _shingles(text)
+    if not stuecke:
+        return None
+
+    sig = [_LEER] * FAECHER
+    crc32 = zlib.crc32  # lokal = schneller in der Schleife
+    for s in stuecke:
+        h = (crc32(s) << 32) | crc32(s, _SALZ)
+        fach = h % FAECHER
+        wert = h // FAECHER
+        if wert < sig[fach]:
+            sig[fach] = wert
+
+    if _LEER not in sig:
+        return sig
+
+    # Leere Fächer auffüllen ("Densification"): Wert vom nächsten vollen
+    # Fach rechts daneben nehmen (+ Abstand), damit alle 64 Zahlen zählen.
+    for fach in range(FAECHER):
+        if sig[fach] != _LEER:
+            continue
+        for abstand in range(1, FAECHER):
+            quelle = sig[(fach + abstand) % FAECHER]
+            if quelle != _LEER and quelle < _LEER - FAECHER:
+                sig[fach] = quelle + abstand
+                break
+
+    return sig
+
+
+def aehnlichkeit(sig_a, sig_b):
+    """
+    Geschätzte Jaccard-Ähnlichkeit (0.0 bis 1.0) zweier Signaturen.
+    """
+
+    # map(operator.eq, ...) vergleicht in C (kein Python-Code pro Zahl)
+    return sum(map(operator.eq, sig_a, sig_b)) / FAECHER
+
+
+def _buckets(sig):
+    """
+    Liefert (band, bucket) für alle Bänder.
+    Bucket = zwei crc32 (wie in signatur()) über die Zahlen des Bands als
+    feste 8-Byte-Folgen (little endian). Das ist auf jedem Rechner und in jeder
+    Python-Version gleich (Pythons hash() nicht!), die DB darf also umziehen.
+    Minus 2^63 -> passt in eine SQLite-INTEGER-Spalte (mit Vorzeichen).
+    """
+
+    crc32 = zlib.crc32
+    for band in range(BAENDER):
+        stueck = b"".join(x.to_bytes(8, "little") for x in sig[band * ZEILEN:(band + 1) * ZEILEN])
+        yield band, ((crc32(stueck) << 32) | crc32(stueck, _SALZ)) - (1 << 63)
+
+
+def _als_blob(sig):
+    return array("Q", sig).tobytes()
+
+
+def _aus_blob(blob):
+    a = array("Q")
+    a.frombytes(blob)
+    return a
+
+
+def index_aktualisieren(blockgroesse=2000, max_zeilen=None):
+    """
+    Rechnet die Signaturen aller neuen/geänderten Fragen nach.
+    Normalerweise ist nichts offen -> kostet dann nur eine kleine Abfrage.
+
+    max_zeilen: höchstens so viele Fragen nachrechnen (None = alle),
+                z.B. NEBENBEI_MAX vor dem Anlegen einer einzelnen Frage
+
+    Rückgabe: Anzahl neu berechneter Fragen
+    """
+
+    conn = verbindung()
+    # MIN() über den Primärschlüssel = ein Sprung, kein Durchlaufen
+    ab = conn.execute("SELECT MIN(question_id) FROM question_minhash_offen;").fetchone()[0]
+    if ab is None:
+        return 0
+
+    gesamt = 0
+    while max_zeilen is None or gesamt < max_zeilen:
+        if max_zeilen is not None:
+            blockgroesse = min(blockgroesse, max_zeilen - gesamt)
+        with transaktion() as conn:
+            # "question_id >= ab" = Bereich im Primärschlüssel (kein Scan von vorne)
+            rows = conn.execute(
+                """
+                SELECT o.question_id, q.question_text
+                FROM question_minhash_offen o
+                LEFT JOIN questions q ON q.id = o.question_id
+                WHERE o.question_id >= ?
+                ORDER BY o.question_id
+                LIMIT ?;
+                """,
+                (ab, blockgroesse),
+            ).fetchall()
+            if not rows:
+                return gesamt
+            ab = rows[-1][0] + 1
+
+            ids = [(qid,) for qid, _ in rows]
+            conn.executemany("DELETE FROM question_lsh WHERE question_id = ?;", ids)
+            conn.executemany("DELETE FROM question_minhash WHERE question_id = ?;", ids)
+
+            sig_rows = []
+            lsh_rows = []
+            for qid, text in rows:
+                sig = signatur(text) if text is not None else None
+                if sig is None:
+                    continue  # Frage gelöscht oder ohne Text
+                sig_rows.append((qid, _als_blob(sig)))
+                lsh_rows.extend((band, bucket, qid) for band, bucket in _buckets(sig))
+
+            conn.executemany(
+                "INSERT INTO question_minhash (question_id, signatur) VALUES (?, ?);", sig_rows
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO question_lsh (band, bucket, question_id) VALUES (?, ?, ?);",
+                lsh_rows,
+            )
+            conn.executemany("DELETE FROM question_minhash_offen WHERE question_id = ?;", ids)
+
+        gesamt += len(rows)
+    return gesamt
+
+
+def _signaturen_laden(conn, ids):
+    """
+    Holt die Signaturen mehrerer Fragen mit EINER Abfrage.
+    Rückgabe: {question_id: signatur}
+    """
+
+    rows = conn.execute(
+        """
+        SELECT m.question_id, m.signatur
+        FROM json_each(?) j
+        JOIN question_minhash m ON m.question_id = j.value;
+        """,
+        (json.dumps(sorted(ids)),),
+    )
+    return {int(qid): _aus_blob(blob) for qid, blob in rows}
+
+
+def aehnliche_fragen(frage, schwelle=0.5, limit=10):
+    """
+    Sucht Fragen, die einer Frage (ID als int) oder einem Text (str) ähneln.
+
+    Rückgabe: Liste von (question_id, aehnlichkeit), ähnlichste zuerst.
+    Die Frage selbst (bei einer ID) ist nicht dabei.
+    Nur lesen: Fragen, die index_aktualisieren() noch nicht berechnet hat, fehlen.
+    """
+
+    conn = verbindung()
+
+    eigene_id = None
+    if isinstance(frage, int):
+        eigene_id = frage
+        row = conn.execute(
+            "SELECT signatur FROM question_minhash WHERE question_id = ?;", (frage,)
+        ).fetchone()
+        if row is None:
+            return []
+        sig = _aus_blob(row[0])
+    else:
+        sig = signatur(frage)
+        if sig is None:
+            return []
+
+    # Kandidaten: Fragen, die mindestens einen Eimer mit uns teilen
+    # (pro Eimer höchstens EIMER_MAX, +1 falls wir selbst dabei sind)
+    kandidaten = set()
+    for band, bucket in _buckets(sig):
+        for (qid,) in conn.execute(
+            "SELECT question_id FROM question_lsh WHERE band = ? AND bucket = ? LIMIT ?;",
+            (band, bucket, EIMER_MAX + 1),
+        ):
+            kandidaten.add(int(qid))
+    kandidaten.discard(eigene_id)
+    if not kandidaten:
+        return []
+
+    treffer = []
+    for qid, andere in _signaturen_laden(conn, kandidaten).items():
+        a = aehnlichkeit(sig, andere)
+        if a >= schwelle:
+            treffer.append((qid, a))
+
+    treffer.sort(key=lambda t: (-t[1], t[0]))
+    return treffer[:limit]
+
+
+def duplikat_cluster(schwelle=0.8):
+    """
+    Findet Gruppen von (fast) doppelten Fragen in der ganzen DB.
+
+    Für dumme:
+    - Wir gehen alle LSH-Eimer durch, in denen mehr als eine Frage liegt.
+    - Innerhalb eines Eimers vergleichen wir die Signaturen.
+    - Ähnliche Paare werden mit "Union-Find" zu Gruppen verbunden
+      (A~B und B~C -> eine Gruppe A,B,C).
+
+    Rückgabe: Liste von Gruppen (sortierte ID-Listen), größte Gruppe zuerst
+    Nur lesen (wie aehnliche_fragen()).
+    """
+
+    conn = verbindung()
+
+    eltern = {}
+
+    def wurzel(x):
+        while eltern.get(x, x) != x:
+            x = eltern[x]
+        return x
+
+    def verbinden(a, b):
+        ra, rb = wurzel(a), wurzel(b)
+        if ra != rb:
+            eltern[max(ra, rb)] = min(ra, rb)
+
+    eimer = conn.execute(
+        """
+        SELECT group_concat(question_id)
+        FROM question_lsh
+        GROUP BY band, bucket
+        HAVING COUNT(*) > 1;
+        """
+    )
+
+    for (ids_text,) in eimer:
+        ids = [int(x) for x in ids_text.split(",")]
+        sigs = _signaturen_laden(conn, ids)
+
+        # Jede Frage nur mit den "Vertretern" im Eimer vergleichen, nicht mit allen:
+        # passt sie zu einem Vertreter -> gleiche Gruppe, sonst neuer Vertreter.
+        vertreter = []
+        for qid in ids:
+            sig = sigs.get(qid)
+            if sig is None:
+                continue
+            for v in vertreter:
+                if aehnlichkeit(sig, sigs[v]) >= schwelle:
+                    verbinden(v, qid)
+                    break
+            else:
+                vertreter.append(qid)
+
+    gruppen = {}
+    for qid in list(eltern):
+        gruppen.setdefault(wurzel(qid), set()).add(qid)
+    for w in list(gruppen):
+        gruppen[w].add(w)
+
+    return sorted((sorted(g) for g in gruppen.values()), key=lambda g: (-len(g), g[0]))
+
+
+def neue_duplikate(erste_id, schwelle=WARN_SCHWELLE, limit=5):
+    """
+    Wahrscheinliche Duplikate aller Fragen mit id >= erste_id (z.B. nach einem
+    Import) gegen die ganze DB, auch untereinander. Nur lesen (Index vorher
+    mit index_aktualisieren() nachrechnen).
+
+    Für dumme:
+    - EINE Abfrage holt alle Paare (neue Frage, ältere Frage) aus gemeinsamen
+      Eimern, statt für jede neue Frage 16 einzelne Abfragen.
+    - Im Eimer (nach ID sortiert) wird jede neue Frage nur mit den EIMER_MAX
+      Fragen direkt vor ihr verglichen -> höchstens
+      neue Fragen * BAENDER * EIMER_MAX Paare, nie "jede mit jeder".
+
+    Rückgabe: Liste von (neue_id, [(aehnliche_id, aehnlichkeit), ...])
+    Jedes Paar kommt nur einmal vor (bei der größeren der beiden IDs).
+    """
+
+    conn = verbindung()
+    paare = conn.execute(
+        """
+        SELECT DISTINCT n.question_id, a.question_id
+        FROM question_lsh n
+        JOIN question_lsh a
+          ON a.band = n.band AND a.bucket = n.bucket
+         AND a.question_id < n.question_id
+         AND a.question_id >= IFNULL((
+                -- ID der EIMER_MAX-ten Frage vor n im selben Eimer (NULL = weniger da)
+                SELECT x.question_id FROM question_lsh x
+                WHERE x.band = n.band AND x.bucket = n.bucket AND x.question_id < n.question_id
+                ORDER BY x.question_id DESC
+                LIMIT 1 OFFSET :max - 1
+             ), 0)
+        WHERE n.question_id >= :erste
+        ORDER BY n.question_id;
+        """,
+        {"erste": erste_id, "max": EIMER_MAX},
+    ).fetchall()
+    if not paare:
+        return []
+
+    # als Tupel: die Zahlen werden EINMAL zu Python-Objekten, nicht bei jedem Vergleich
+    sigs = {qid: tuple(sig) for qid, sig in _signaturen_laden(conn, {x for paar in paare for x in paar}).items()}
+
+    treffer = {}
+    for qid, andere in paare:
+        a = aehnlichkeit(sigs[qid], sigs[andere])
+        if a >= schwelle:
+            treffer.setdefault(qid, []).append((andere, a))
+
+    ergebnis = []
+    for qid in sorted(treffer):
+        liste = sorted(treffer[qid], key=lambda t: (-t[1], t[0]))
+        ergebnis.append((qid, liste[:limit]))
+    return ergebnis
+
+
+def wahrscheinliche_duplikate(text, schwelle=WARN_SCHWELLE):
+    """
+    Kurzform für "Frage anlegen" (Menü/Kommandozeile): ähnliche Fragen zu
+    einem neuen Text, VOR dem Anlegen aufrufen (sonst findet sie sich selbst).
+    Rückgabe: Liste von (question_id, aehnlichkeit)
+    """
+
+    return aehnliche_fragen(text, schwelle=schwelle, limit=5)
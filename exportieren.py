@@ -0,0 +1,209 @@
+# exportieren.py
+# Fragen/Tests aus der DB in eine Datei (oder auf stdout) schreiben.
+#
+# Für dumme:
+# - Wir holen NICHT alles mit fetchall() in den Speicher.
+# - Stattdessen laufen wir mit dem Cursor Zeile für Zeile durch die DB
+#   (Generatoren) und schreiben jede Zeile sofort raus.
+# - Dadurch bleibt der Speicherverbrauch gleich klein, egal ob 100
+#   oder 10 Millionen Fragen in der DB sind.
+#
+# Formate: "jsonl", "csv", "markdown"
+# JSONL und CSV haben die gleichen Spaltennamen wie der Import
+# (importieren.py), man kann einen Export also wieder importieren.
+
+import csv
+import io
+import json
+import sys
+
+from datenbank import verbindung
+
+
+FORMATE = ("jsonl", "csv", "markdown")
+
+PUFFER = 1024 * 1024
+# 1 MB Schreibpuffer: wenige große write()-Aufrufe statt sehr vieler kleiner.
+
+CSV_SPALTEN = ["id", "category", "question_text", "solution"]
+CSV_SPALTEN_TEST = ["test_id", "test_title", "test_date"] + CSV_SPALTEN
+
+
+def _kategorien_iter(conn, kategorie_id=None):
+    """
+    Liefert (id, name) aller Kategorien (oder nur einer), sortiert nach Name.
+    """
+
+    if kategorie_id is None:
+        cur = conn.execute("SELECT id, name FROM categories ORDER BY name;")
+    else:
+        cur = conn.execute("SELECT id, name FROM categories WHERE id = ?;", (kategorie_id,))
+
+    # Für dumme: "for row in cur" holt die Zeilen einzeln aus SQLite
+    for row in cur:
+        yield row
+
+
+def fragen_iter(kategorie_id=None):
+    """
+    Liefert alle Fragen (oder die einer Kategorie) als Dicts, eine nach der anderen.
+
+    Wir gehen Kategorie für Kategorie durch und holen die Fragen über den
+    Index (category_id, id). So muss SQLite nie alle Fragen auf einmal sortieren.
+    """
+
+    conn = verbindung()
+
+    for cid, name in _kategorien_iter(conn, kategorie_id):
+        cur = conn.execute(
+            "SELECT id, question_text, solution FROM questions WHERE category_id = ? ORDER BY id;",
+            (cid,),
+        )
+        for qid, text, loesung in cur:
+            yield {
+                "id": qid,
+                "category": name,
+                "question_text": text,
+                "solution": loesung or "",
+            }
+
+
+def test_fragen_iter(test_id):
+    """
+    Wie test_anzeigen(), aber als Generator und mit Kategorie-Name.
+    Liefert Dicts mit Test-Daten + Frage-Daten.
+    """
+
+    conn = verbindung()
+
+    test_row = conn.execute(
+        "SELECT id, title, test_date FROM tests WHERE id = ? LIMIT 1;", (test_id,)
+    ).fetchone()
+    if test_row is None:
+        return
+
+    tid, title, date = test_row
+
+    cur = conn.execute(
+        """
+        SELECT q.id, c.name, q.question_text, q.solution
+        FROM test_questions tq
+        JOIN questions q ON q.id = tq.question_id
+        JOIN categories c ON c.id = q.category_id
+        WHERE tq.test_id = ?
+        ORDER BY tq.question_id;
+        """,
+        (tid,),
+    )
+
+    for qid, kat, text, loesung in cur:
+        yield {
+            "test_id": tid,
+            "test_title": title,
+            "test_date": date or "",
+            "id": qid,
+            "category": kat,
+            "question_text": text,
+            "solution": loesung or "",
+        }
+
+
+def _jsonl_schreiben(zeilen, out):
+    n = 0
+    for z in zeilen:
+        out.write(json.dumps(z, ensure_ascii=False))
+        out.write("\n")
+        n += 1
+    return n
+
+
+def _csv_schreiben(zeilen, out, spalten):
+    w = csv.DictWriter(out, fieldnames=spalten, extrasaction="ignore")
+    w.writeheader()
+    n = 0
+    for z in zeilen:
+        w.writerow(z)
+        n += 1
+    return n
+
+
+def _md_text(s):
+    """Text für Markdown: Zeilenumbrüche bleiben in der Liste eingerückt."""
+    return str(s).strip().replace("\n", "\n   ")
+
+
+def _markdown_schreiben(zeilen, out, mit_loesung=True):
+    """
+    Überschrift pro Kategorie (bzw. pro Test), darunter nummerierte Fragen.
+    Die Zeilen kommen schon sortiert, wir merken uns nur die letzte Überschrift.
+    """
+
+    n = 0
+    letzte = None
+    for z in zeilen:
+        if "test_id" in z:
+            titel = f"{z['test_title']} ({z['test_date'] or '-'})"
+        else:
+            titel = z["category"]
+
+        if titel != letzte:
+            if letzte is not None:
+                out.write("\n")
+            out.write(f"# {titel}\n\n")
+            letzte = titel
+
+        out.write(f"1. **{_md_text(z['question_text'])}** (ID {z['id']})\n")
+        if mit_loesung and z["solution"]:
+            out.write(f"   Lösung: {_md_text(z['solution'])}\n")
+        n += 1
+    return n
+
+
+def _ziel_oeffnen(ziel):
+    """
+    Gepufferter Writer auf Datei oder stdout ("-" oder None).
+    """
+
+    if ziel in (None, "-"):
+        sys.stdout.flush()  # was vorher mit print() kam, zuerst raus
+        return io.TextIOWrapper(
+            sys.stdout.buffer, encoding="utf-8", newline="",
+            write_through=False, line_buffering=False,
+        ), False
+    return open(ziel, "w", encoding="utf-8", newline="", buffering=PUFFER), True
+
+
+def exportieren(ziel, format="jsonl", kategorie_id=None, test_id=None, mit_loesung=True):
+    """
+    Exportiert Fragen nach `ziel` (Dateiname, "-" oder None = stdout).
+
+    - nichts angegeben  -> ganzer Katalog
+    - kategorie_id      -> nur diese Kategorie
+    - test_id           -> ein Test mit seinen Fragen (wie test_anzeigen)
+
+    Rückgabe: Anzahl geschriebener Fragen
+    """
+
+    if format not in FORMATE:
+        raise ValueError(f"Unbekanntes Format: {format} (erlaubt: {', '.join(FORMATE)})")
+
+    if test_id is not None:
+        zeilen = test_fragen_iter(test_id)
+        spalten = CSV_SPALTEN_TEST
+    else:
+        zeilen = fragen_iter(kategorie_id)
+        spalten = CSV_SPALTEN
+
+    out, selbst_geoeffnet = _ziel_oeffnen(ziel)
+    try:
+        if format == "jsonl":
+            return _jsonl_schreiben(zeilen, out)
+        if format == "csv":
+            return _csv_schreiben(zeilen, out, spalten)
+        return _markdown_schreiben(zeilen, out, mit_loesung)
+    finally:
+        if selbst_geoeffnet:
+            out.close()
+        else:
+            out.flush()
+            out.detach()  # stdout selbst NICHT schließen
@@ -2,12 +2,12 @@
 # Hier sind alle Funktionen rund um Fragen.
 # Eine Frage gehört immer zu genau einer Kategorie (category_id).
 
+import json         # Für ID-Listen als EIN Parameter (json_each)
 import os           # Für EDITOR-Variable (z.B. nvim)
-import subprocess   # Um nvim zu starten
-import tempfile     # Für eine temporäre Datei zum Editieren
+import re           # Für die "=== ID n ===" Zeilen im Sammel-Editor
 import sys          # für stdout encoding (optional)
 
-from datenbank import verbindung
+from datenbank import VersionsKonflikt, verbindung, transaktion, version_pruefen
 
 def _sauberer_text(s):
     """
@@ -42,26 +42,123 @@ def fragen_von_kategorie(category_id):
     )
     daten = cur.fetchall()
 
-    conn.close()
     return daten
 
 
-def frage_holen(question_id):
+def fragen_von_kategorie_seite(category_id, nach_id=None, limit=50):
+    """
+    Eine Seite Fragen einer Kategorie (Keyset-Pagination über (category_id, id)).
+
+    nach_id=None -> erste Seite, sonst: Fragen mit id > nach_id
+    Rückgabe: Liste von (id, question_text)
+    """
+
+    conn = verbindung()
+
+    cur = conn.execute(
+        "SELECT id, question_text FROM questions WHERE category_id = ? AND id > ? ORDER BY id LIMIT ?;",
+        (category_id, -1 if nach_id is None else nach_id, limit),
+    )
+
+    return cur.fetchall()
+
+
+def fragen_von_kategorie_iter(category_id, seitengroesse=500):
+    """
+    Wie fragen_von_kategorie(), aber als Generator.
+    Es liegt nie mehr als eine Seite im Speicher.
+    """
+
+    nach = None
+    while True:
+        seite = fragen_von_kategorie_seite(category_id, nach, seitengroesse)
+        yield from seite
+        if len(seite) < seitengroesse:
+            return
+        nach = seite[-1][0]
+
+
+def _fts_anfrage(suchtext):
+    """
+    Macht aus einer Benutzer-Eingabe eine sichere FTS5-Anfrage.
+
+    Für dumme:
+    - FTS5 hat eine eigene Syntax (AND, OR, NEAR, "...", Klammern, ...).
+      Ein einzelnes " oder ( vom Benutzer würde sonst einen Fehler geben.
+    - Darum setzen wir jedes Wort in Anführungszeichen.
+    - Ein * am Wortende bleibt erhalten: hydr* findet Hydraulik, Hydrant, ...
+    - Mehrere Wörter = alle müssen vorkommen (UND).
+    """
+
+    teile = []
+    for wort in _sauberer_text(suchtext).split():
+        praefix = wort.endswith("*")
+        wort = wort.rstrip("*").replace('"', '""')
+        if wort == "":
+            continue
+        teile.append(f'"{wort}"' + ("*" if praefix else ""))
+    return " ".join(teile)
+
+
+def fragen_suchen(query, category_id=None, limit=20):
+    """
+    Volltextsuche in Fragetext und Lösung (FTS5, sortiert nach Relevanz/bm25).
+
+    Rückgabe: Liste von (id, category_id, snippet_frage, snippet_loesung)
+    Die Treffer-Wörter sind im Snippet mit [ ] markiert.
+    """
+
+    anfrage = _fts_anfrage(query)
+    if anfrage == "":
+        return []
+
+    conn = verbindung()
+
+    sql = """
+        SELECT q.id, q.category_id,
+               snippet(questions_fts, 0, '[', ']', '…', 12),
+               snippet(questions_fts, 1, '[', ']', '…', 12)
+        FROM questions_fts
+        JOIN questions q ON q.id = questions_fts.rowid
+        WHERE questions_fts MATCH ?
+    """
+    params = [anfrage]
+
+    if category_id is not None:
+        sql += " AND q.category_id = ?"
+        params.append(category_id)
+
+    # rank = bm25 (in Migration 2 eingestellt: Fragetext zählt 10x mehr als Lösung).
+    # Kleiner = besser. FTS5 kann nach rank selbst sortieren.
+    sql += " ORDER BY rank LIMIT ?;"
+    params.append(int(limit))
+
+    return conn.execute(sql, params).fetchall()
+
+
+def frage_holen(question_id, mit_version=False):
     """
     Holt eine Frage aus der DB.
     Rückgabe: (id, question_text, solution, category_id) oder None
+    mit_version=True -> (id, question_text, solution, category_id, version)
+    (die Version braucht frage_update(..., version=...), siehe Migration 8)
     """
 
     conn = verbindung()
     cur = conn.cursor()
 
-    cur.execute(
-        "SELECT id, question_text, solution, category_id FROM questions WHERE id = ? LIMIT 1;",
-        (question_id,),
-    )
+    if mit_version:
+        cur.execute(
+            "SELECT id, question_text, solution, category_id, version FROM questions WHERE id = ? LIMIT 1;",
+            (question_id,),
+        )
+    else:
+        cur.execute(
+            "SELECT id, question_text, solution, category_id FROM questions WHERE id = ? LIMIT 1;",
+            (question_id,),
+        )
     row = cur.fetchone()
 
-    conn.close()
     return row  # row ist None, wenn es die ID nicht gibt
 
 
@@ -69,6 +166,9 @@ def frage_anlegen(question_text, solution, category_id):
     """
     Legt eine neue Frage an.
     Rückgabe: neue Frage-ID (int)
+
+    Ähnliche Fragen sucht das Menü/die Kommandozeile vorher selbst
+    (duplikate.wahrscheinliche_duplikate), hier wird nur gespeichert.
     """
 
     question_text = question_text.strip()
@@ -78,24 +178,27 @@ def frage_anlegen(question_text, solution, category_id):
     if question_text == "":
         return None
 
-    conn = verbindung()
-    cur = conn.cursor()
+    with transaktion() as conn:
+        cur = conn.cursor()
 
-    cur.execute(
-        "INSERT INTO questions (question_text, solution, category_id) VALUES (?, ?, ?);",
-        (question_text, solution, category_id),
-    )
+        cur.execute(
+            "INSERT INTO questions (question_text, solution, category_id) VALUES (?, ?, ?);",
+            (question_text, solution, category_id),
+        )
 
-    new_id = cur.lastrowid
-    conn.commit()
-    conn.close()
+        new_id = cur.lastrowid
 
     return int(new_id)
 
 
-def frage_update(question_id, new_question_text, new_solution):
+def frage_update(question_id, new_question_text, new_solution, version=None):
     """
     Aktualisiert eine bestehende Frage (Text + Lösung).
+
+    version = die Version beim Lesen (frage_holen(..., mit_version=True)).
+    Hat inzwischen jemand anderes die Frage gespeichert (oder gelöscht),
+    kommt VersionsKonflikt und es wird NICHTS überschrieben.
+    version=None -> ohne Prüfung speichern (wie früher).
     """
 
     new_question_text = new_question_text.strip()
@@ -104,19 +207,66 @@ def frage_update(question_id, new_question_text, new_solution):
     if new_question_text == "":
         return False
 
-    conn = verbindung()
-    cur = conn.cursor()
-
-    cur.execute(
-        "UPDATE questions SET question_text = ?, solution = ? WHERE id = ?;",
-        (new_question_text, new_solution, question_id),
-    )
+    with transaktion() as conn:
+        if version is None:
+            conn.execute(
+                "UPDATE questions SET question_text = ?, solution = ? WHERE id = ?;",
+                (new_question_text, new_solution, question_id),
+            )
+        else:
+            cur = conn.execute(
+                "UPDATE questions SET question_text = ?, solution = ?, version = version + 1 "
+                "WHERE id = ? AND version = ?;",
+                (new_question_text, new_solution, question_id, version),
+            )
+            version_pruefen(cur, "questions", question_id, version)
 
-    conn.commit()
-    conn.close()
     return True
 
 
+def fragen_update_mehrere(aenderungen, versionen=None):
+    """
+    Aktualisiert viele Fragen auf einmal (EINE Transaktion).
+
+    aenderungen: Liste von (id, question_text, solution)
+    versionen:   {id: Version beim Lesen} -> wie frage_update(..., version=...):
+                 Wurde auch nur EINE der Fragen inzwischen geändert oder gelöscht,
+                 wird GAR NICHTS gespeichert und es kommt VersionsKonflikt
+                 (zeile = Liste der IDs, jetzt = {id: Version jetzt, None = gelöscht}).
+    Rückgabe: Anzahl Fragen
+    """
+
+    zeilen = [(q.strip(), (s or "").strip(), qid) for qid, q, s in aenderungen]
+
+    with transaktion() as conn:
+        if versionen is None:
+            conn.executemany(
+                "UPDATE questions SET question_text = ?, solution = ? WHERE id = ?;",
+                zeilen,
+            )
+            return len(zeilen)
+
+        # Einzeln statt executemany: nur so sehen wir, WELCHE Zeile nicht getroffen wurde
+        verpasst = []
+        for q, s, qid in zeilen:
+            cur = conn.execute(
+                "UPDATE questions SET question_text = ?, solution = ?, version = version + 1 "
+                "WHERE id = ? AND version = ?;",
+                (q, s, qid, versionen[qid]),
+            )
+            if cur.rowcount == 0:
+                verpasst.append(qid)
+
+        if verpasst:
+            jetzt = dict(conn.execute(
+                "SELECT j.value, q.version FROM json_each(?) j LEFT JOIN questions q ON q.id = j.value;",
+                (json.dumps(verpasst),),
+            ).fetchall())
+            raise VersionsKonflikt("questions", verpasst, {qid: versionen[qid] for qid in verpasst}, jetzt)
+
+    return len(zeilen)
+
+
 def _parse_editor_text(text):
     """
     Wir verwenden dieses einfache Format:
@@ -136,6 +286,9 @@ def _parse_editor_text(text):
 
     cleaned = "\n".join(lines).strip("\n")
 
+    if cleaned.endswith("\n---"):
+        cleaned += "\n"  # Lösung leer gelassen -> ist erlaubt
+
     # Wir verlangen eine Trennlinie, damit wir Frage/Lösung sauber trennen können.
     if "\n---\n" not in cleaned:
         return None, None
@@ -150,22 +303,67 @@ def _parse_editor_text(text):
     return q, s
 
 
+_ID_MARKE = re.compile(r"^=== ID (\d+) ===[ \t]*$", re.MULTILINE)
+
+
+def _parse_editor_text_mehrere(text):
+    """
+    Wie _parse_editor_text(), aber für viele Fragen in einer Datei.
+    Vor jeder Frage steht eine Zeile mit ihrer ID:
+
+    === ID 17 ===
+    <Frage>
+    ---
+    <Lösung>
+    === ID 18 ===
+    ...
+
+    Rückgabe: (fragen, fehler)
+      fragen: {id: (frage, lösung)}
+      fehler: Liste von Meldungen (leer = alles ok)
+    """
+
+    # split() mit einer Gruppe im Muster -> [davor, id, block, id, block, ...]
+    teile = _ID_MARKE.split(text)
+    fragen = {}
+    fehler = []
+
+    davor = [z for z in teile[0].splitlines() if z.strip() and not z.lstrip().startswith("#")]
+    if davor:
+        fehler.append("Text vor der ersten '=== ID n ===' Zeile")
+
+    for i in range(1, len(teile), 2):
+        qid = int(teile[i])
+        if qid in fragen:
+            fehler.append(f"ID {qid}: kommt mehrmals vor")
+            continue
+        q, s = _parse_editor_text(teile[i + 1])
+        if q is None:
+            fehler.append(f"ID {qid}: Trennlinie '---' fehlt oder Frage ist leer")
+            continue
+        fragen[qid] = (q, s)
+
+    return fragen, fehler
+
+
 def frage_bearbeiten_mit_editor(question_id):
     """
     Öffnet nvim (oder $EDITOR) mit einer temporären Datei.
     Nach dem Speichern wird die Frage in der DB aktualisiert.
+    Hat jemand anderes die Frage gespeichert, während der Editor offen war,
+    wird nichts überschrieben (Version, siehe frage_update()).
 
     Rückgabe:
     - True wenn gespeichert wurde
-    - False bei Abbruch/Fehler
+    - False bei Abbruch/Fehler/Konflikt
     """
 
-    row = frage_holen(question_id)
+    row = frage_holen(question_id, mit_version=True)
     if row is None:
         print("Diese Frage-ID gibt es nicht.")
         return False
 
-    _, qtext, sol, cat_id = row
+    _, qtext, sol, cat_id, version = row
     sol = sol or ""  # falls NULL in DB
 
     header = (
@@ -180,6 +378,11 @@ def frage_bearbeiten_mit_editor(question_id):
 
     initial = f"{qtext.strip()}\n---\n{str(sol).strip()}\n"
 
+    # Erst hier importieren: subprocess/tempfile brauchen nur die Editor-Funktionen,
+    # und jeder Programmstart ohne Editor (z.B. "python start.py test show 12") spart die Zeit.
+    import subprocess   # Um nvim zu starten
+    import tempfile     # Für eine temporäre Datei zum Editieren
+
     editor = os.getenv("EDITOR", "nvim")
 
     # Temporäre Datei anlegen
@@ -188,6 +391,7 @@ def frage_bearbeiten_mit_editor(question_id):
         tf.write(initial)
         filename = tf.name
 
+    behalten = False
     try:
         # Editor öffnen (blockierend)
         result = subprocess.run([editor, filename])
@@ -209,14 +413,151 @@ def frage_bearbeiten_mit_editor(question_id):
             print("Keine Änderungen erkannt.")
             return False
 
-        frage_update(question_id, new_q, new_s)
+        try:
+            frage_update(question_id, new_q, new_s, version=version)
+        except VersionsKonflikt as e:
+            # Nichts überschreiben, aber die Arbeit nicht wegwerfen
+            behalten = True
+            if e.jetzt is None:
+                print("⚠️  Die Frage wurde inzwischen gelöscht. Nichts gespeichert.")
+            else:
+                print("⚠️  Die Frage wurde inzwischen von jemand anderem geändert. Nichts gespeichert.")
+            print(f"Deine Änderungen liegen noch in: {filename}")
+            return False
         print("✅ Frage gespeichert.")
         return True
 
     finally:
-        # Temp-Datei löschen (egal ob Erfolg oder nicht)
+        # Temp-Datei löschen (außer bei Konflikt)
+        if not behalten:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def fragen_bearbeiten_mit_editor(fragen, titel="Fragen bearbeiten"):
+    """
+    Öffnet EINEN Editor für viele Fragen (statt einen pro Frage).
+    Gespeichert werden nur die Fragen, die sich geändert haben,
+    in einer einzigen Transaktion (fragen_update_mehrere).
+    Hat jemand anderes eine davon gespeichert oder gelöscht, während der
+    Editor offen war, wird nichts überschrieben (Version, wie frage_update()).
+
+    fragen: Liste von (id, question_text, solution)
+
+    Rückgabe:
+    - Anzahl gespeicherter Fragen (0 = nichts geändert)
+    - None bei Abbruch/Fehler/Konflikt
+    """
+
+    if not fragen:
+        print("Keine Fragen zum Bearbeiten.")
+        return None
+
+    # Text UND Version in EINER Abfrage neu lesen (sonst könnten sie verschieden alt sein)
+    rows = verbindung().execute(
+        """
+        SELECT q.id, q.question_text, q.solution, q.version
+        FROM json_each(?) j
+        JOIN questions q ON q.id = j.value
+        ORDER BY j.key;
+        """,
+        (json.dumps([qid for qid, _, _ in fragen]),),
+    ).fetchall()
+    if not rows:
+        print("Keine Fragen zum Bearbeiten.")
+        return None
+
+    alt = {qid: (str(q).strip(), str(s or "").strip()) for qid, q, s, _ in rows}
+    versionen = {qid: v for qid, _, _, v in rows}
+
+    header = (
+        f"# {titel} ({len(fragen)} Fragen)\n"
+        "# Format (pro Frage):\n"
+        "#   === ID <n> ===\n"
+        "#   <Frage>\n"
+        "#   ---\n"
+        "#   <Lösung>\n"
+        "# Die '=== ID' Zeilen nicht ändern. Gelöschte Blöcke bleiben unverändert.\n"
+        "# Zeilen mit # werden ignoriert.\n"
+        "#\n"
+    )
+
+    import subprocess   # Um nvim zu starten
+    import tempfile     # Für eine temporäre Datei zum Editieren
+
+    editor = os.getenv("EDITOR", "nvim")
+
+    with tempfile.NamedTemporaryFile("w+", delete=False, suffix="_fragen.txt", encoding="utf-8") as tf:
+        tf.write(header)
+        for qid, (q, s) in alt.items():
+            tf.write(f"=== ID {qid} ===\n{q}\n---\n{s}\n\n")
+        filename = tf.name
+
+    behalten = False
+    try:
+        result = subprocess.run([editor, filename])
+        if result.returncode != 0:
+            print("Editor wurde abgebrochen. Keine Änderungen übernommen.")
+            return None
+
+        with open(filename, "r", encoding="utf-8", errors="replace") as f:
+            neu, fehler = _parse_editor_text_mehrere(f.read())
+
+        fremd = sorted(set(neu) - set(alt))
+        if fremd:
+            fehler.append(f"IDs gehören nicht dazu: {' '.join(str(x) for x in fremd)}")
+
+        if fehler:
+            # Nichts speichern, aber die Arbeit nicht wegwerfen
+            behalten = True
+            print("Formatfehler, nichts gespeichert:")
+            for meldung in fehler:
+                print(f"  - {meldung}")
+            print(f"Deine Änderungen liegen noch in: {filename}")
+            return None
+
+        # Nur speichern, was sich wirklich geändert hat
+        geaendert = [(qid, q, s) for qid, (q, s) in neu.items() if (q, s) != alt[qid]]
+        if not geaendert:
+            print("Keine Änderungen erkannt.")
+            return 0
+
         try:
-            os.remove(filename)
-        except OSError:
-            pass
+            fragen_update_mehrere(geaendert, versionen=versionen)
+        except VersionsKonflikt as e:
+            # Nichts überschreiben, aber die Arbeit nicht wegwerfen
+            behalten = True
+            geloescht = [qid for qid in e.zeile if e.jetzt.get(qid) is None]
+            geaendert_fremd = [qid for qid in e.zeile if e.jetzt.get(qid) is not None]
+            print("⚠️  Während der Editor offen war, wurden Fragen von jemand anderem verändert. Nichts gespeichert.")
+            if geaendert_fremd:
+                print(f"  geändert: {' '.join(str(x) for x in geaendert_fremd)}")
+            if geloescht:
+                print(f"  gelöscht: {' '.join(str(x) for x in geloescht)}")
+            print(f"Deine Änderungen liegen noch in: {filename}")
+            return None
+        print(f"✅ {len(geaendert)} von {len(alt)} Fragen gespeichert.")
+        return len(geaendert)
+
+    finally:
+        if not behalten:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def kategorie_fragen_bearbeiten(category_id):
+    """
+    Alle Fragen einer Kategorie in EINEM Editor bearbeiten.
+    Rückgabe: wie fragen_bearbeiten_mit_editor()
+    """
+
+    rows = verbindung().execute(
+        "SELECT id, question_text, solution FROM questions WHERE category_id = ? ORDER BY id;",
+        (category_id,),
+    ).fetchall()
 
+    return fragen_bearbeiten_mit_editor(rows, f"Fragen der Kategorie {category_id} bearbeiten")
@@ -0,0 +1,272 @@
+# fragenindex.py
+# Kompakter Index über ALLE Fragen und Tests im Arbeitsspeicher (für Auswertungen).
+#
+# Für dumme:
+# - fetchall() macht aus jeder Zeile ein Tupel mit Python-Objekten drin.
+#   Jede Zahl kostet so ~28 Byte, jedes Tupel ~60 Byte. Bei Millionen
+#   Zeilen sind das Gigabytes.
+# - Hier steht jede Spalte in einem array.array (wie in C: eine Zahl =
+#   4 oder 8 Byte, alle hintereinander). 1 Million Fragen mit 5 Millionen
+#   Test-Zuordnungen brauchen so ~100 MB statt mehreren GB.
+# - Geladen wird blockweise (fetchmany), es liegen nie alle Zeilen als
+#   Tupel im Speicher.
+#
+# Aufbau (CSR = "compressed sparse row", wie bei dünnen Matrizen):
+#
+#   frage_ids     = [ 3,  5,  9]           sortiert, Position = "Nummer" der Frage
+#   frage_start   = [ 0,  2,  2,  3]       Tests der Frage an Position p:
+#   frage_tests   = [12, 40,     12]       frage_tests[frage_start[p]:frage_start[p+1]]
+#
+#   -> Frage 3 ist in Test 12 und 40, Frage 5 in keinem, Frage 9 in Test 12.
+#   Genauso test_ids/test_start/test_fragen für Test -> Fragen.
+#
+# Benutzung:
+#   index = fragenindex.laden()
+#   index.tests_mit_frage(17)       -> [3, 8, 12]
+#   index.unbenutzte_fragen()       -> array('q', [...])
+#   index.fragen_pro_kategorie()    -> {kategorie_id: anzahl}
+#   index[17].laenge                -> Zeilen-Ansicht (kostet kaum Speicher)
+#
+# Der Index ist ein Schnappschuss: spätere Änderungen in der DB sieht er nicht
+# (dann einfach neu laden()).
+
+import heapq
+import itertools
+import operator
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from datenbank import verbindung
+
+
+BLOCK = 10_000
+# So viele Zeilen holt laden() auf einmal (fetchmany)
+
+
+class FrageZeile:
+    """
+    Ansicht auf EINE Frage im Index (kein Kopieren der Daten).
+    __slots__ = kein __dict__ pro Objekt -> nur ~56 Byte.
+    """
+
+    __slots__ = ("_index", "_pos")
+
+    def __init__(self, index, pos):
+        self._index = index
+        self._pos = pos
+
+    @property
+    def id(self):
+        return self._index.frage_ids[self._pos]
+
+    @property
+    def category_id(self):
+        return self._index.kategorien[self._pos]
+
+    @property
+    def laenge(self):
+        """Länge vom Fragetext (Zeichen)"""
+        return self._index.laengen[self._pos]
+
+    @property
+    def loesung_laenge(self):
+        return self._index.loesung_laengen[self._pos]
+
+    @property
+    def tests(self):
+        """IDs der Tests mit dieser Frage (aufsteigend)"""
+        i = self._index
+        return i._fragen_tests_mv[i.frage_start[self._pos]:i.frage_start[self._pos + 1]].tolist()
+
+    @property
+    def anzahl_tests(self):
+        i = self._index
+        return i.frage_start[self._pos + 1] - i.frage_start[self._pos]
+
+    def __repr__(self):
+        return f"FrageZeile(id={self.id}, category_id={self.category_id}, laenge={self.laenge}, tests={self.anzahl_tests})"
+
+
+class Fragenindex:
+    """
+    Spalten als array.array (siehe Kopf der Datei).
+
+    frage_ids (q), kategorien (q), laengen (I), loesung_laengen (I)  -> je eine Zahl pro Frage
+    frage_start (Q) + frage_tests (q)                                -> Frage -> Tests
+    test_ids (q), test_start (Q) + test_fragen (q)                   -> Test -> Fragen
+    """
+
+    __slots__ = (
+        "frage_ids", "kategorien", "laengen", "loesung_laengen",
+        "frage_start", "frage_tests",
+        "test_ids", "test_start", "test_fragen",
+        "_fragen_tests_mv", "_test_fragen_mv",
+    )
+
+    def __init__(self):
+        self.frage_ids = array("q")
+        self.kategorien = array("q")
+        self.laengen = array("I")
+        self.loesung_laengen = array("I")
+        self.frage_start = array("Q")
+        self.frage_tests = array("q")
+        self.test_ids = array("q")
+        self.test_start = array("Q")
+        self.test_fragen = array("q")
+        self._fragen_tests_mv = self._test_fragen_mv = None
+
+    # ---------- Nachschlagen ----------
+    def _position(self, ids, wert):
+        """Position von `wert` im sortierten Array `ids` (binäre Suche), sonst None."""
+        pos = bisect_left(ids, wert)
+        if pos < len(ids) and ids[pos] == wert:
+            return pos
+        return None
+
+    def __len__(self):
+        return len(self.frage_ids)
+
+    def __contains__(self, qid):
+        return self._position(self.frage_ids, qid) is not None
+
+    def __getitem__(self, qid):
+        pos = self._position(self.frage_ids, qid)
+        if pos is None:
+            raise KeyError(qid)
+        return FrageZeile(self, pos)
+
+    def __iter__(self):
+        return (FrageZeile(self, pos) for pos in range(len(self.frage_ids)))
+
+    def speicher_bytes(self):
+        """So viel Speicher belegen die Spalten (ohne die paar Python-Objekte drumherum)."""
+        return sum(
+            a.itemsize * len(a)
+            for a in (
+                self.frage_ids, self.kategorien, self.laengen, self.loesung_laengen,
+                self.frage_start, self.frage_tests, self.test_ids, self.test_start, self.test_fragen,
+            )
+        )
+
+    # ---------- Abfragen ----------
+    def tests_mit_frage(self, qid):
+        """IDs aller Tests, in denen Frage `qid` vorkommt ([] wenn keiner / Frage unbekannt)."""
+        pos = self._position(self.frage_ids, qid)
+        if pos is None:
+            return []
+        return self._fragen_tests_mv[self.frage_start[pos]:self.frage_start[pos + 1]].tolist()
+
+    def fragen_von_test(self, test_id):
+        """IDs der Fragen von Test `test_id` (aufsteigend, [] wenn unbekannt)."""
+        pos = self._position(self.test_ids, test_id)
+        if pos is None:
+            return []
+        return self._test_fragen_mv[self.test_start[pos]:self.test_start[pos + 1]].tolist()
+
+    def nutzung(self):
+        """
+        Iterator: in wie vielen Tests ist jede Frage (in der Reihenfolge von frage_ids).
+        Für dumme: Differenz benachbarter Start-Werte, läuft komplett in C.
+        """
+        mv = memoryview(self.frage_start)
+        return map(operator.sub, mv[1:], mv[:-1])
+
+    def _unbenutzt_maske(self):
+        mv = memoryview(self.frage_start)
+        return map(operator.eq, mv[1:], mv[:-1])
+
+    def unbenutzte_fragen(self):
+        """IDs aller Fragen, die in keinem Test vorkommen (array('q'), aufsteigend)."""
+        return array("q", itertools.compress(self.frage_ids, self._unbenutzt_maske()))
+
+    def fragen_pro_kategorie(self):
+        """{kategorie_id: anzahl Fragen}"""
+        return dict(Counter(self.kategorien))
+
+    def unbenutzte_pro_kategorie(self):
+        """{kategorie_id: anzahl Fragen ohne Test} (nur Kategorien mit mindestens einer)"""
+        return dict(Counter(itertools.compress(self.kategorien, self._unbenutzt_maske())))
+
+    def meistbenutzte_fragen(self, anzahl=10):
+        """Liste von (frage_id, anzahl_tests), die häufigsten zuerst."""
+        besten = heapq.nlargest(anzahl, zip(self.nutzung(), self.frage_ids))
+        return [(qid, n) for n, qid in besten]
+
+
+def _bloecke(conn, sql):
+    cur = conn.execute(sql)
+    while True:
+        zeilen = cur.fetchmany(BLOCK)
+        if not zeilen:
+            return
+        yield zeilen
+
+
+def _spalten_anhaengen(spalten, zeilen):
+    """Block von Zeilen -> hinten an die Spalten (zip(*...) dreht Zeilen zu Spalten)."""
+    for spalte, werte in zip(spalten, zip(*zeilen)):
+        spalte.extend(werte)
+
+
+def laden():
+    """
+    Lädt den Index aus der DB. Alles in EINER Lese-Transaktion
+    (sonst könnten Zähler und Zuordnungen verschieden alt sein).
+
+    Rückgabe: Fragenindex
+    """
+
+    index = Fragenindex()
+    conn = verbindung()
+    eigene = not conn.in_transaction
+    if eigene:
+        conn.execute("BEGIN;")
+    try:
+        # Fragen + wie viele Tests pro Frage (über idx_test_questions_question)
+        anzahl = array("Q")
+        for zeilen in _bloecke(conn, """
+            SELECT q.id, q.category_id, length(q.question_text), IFNULL(length(q.solution), 0),
+                   (SELECT COUNT(*) FROM test_questions tq WHERE tq.question_id = q.id)
+            FROM questions q
+            ORDER BY q.id;
+        """):
+            _spalten_anhaengen(
+                (index.frage_ids, index.kategorien, index.laengen, index.loesung_laengen, anzahl),
+                zeilen,
+            )
+        index.frage_start = array("Q", itertools.accumulate(anzahl, initial=0))
+
+        # Die Tests jeder Frage, in derselben Reihenfolge wie frage_ids
+        for zeilen in _bloecke(conn, """
+            SELECT tq.test_id
+            FROM questions q
+            JOIN test_questions tq ON tq.question_id = q.id
+            ORDER BY q.id, tq.test_id;
+        """):
+            index.frage_tests.extend(itertools.chain.from_iterable(zeilen))
+
+        # Dasselbe andersrum: Tests -> Fragen
+        anzahl = array("Q")
+        for zeilen in _bloecke(conn, """
+            SELECT t.id, (SELECT COUNT(*) FROM test_questions tq WHERE tq.test_id = t.id)
+            FROM tests t
+            ORDER BY t.id;
+        """):
+            _spalten_anhaengen((index.test_ids, anzahl), zeilen)
+        index.test_start = array("Q", itertools.accumulate(anzahl, initial=0))
+
+        for zeilen in _bloecke(conn, """
+            SELECT tq.question_id
+            FROM tests t
+            JOIN test_questions tq ON tq.test_id = t.id
+            ORDER BY t.id, tq.question_id;
+        """):
+            index.test_fragen.extend(itertools.chain.from_iterable(zeilen))
+    finally:
+        if eigene:
+            conn.execute("COMMIT;")
+
+    index._fragen_tests_mv = memoryview(index.frage_tests)
+    index._test_fragen_mv = memoryview(index.test_fragen)
+    return index
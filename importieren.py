@@ -0,0 +1,385 @@
+# importieren.py
+# Viele Fragen auf einmal importieren (CSV, JSONL oder Editor-Format).
+#
+# Für dumme:
+# - frage_anlegen() speichert EINE Frage und macht dafür ein eigenes COMMIT.
+#   Bei 200.000 Fragen sind das 200.000 COMMITs -> dauert Stunden.
+# - Hier lesen wir die Datei Zeile für Zeile (Generatoren, nichts wird komplett
+#   in den Speicher geladen) und speichern blockweise mit executemany()
+#   in EINER Transaktion.
+# - Kaputte Zeilen brechen den Import NICHT ab, sie landen im Fehlerbericht.
+#
+# Formate:
+#   CSV   (Kopfzeile!):  category,question_text,solution
+#                        (statt category geht auch category_id)
+#   JSONL (eine Zeile = ein Objekt):
+#         {"category": "Hydraulik", "question_text": "...", "solution": "..."}
+#   Text  (wie im Editor, Fragen getrennt durch eine Zeile mit ===):
+#         <Frage>
+#         ---
+#         <Lösung>
+#         ===
+#         <Frage>
+#         ---
+#         <Lösung>
+#         (Kategorie kommt hier aus dem Parameter standard_kategorie)
+
+import csv
+import json
+import sqlite3
+import sys
+import time
+
+from datenbank import transaktion
+from fragen import _parse_editor_text, _sauberer_text
+from kategorien import cache_leeren
+
+
+BLOCKGROESSE = 1000
+# So viele Fragen gehen pro executemany() in die DB.
+
+SPALTEN = {
+    # erlaubte Spaltennamen -> unser interner Name
+    "category": "kategorie",
+    "kategorie": "kategorie",
+    "category_id": "category_id",
+    "question_text": "question_text",
+    "frage": "question_text",
+    "solution": "solution",
+    "loesung": "solution",
+    "lösung": "solution",
+}
+
+
+def format_erkennen(pfad):
+    """
+    Erkennt das Format an der Dateiendung.
+    Rückgabe: "csv", "jsonl" oder "text"
+    """
+
+    name = pfad.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith(".jsonl") or name.endswith(".ndjson") or name.endswith(".json"):
+        return "jsonl"
+    return "text"
+
+
+def _oeffnen(pfad):
+    """
+    Öffnet die Datei zum Lesen ("-" = stdin).
+    Kaputte Zeichen werden ersetzt statt abzustürzen.
+    """
+
+    if pfad == "-":
+        return sys.stdin
+    return open(pfad, "r", encoding="utf-8", errors="replace", newline="")
+
+
+def _normalisieren(daten):
+    """
+    Macht aus einem Dict mit beliebigen (erlaubten) Spaltennamen unser Format.
+    """
+
+    out = {}
+    for key, val in daten.items():
+        if key is None:
+            continue
+        name = SPALTEN.get(str(key).strip().lower())
+        if name is not None:
+            out[name] = val
+    return out
+
+
+def _csv_zeilen(datei):
+    """
+    Liefert (zeilennummer, daten) für jede CSV-Zeile.
+    """
+
+    reader = csv.DictReader(datei)
+    for row in reader:
+        # reader.line_num = Zeile in der Datei (Kopfzeile = 1)
+        yield reader.line_num, _normalisieren(row)
+
+
+def _jsonl_zeilen(datei):
+    """
+    Liefert (zeilennummer, daten) für jede JSON-Zeile.
+    Kaputtes JSON -> daten ist ein Text mit der Fehlermeldung.
+    """
+
+    for nr, line in enumerate(datei, start=1):
+        line = line.strip()
+        if line == "":
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError as e:
+            yield nr, f"Kein gültiges JSON: {e}"
+            continue
+        if not isinstance(obj, dict):
+            yield nr, "JSON-Zeile ist kein Objekt {...}"
+            continue
+        yield nr, _normalisieren(obj)
+
+
+def _text_zeilen(datei):
+    """
+    Liefert (zeilennummer, daten) für jeden Block im Editor-Format.
+    Blöcke sind durch eine Zeile "===" getrennt.
+    """
+
+    block = []
+    start = 1
+
+    def block_fertig(block, start):
+        text = "".join(block)
+        if text.strip() == "":
+            return None
+        q, s = _parse_editor_text(text)
+        if q is None:
+            return start, "Formatfehler: Trennlinie '---' fehlt oder Frage ist leer"
+        return start, {"question_text": q, "solution": s}
+
+    for nr, line in enumerate(datei, start=1):
+        if line.strip() == "===":
+            ergebnis = block_fertig(block, start)
+            if ergebnis is not None:
+                yield ergebnis
+            block = []
+            start = nr + 1
+            continue
+        block.append(line)
+
+    ergebnis = block_fertig(block, start)
+    if ergebnis is not None:
+        yield ergebnis
+
+
+def zeilen_lesen(datei, format):
+    """
+    Wählt den passenden Leser für das Format.
+    """
+
+    if format == "csv":
+        return _csv_zeilen(datei)
+    if format == "jsonl":
+        return _jsonl_zeilen(datei)
+    if format == "text":
+        return _text_zeilen(datei)
+    raise ValueError(f"Unbekanntes Format: {format}")
+
+
+def _saeubern(zeilen, standard_kategorie, fehler):
+    """
+    Schritt 2 der Pipeline: Texte säubern und prüfen.
+    Ungültige Zeilen landen in fehler und werden übersprungen.
+    """
+
+    for nr, daten in zeilen:
+        if isinstance(daten, str):
+            fehler.append((nr, daten))
+            continue
+
+        text = _sauberer_text(daten.get("question_text")).strip()
+        loesung = _sauberer_text(daten.get("solution")).strip()
+
+        if text == "":
+            fehler.append((nr, "Fragetext ist leer"))
+            continue
+
+        kategorie = _sauberer_text(daten.get("kategorie")).strip()
+        category_id = str(daten.get("category_id") or "").strip()
+
+        if kategorie == "" and category_id == "":
+            if standard_kategorie is None:
+                fehler.append((nr, "Keine Kategorie angegeben"))
+                continue
+            kategorie = standard_kategorie
+
+        if category_id != "" and not category_id.isdigit():
+            fehler.append((nr, f"Ungültige category_id: {category_id}"))
+            continue
+
+        yield nr, text, loesung, kategorie, (int(category_id) if category_id else None)
+
+
+def _kategorien_aufloesen(zeilen, conn, fehler):
+    """
+    Schritt 3 der Pipeline: Kategorie-Name -> ID.
+
+    Für dumme:
+    - Wir laden ALLE Kategorien EINMAL in ein Dict (name -> id).
+    - Neue Namen legen wir direkt an und merken sie uns im Dict.
+    - So brauchen wir nicht für jede Zeile kategorie_anlegen() (= eigene Abfrage).
+    """
+
+    name_zu_id = {name: int(cid) for cid, name in conn.execute("SELECT id, name FROM categories;")}
+    ids = set(name_zu_id.values())
+
+    for nr, text, loesung, kategorie, category_id in zeilen:
+        if category_id is not None:
+            if category_id not in ids:
+                fehler.append((nr, f"Kategorie-ID {category_id} gibt es nicht"))
+                continue
+            yield nr, text, loesung, category_id
+            continue
+
+        cid = name_zu_id.get(kategorie)
+        if cid is None:
+            cur = conn.execute("INSERT INTO categories (name) VALUES (?);", (kategorie,))
+            cid = int(cur.lastrowid)
+            name_zu_id[kategorie] = cid
+            ids.add(cid)
+
+        yield nr, text, loesung, cid
+
+
+def _in_bloecken(zeilen, groesse):
+    """
+    Schritt 4 der Pipeline: immer `groesse` Zeilen zu einer Liste zusammenfassen.
+    """
+
+    block = []
+    for z in zeilen:
+        block.append(z)
+        if len(block) >= groesse:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+def _block_speichern(conn, block, fehler):
+    """
+    Speichert einen Block mit executemany().
+    Klappt das nicht, wird der Block Zeile für Zeile versucht,
+    damit nur die wirklich kaputten Zeilen im Fehlerbericht landen.
+
+    Rückgabe: Anzahl gespeicherter Fragen
+    """
+
+    sql = "INSERT INTO questions (question_text, solution, category_id) VALUES (?, ?, ?);"
+
+    conn.execute("SAVEPOINT import_block;")
+    try:
+        conn.executemany(sql, [(text, loesung, cid) for _, text, loesung, cid in block])
+        conn.execute("RELEASE import_block;")
+        return len(block)
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO import_block;")
+        conn.execute("RELEASE import_block;")
+
+    gespeichert = 0
+    for nr, text, loesung, cid in block:
+        try:
+            conn.execute(sql, (text, loesung, cid))
+            gespeichert += 1
+        except sqlite3.Error as e:
+            fehler.append((nr, f"DB-Fehler: {e}"))
+    return gespeichert
+
+
+def _duplikate_suchen(erste_neue_id):
+    """
+    Prüft alle Fragen mit id >= erste_neue_id auf wahrscheinliche Duplikate
+    (gegen die ganze DB, auch untereinander, siehe duplikate.neue_duplikate()).
+
+    Rückgabe: Liste von (neue_id, [(aehnliche_id, aehnlichkeit), ...])
+    """
+
+    import duplikate
+
+    duplikate.index_aktualisieren()
+    return duplikate.neue_duplikate(erste_neue_id)
+
+
+def fragen_importieren(pfad, format=None, standard_kategorie=None,
+                       blockgroesse=BLOCKGROESSE, fortschritt=None, duplikate_pruefen=False):
+    """
+    Importiert Fragen aus einer Datei ("-" = stdin).
+
+    Parameter:
+    - format: "csv", "jsonl", "text" oder None (= an der Endung erkennen)
+    - standard_kategorie: Kategorie-Name für Zeilen ohne Kategorie
+    - blockgroesse: wie viele Fragen pro executemany()
+    - fortschritt: optionale Funktion fortschritt(importiert, fehler_anzahl),
+      wird nach jedem Block aufgerufen
+    - duplikate_pruefen: neue Fragen danach auf wahrscheinliche Duplikate prüfen
+      (kostet extra: MinHash für alle neuen Fragen, darum nur auf Wunsch)
+
+    Rückgabe: Dict
+      {"importiert": 1234, "fehler": [(zeile, meldung), ...], "sekunden": 1.5,
+       "duplikate": [(neue_id, [(aehnliche_id, aehnlichkeit), ...]), ...]}
+    """
+
+    if format is None:
+        format = format_erkennen(pfad)
+
+    if standard_kategorie is not None:
+        standard_kategorie = _sauberer_text(standard_kategorie).strip() or None
+
+    fehler = []
+    importiert = 0
+    start = time.perf_counter()
+
+    datei = _oeffnen(pfad)
+    try:
+        with transaktion() as conn:
+            # AUTOINCREMENT: alle neuen IDs sind größer als die bisher größte
+            erste_neue_id = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM sqlite_sequence WHERE name = 'questions';"
+            ).fetchone()[0]
+
+            # Die Pipeline: jeder Schritt ist ein Generator und holt sich
+            # die nächste Zeile erst, wenn er sie wirklich braucht.
+            zeilen = zeilen_lesen(datei, format)
+            zeilen = _saeubern(zeilen, standard_kategorie, fehler)
+            zeilen = _kategorien_aufloesen(zeilen, conn, fehler)
+
+            for block in _in_bloecken(zeilen, max(1, int(blockgroesse))):
+                importiert += _block_speichern(conn, block, fehler)
+                if fortschritt is not None:
+                    fortschritt(importiert, len(fehler))
+    finally:
+        if datei is not sys.stdin:
+            datei.close()
+        cache_leeren()  # evtl. neue Kategorien angelegt (an kategorie_anlegen() vorbei)
+
+    sekunden = time.perf_counter() - start
+    doppelt = _duplikate_suchen(erste_neue_id) if duplikate_pruefen and importiert else []
+
+    return {
+        "importiert": importiert,
+        "fehler": fehler,
+        "sekunden": sekunden,
+        "duplikate": doppelt,
+    }
+
+
+def bericht_ausgeben(bericht, max_fehler=20):
+    """
+    Gibt den Import-Bericht lesbar aus.
+    """
+
+    sek = bericht["sekunden"]
+    n = bericht["importiert"]
+    tempo = n / sek if sek > 0 else 0
+    print(f"✅ {n} Fragen importiert in {sek:.2f} s ({tempo:.0f} Fragen/s)")
+
+    fehler = bericht["fehler"]
+    if fehler:
+        print(f"⚠️  {len(fehler)} Zeile(n) übersprungen:")
+        for nr, meldung in fehler[:max_fehler]:
+            print(f"  Zeile {nr}: {meldung}")
+        if len(fehler) > max_fehler:
+            print(f"  ... und {len(fehler) - max_fehler} weitere")
+
+    doppelt = bericht.get("duplikate") or []
+    if doppelt:
+        print(f"⚠️  {len(doppelt)} neue Frage(n) sind wahrscheinlich doppelt:")
+        for qid, treffer in doppelt[:max_fehler]:
+            liste = ", ".join(f"{andere} ({a:.0%})" for andere, a in treffer)
+            print(f"  Frage {qid} ähnelt: {liste}")
+        if len(doppelt) > max_fehler:
+            print(f"  ... und {len(doppelt) - max_fehler} weitere")
@@ -2,9 +2,118 @@
 # Hier sind alle Funktionen rund um Kategorien.
 # "Kategorie" = Thema, z.B. "Grundlagen", "Elektrik", "Hydraulik", ...
 
-import sqlite3  # Wir brauchen das für sqlite3.IntegrityError (wenn UNIQUE verletzt wird)
+import bisect     # Binäre Suche in der sortierten Namensliste
+import sqlite3    # Wir brauchen das für sqlite3.IntegrityError (wenn UNIQUE verletzt wird)
+import threading  # Lock für den Cache (mehrere Threads möglich)
 
-from datenbank import verbindung  # Unsere einfache DB-Verbindung
+from datenbank import nach_rollback, transaktion, verbindung  # Unsere DB-Verbindung (bleibt offen)
+
+
+# --------------------------------------------
+# Cache
+# --------------------------------------------
+# Für dumme:
+# - Kategorien ändern sich fast nie, werden aber ständig gebraucht
+#   (kategorie_name() bei jeder Frage-Liste, alle_kategorien() in vielen Menüs).
+# - Darum laden wir ALLE Kategorien einmal in den Speicher und beantworten
+#   danach alles aus dem Speicher.
+# - Der Cache wird geleert:
+#   a) von kategorie_anlegen() (wir wissen ja, dass sich etwas geändert hat)
+#   b) wenn ein ANDERES Programm/eine andere Verbindung in die DB geschrieben
+#      hat. Das merken wir billig an "PRAGMA data_version" (eine Zahl, die
+#      SQLite hochzählt, sobald jemand anderes etwas COMMITet hat).
+#   c) nach einem ROLLBACK (der Cache könnte zurückgerollte Daten enthalten)
+
+_cache = None
+# None = leer, sonst (liste, id_zu_name, name_zu_id, namen)
+#   liste:      [(id, name), ...] sortiert nach Name (wie ORDER BY name)
+#   id_zu_name: {id: name}
+#   name_zu_id: {name: id}
+#   namen:      [name, ...] gleiche Reihenfolge wie liste (für bisect)
+
+_cache_lock = threading.Lock()
+
+_data_version = {}
+# id(Verbindung) -> zuletzt gesehene data_version dieser Verbindung
+
+_nach_commit = set()
+# id(Verbindung), die in einer noch offenen Transaktion eine Kategorie angelegt hat.
+# Für dumme: der eigene COMMIT ändert die EIGENE data_version nicht -> nach dem
+# COMMIT muss diese Verbindung den Cache selbst wegwerfen.
+
+_statistik = {"treffer": 0, "fehlschlaege": 0, "geleert": 0}
+
+
+def cache_leeren():
+    """
+    Wirft den Kategorie-Cache weg. Beim nächsten Zugriff wird neu geladen.
+    Wer an kategorie_anlegen() vorbei in categories schreibt, muss das aufrufen.
+    """
+
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _statistik["geleert"] += 1
+        _cache = None
+
+
+nach_rollback(cache_leeren)
+
+
+def cache_statistik():
+    """
+    Gibt die Cache-Statistik zurück: {"treffer": .., "fehlschlaege": .., "geleert": ..}
+    """
+
+    with _cache_lock:
+        return dict(_statistik)
+
+
+def _cache_holen():
+    """
+    Gibt den (aktuellen) Cache zurück und lädt ihn bei Bedarf neu.
+    """
+
+    global _cache
+
+    conn = verbindung()
+    version = conn.execute("PRAGMA data_version;").fetchone()[0]
+    # Für dumme: kostet keinen Plattenzugriff, nur eine Zahl aus SQLite.
+
+    offen = conn.in_transaction
+
+    with _cache_lock:
+        if _data_version.get(id(conn)) != version:
+            # Jemand anderes hat geschrieben (oder neue Verbindung) -> neu laden
+            _data_version[id(conn)] = version
+            _cache = None
+        if not offen and id(conn) in _nach_commit:
+            _nach_commit.discard(id(conn))
+            _cache = None
+
+        if _cache is not None:
+            _statistik["treffer"] += 1
+            return _cache
+
+        _statistik["fehlschlaege"] += 1
+
+    liste = conn.execute("SELECT id, name FROM categories ORDER BY name;").fetchall()
+    neu = (
+        liste,
+        {cid: name for cid, name in liste},
+        {name: cid for cid, name in liste},
+        [name for _, name in liste],
+    )
+
+    if offen:
+        # Offene Transaktion (z.B. stapel-Block): die Liste kann Kategorien
+        # enthalten, die noch nicht COMMITet sind (oder gleich zurückgerollt
+        # werden). Die anderen Threads dürfen die nicht sehen -> nicht merken.
+        return neu
+
+    with _cache_lock:
+        _cache = neu
+    return neu
 
 
 def alle_kategorien():
@@ -13,14 +122,42 @@ def alle_kategorien():
     Rückgabe: Liste von Tupeln: [(id, name), (id, name), ...]
     """
 
-    conn = verbindung()      # DB öffnen
-    cur = conn.cursor()      # Cursor = "Zeiger" für SQL-Befehle
+    liste = _cache_holen()[0]
+    return list(liste)   # Kopie, damit niemand den Cache verändert
+
+
+def kategorien_seite(nach_name=None, limit=50):
+    """
+    Eine Seite Kategorien (sortiert nach Name).
+
+    Für dumme (Keyset-Pagination):
+    - Statt "OFFSET 1000" merken wir uns den letzten Namen der vorigen Seite
+      und fragen: "gib mir die nächsten nach diesem Namen".
+    - Die sortierte Liste liegt im Cache, bisect findet die Stelle
+      (binäre Suche) -> jede Seite gleich schnell.
 
-    cur.execute("SELECT id, name FROM categories ORDER BY name;")  # SQL ausführen
-    daten = cur.fetchall()   # Alle Zeilen holen
+    nach_name=None -> erste Seite
+    Rückgabe: Liste von (id, name)
+    """
 
-    conn.close()             # DB schließen (wichtig!)
-    return daten
+    liste, _, _, namen = _cache_holen()
+
+    start = 0 if nach_name is None else bisect.bisect_right(namen, nach_name)
+    return liste[start:start + limit]
+
+
+def kategorien_iter(seitengroesse=500):
+    """
+    Wie alle_kategorien(), aber als Generator (Seite für Seite aus der DB).
+    """
+
+    nach = None
+    while True:
+        seite = kategorien_seite(nach, seitengroesse)
+        yield from seite
+        if len(seite) < seitengroesse:
+            return
+        nach = seite[-1][1]
 
 
 def kategorie_anlegen(name):
@@ -36,22 +173,30 @@ def kategorie_anlegen(name):
     if name == "":
         return None      # Keine leeren Kategorien
 
-    conn = verbindung()
-    cur = conn.cursor()
+    # Gibt es sie schon? Dann brauchen wir gar nicht zu schreiben.
+    cid = _cache_holen()[2].get(name)
+    if cid is not None:
+        return cid
 
-    try:
-        # INSERT versucht einen neuen Datensatz zu speichern
-        cur.execute("INSERT INTO categories (name) VALUES (?);", (name,))
-        conn.commit()  # Speichern (sonst ist es nach dem Schließen weg)
-    except sqlite3.IntegrityError:
-        # UNIQUE wurde verletzt -> Kategorie existiert schon -> ist ok
-        pass
+    with transaktion() as conn:  # COMMIT am Ende vom Block (bei Fehler ROLLBACK)
+        cur = conn.cursor()
+
+        try:
+            # INSERT versucht einen neuen Datensatz zu speichern
+            cur.execute("INSERT INTO categories (name) VALUES (?);", (name,))
+        except sqlite3.IntegrityError:
+            # UNIQUE wurde verletzt -> Kategorie existiert schon -> ist ok
+            pass
 
-    # Wir holen jetzt auf jeden Fall die ID der Kategorie
-    cur.execute("SELECT id FROM categories WHERE name = ? LIMIT 1;", (name,))
-    row = cur.fetchone()
+        # Wir holen jetzt auf jeden Fall die ID der Kategorie
+        cur.execute("SELECT id FROM categories WHERE name = ? LIMIT 1;", (name,))
+        row = cur.fetchone()
 
-    conn.close()
+    cache_leeren()  # neue Kategorie -> Cache ist veraltet
+    if conn.in_transaction:
+        # Äußere Transaktion läuft noch -> nach deren COMMIT nochmal leeren
+        with _cache_lock:
+            _nach_commit.add(id(conn))
 
     if row is None:
         return None
@@ -64,15 +209,17 @@ def kategorie_name(category_id):
     Wenn die ID nicht existiert, kommt None zurück.
     """
 
-    conn = verbindung()
-    cur = conn.cursor()
+    try:
+        category_id = int(category_id)
+    except (TypeError, ValueError):
+        return None
 
-    cur.execute("SELECT name FROM categories WHERE id = ? LIMIT 1;", (category_id,))
-    row = cur.fetchone()
+    return _cache_holen()[1].get(category_id)
 
-    conn.close()
 
-    if row is None:
-        return None
-    return row[0]
+def kategorie_id(name):
+    """
+    Gibt die ID einer Kategorie anhand des Namens zurück (oder None).
+    """
 
+    return _cache_holen()[2].get(str(name).strip())
@@ -0,0 +1,690 @@
+# kommandozeile.py
+# Befehle für Skripte/cron: EIN Befehl, dann ist das Programm fertig (kein Menü).
+#
+# Für dumme:
+#   python start.py                         -> Menü wie immer
+#   python start.py kategorien list         -> alle Kategorien
+#   python start.py kategorien add Hydraulik
+#   python start.py fragen list 3           -> alle Fragen von Kategorie 3
+#   python start.py fragen edit Hydraulik   -> alle Fragen der Kategorie in EINEM Editor
+#   python start.py frage show 17
+#   python start.py frage add Hydraulik "Was ist Druck?" "Kraft pro Fläche"
+#   python start.py frage search "druck ventil*"
+#   python start.py frage edit 17           -> öffnet den Editor
+#   python start.py test list
+#   python start.py test show 12 --json
+#   python start.py test add "Schularbeit 1" 2024-05-01
+#   python start.py test add-fragen 12 4 5 6
+#   python start.py test generate "Probe" "5 aus Hydraulik, 3 aus 2" --seed 7
+#   python start.py test render 12 --format latex --loesungen --ziel test12.tex
+#   python start.py test varianten 12 30 --seed 1 --verzeichnis druck/
+#   python start.py test edit 12
+#   python start.py test edit-fragen 12     -> alle Fragen des Tests in EINEM Editor
+#   python start.py import fragen.csv
+#   python start.py export --test 12 --format markdown --ziel test12.md
+#   python start.py stapel befehle.txt      -> viele Befehle, eine Transaktion (stapel.py)
+#   python start.py statistik kategorien    -> Nutzung pro Kategorie (statistik.py)
+#   python start.py statistik unbenutzt --limit 100
+#   python start.py sync export delta.gz --seit 120  -> nur Änderungen seit 120 (abgleich.py)
+#   python start.py sync import delta.gz             -> Änderungen einer anderen DB übernehmen
+#   python start.py serve 8080
+#
+# - Ausgabe: Tabulator-getrennt (gut für cut/awk), mit --json als JSON.
+# - Exit-Code: 0 = ok, 1 = nicht gefunden / Fehler, 2 = falsch aufgerufen.
+# - Andere DB-Datei: TESTAPP_DB=/pfad/zur.db python start.py ...
+# - DB im Arbeitsspeicher (langsames Netzlaufwerk): TESTAPP_SPEICHER=sync
+#   bzw. =spaeter python start.py ... (siehe schnappschuss.py)
+
+import argparse
+import json
+import os
+import sys
+
+from kategorien import alle_kategorien, kategorie_anlegen, kategorie_id, kategorie_name
+from fragen import (
+    fragen_suchen,
+    fragen_von_kategorie_iter,
+    frage_anlegen,
+    frage_bearbeiten_mit_editor,
+    frage_holen,
+    kategorie_fragen_bearbeiten,
+)
+from tests import (
+    alle_tests_iter,
+    fragen_zu_test,
+    test_anlegen,
+    test_anzeigen,
+    test_bearbeiten_mit_editor,
+    test_fragen_bearbeiten,
+)
+
+
+def _json(daten):
+    json.dump(daten, sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+
+def _zeile(*werte):
+    """Eine Ausgabezeile, Werte mit Tabulator getrennt (Zeilenumbrüche -> Leerzeichen)."""
+    print("\t".join(" ".join(str("" if w is None else w).split()) for w in werte))
+
+
+def _fehler(text):
+    print(text, file=sys.stderr)
+    return 1
+
+
+def _kategorie(wert):
+    """Kategorie als ID oder Name -> ID (oder None)."""
+    cid = kategorie_id(wert)
+    if cid is None and wert.isdigit() and kategorie_name(int(wert)) is not None:
+        cid = int(wert)
+    return cid
+
+
+# --------------------------------------------
+# kategorien
+# --------------------------------------------
+def _kategorien_list(a):
+    kategorien = alle_kategorien()
+    if a.json:
+        _json([{"id": cid, "name": name} for cid, name in kategorien])
+    else:
+        for cid, name in kategorien:
+            _zeile(cid, name)
+    return 0
+
+
+def _kategorien_add(a):
+    cid = kategorie_anlegen(a.name)
+    if cid is None:
+        return _fehler("Keine Kategorie angelegt (leerer Name?).")
+    print(cid)
+    return 0
+
+
+# --------------------------------------------
+# fragen / frage
+# --------------------------------------------
+def _fragen_list(a):
+    cid = _kategorie(a.kategorie)
+    if cid is None:
+        return _fehler(f"Kategorie '{a.kategorie}' gibt es nicht.")
+
+    fragen = fragen_von_kategorie_iter(cid)
+    if a.json:
+        _json([{"id": qid, "question_text": text} for qid, text in fragen])
+    else:
+        for qid, text in fragen:
+            _zeile(qid, text)
+    return 0
+
+
+def _fragen_edit(a):
+    cid = _kategorie(a.kategorie)
+    if cid is None:
+        return _fehler(f"Kategorie '{a.kategorie}' gibt es nicht.")
+    return 0 if kategorie_fragen_bearbeiten(cid) is not None else 1
+
+
+def _frage_show(a):
+    row = frage_holen(a.id)
+    if row is None:
+        return _fehler(f"Frage {a.id} gibt es nicht.")
+
+    qid, text, loesung, cid = row
+    if a.json:
+        _json({"id": qid, "question_text": text, "solution": loesung, "category_id": cid})
+    else:
+        print(f"Frage {qid} (Kategorie {kategorie_name(cid)}):\n{text}\n---\n{loesung or ''}")
+    return 0
+
+
+def _frage_add(a):
+    cid = _kategorie(a.kategorie)
+    if cid is None:
+        return _fehler(f"Kategorie '{a.kategorie}' gibt es nicht.")
+
+    aehnlich = []
+    if not a.ohne_duplikate:
+        from duplikate import NEBENBEI_MAX, index_aktualisieren, wahrscheinliche_duplikate
+
+        index_aktualisieren(max_zeilen=NEBENBEI_MAX)  # nicht die ganze Bank nach einem Import
+        aehnlich = wahrscheinliche_duplikate(a.text)
+
+    qid = frage_anlegen(a.text, a.loesung, cid)
+    if qid is None:
+        return _fehler("Keine Frage angelegt (leerer Text?).")
+    print(qid)
+    if aehnlich:
+        # stderr: auf stdout steht nur die neue ID (für Skripte)
+        liste = ", ".join(f"{andere} ({wert:.0%})" for andere, wert in aehnlich)
+        print(f"⚠️  Wahrscheinlich doppelt, ähnliche Frage(n): {liste}", file=sys.stderr)
+    return 0
+
+
+def _frage_search(a):
+    cid = None
+    if a.kategorie is not None:
+        cid = _kategorie(a.kategorie)
+        if cid is None:
+            return _fehler(f"Kategorie '{a.kategorie}' gibt es nicht.")
+
+    treffer = fragen_suchen(a.suche, category_id=cid, limit=a.limit)
+    if a.json:
+        _json([
+            {"id": qid, "category_id": k, "question_snippet": f, "solution_snippet": s}
+            for qid, k, f, s in treffer
+        ])
+    else:
+        for qid, k, f, _ in treffer:
+            _zeile(qid, kategorie_name(k), f)
+    return 0
+
+
+def _frage_edit(a):
+    return 0 if frage_bearbeiten_mit_editor(a.id) else 1
+
+
+# --------------------------------------------
+# test
+# --------------------------------------------
+def _test_list(a):
+    tests = alle_tests_iter()
+    if a.json:
+        _json([{"id": tid, "title": title, "test_date": date} for tid, title, date in tests])
+    else:
+        for tid, title, date in tests:
+            _zeile(tid, title, date or "-")
+    return 0
+
+
+def _test_show(a):
+    test_row, fragen = test_anzeigen(a.id)
+    if test_row is None:
+        return _fehler(f"Test {a.id} gibt es nicht.")
+
+    tid, title, date = test_row
+    if a.json:
+        _json({
+            "id": tid,
+            "title": title,
+            "test_date": date,
+            "fragen": [
+                {"id": qid, "question_text": text, "solution": loesung}
+                for qid, text, loesung in fragen
+            ],
+        })
+        return 0
+
+    print(f"Test {tid}: {title} ({date or '-'})")
+    for qid, text, loesung in fragen:
+        if a.loesungen:
+            _zeile(qid, text, loesung)
+        else:
+            _zeile(qid, text)
+    return 0
+
+
+def _test_render(a):
+    from rendern import test_rendern
+
+    text = test_rendern(a.id, a.format, mit_loesung=a.loesungen)
+    if text is None:
+        return _fehler(f"Test {a.id} gibt es nicht.")
+
+    if a.ziel in (None, "-"):
+        sys.stdout.write(text)
+        return 0
+    try:
+        with open(a.ziel, "w", encoding="utf-8") as f:
+            f.write(text)
+    except OSError as e:
+        return _fehler(f"Datei kann nicht geschrieben werden: {e}")
+    return 0
+
+
+def _test_varianten(a):
+    from varianten import varianten_erzeugen
+
+    try:
+        bericht = varianten_erzeugen(
+            a.id, a.anzahl, seed=a.seed, verzeichnis=a.verzeichnis,
+            format=a.format, mit_loesung=a.loesungen, arbeiter=a.arbeiter,
+        )
+    except OSError as e:
+        return _fehler(f"Dateien können nicht geschrieben werden: {e}")
+    if bericht is None:
+        return _fehler(f"Test {a.id} gibt es nicht.")
+
+    if a.json:
+        _json(bericht)
+    else:
+        print(
+            f"{bericht['varianten']} Varianten in {bericht['sekunden']:.2f} s "
+            f"({bericht['arbeiter']} Prozess(e), {bericht['dateien']} Dateien)"
+        )
+    return 0
+
+
+def _test_add(a):
+    tid = test_anlegen(a.titel, a.datum)
+    if tid is None:
+        return _fehler("Kein Test angelegt (leerer Titel?).")
+    print(tid)
+    return 0
+
+
+def _test_add_fragen(a):
+    ergebnis = fragen_zu_test(a.id, a.frage_ids)
+    if ergebnis is None:
+        return _fehler(f"Test {a.id} gibt es nicht.")
+
+    if a.json:
+        _json(ergebnis)
+    else:
+        print(f"{len(ergebnis['hinzugefuegt'])} hinzugefügt")
+        if ergebnis["schon_drin"]:
+            print(f"schon drin: {' '.join(str(x) for x in ergebnis['schon_drin'])}")
+    if ergebnis["unbekannt"]:
+        return _fehler(f"Unbekannte IDs: {' '.join(str(x) for x in ergebnis['unbekannt'])}")
+    return 0
+
+
+def _test_generate(a):
+    from testgenerator import test_generieren
+
+    try:
+        tid, ids = test_generieren(a.titel, a.datum, a.vorgabe, seed=a.seed, ohne_letzte_tests=a.ohne_letzte)
+    except ValueError as e:
+        return _fehler(f"Kein Test angelegt: {e}")
+
+    if a.json:
+        _json({"id": tid, "fragen": ids})
+    else:
+        print(tid)
+    return 0
+
+
+def _test_edit(a):
+    return 0 if test_bearbeiten_mit_editor(a.id) else 1
+
+
+def _test_edit_fragen(a):
+    return 0 if test_fragen_bearbeiten(a.id) is not None else 1
+
+
+# --------------------------------------------
+# import / export / serve
+# --------------------------------------------
+def _import(a):
+    from importieren import bericht_ausgeben, fragen_importieren
+
+    try:
+        bericht = fragen_importieren(
+            a.datei, format=a.format, standard_kategorie=a.kategorie, duplikate_pruefen=a.duplikate,
+        )
+    except (OSError, ValueError) as e:
+        return _fehler(f"Import nicht möglich: {e}")
+
+    if a.json:
+        _json(bericht)
+    else:
+        bericht_ausgeben(bericht)
+    return 1 if bericht["fehler"] else 0
+
+
+def _export(a):
+    from exportieren import exportieren
+
+    try:
+        n = exportieren(a.ziel, a.format, kategorie_id=a.kategorie, test_id=a.test, mit_loesung=not a.ohne_loesung)
+    except OSError as e:
+        return _fehler(f"Datei kann nicht geschrieben werden: {e}")
+
+    if a.ziel not in (None, "-"):
+        print(f"{n} Fragen exportiert.", file=sys.stderr)
+    return 0
+
+
+def _stapel(a):
+    import stapel
+
+    def fortschritt(n):
+        print(f"... {n} Befehle gespeichert", file=sys.stderr)
+
+    try:
+        if a.datei == "-":
+            bericht = stapel.stapel_ausfuehren(sys.stdin, a.block, fortschritt if a.block else None)
+        else:
+            with open(a.datei, "r", encoding="utf-8") as f:
+                bericht = stapel.stapel_ausfuehren(f, a.block, fortschritt if a.block else None)
+    except OSError as e:
+        return _fehler(f"Datei kann nicht gelesen werden: {e}")
+    except stapel.StapelFehler as e:
+        if e.gespeichert:
+            return _fehler(f"{e}\n(zurückgerollt: nur der letzte Block, {e.gespeichert} Befehle davor sind gespeichert)")
+        return _fehler(f"{e}\n(nichts gespeichert)")
+
+    if a.json:
+        _json(bericht)
+    else:
+        stapel.bericht_ausgeben(bericht)
+    return 0
+
+
+# --------------------------------------------
+# statistik
+# --------------------------------------------
+def _statistik_kategorien(a):
+    import statistik
+
+    zeilen = statistik.kategorien_statistik()
+    if a.json:
+        _json({"gesamt": statistik.gesamt(), "kategorien": zeilen})
+    else:
+        for z in zeilen:
+            faktor = "-" if z["faktor"] is None else f"{z['faktor']:.2f}"
+            _zeile(z["id"], z["name"], z["fragen"], z["nutzungen"], z["unbenutzt"], faktor, z["bewertung"])
+    return 0
+
+
+def _statistik_top(a):
+    import statistik
+
+    fragen = statistik.meistbenutzte_fragen(a.limit)
+    if a.json:
+        _json([
+            {"id": qid, "question_text": text, "anzahl_tests": n, "letzter_test": letzter}
+            for qid, text, n, letzter in fragen
+        ])
+    else:
+        for qid, text, n, letzter in fragen:
+            _zeile(qid, n, letzter, text)
+    return 0
+
+
+def _statistik_unbenutzt(a):
+    import statistik
+
+    fragen = statistik.unbenutzte_fragen_seite(a.nach, a.limit)
+    if a.json:
+        _json([{"id": qid, "question_text": text, "category_id": cid} for qid, text, cid in fragen])
+    else:
+        for qid, text, cid in fragen:
+            _zeile(qid, kategorie_name(cid), text)
+    return 0
+
+
+def _statistik_frage(a):
+    import statistik
+
+    werte = statistik.frage_statistik(a.id)
+    if werte is None:
+        return _fehler(f"Frage {a.id} gibt es nicht.")
+    if a.json:
+        _json({"id": a.id, "anzahl_tests": werte[0], "letzter_test": werte[1]})
+    else:
+        _zeile(a.id, *werte)
+    return 0
+
+
+def _statistik_neu(a):
+    import statistik
+
+    print(f"✅ Statistik für {statistik.neu_berechnen()} Fragen neu berechnet.")
+    return 0
+
+
+# --------------------------------------------
+# sync (abgleich.py)
+# --------------------------------------------
+def _sync_status(a):
+    import abgleich
+
+    st = abgleich.status()
+    if a.json:
+        _json(st)
+    else:
+        print(f"Kennung {st['kennung']}, change_log bis {st['seq']}")
+        for kennung, bis, zeitpunkt in st["partner"]:
+            _zeile(kennung, bis, zeitpunkt)
+    return 0
+
+
+def _sync_export(a):
+    import abgleich
+
+    try:
+        info = abgleich.delta_exportieren(a.datei, a.seit)
+    except OSError as e:
+        return _fehler(f"Datei kann nicht geschrieben werden: {e}")
+    if a.json:
+        _json(info)
+    elif a.datei != "-":
+        print(f"{info['aenderungen']} Änderungen ({info['von']}..{info['bis']}) exportiert.")
+    return 0
+
+
+def _sync_import(a):
+    import abgleich
+
+    try:
+        bericht = abgleich.delta_importieren(a.datei, a.bei_konflikt)
+    except abgleich.AbgleichKonflikt as e:
+        if a.json:
+            _json({"fehler": str(e), "konflikte": e.konflikte})
+        else:
+            for tabelle, lid, grund in e.konflikte:
+                _zeile(tabelle, lid, grund)
+        return _fehler(str(e))
+    except (OSError, ValueError) as e:
+        return _fehler(f"Import nicht möglich: {e}")
+
+    if a.json:
+        _json(bericht)
+    else:
+        abgleich.bericht_ausgeben(bericht)
+    return 1 if bericht["konflikte"] else 0
+
+
+def _sync_neue_kennung(a):
+    import abgleich
+
+    print(abgleich.kennung_erneuern())
+    return 0
+
+
+def _serve(a):
+    import server
+
+    server.starten(host=a.host or server.HOST, port=a.port or server.PORT)
+    return 0
+
+
+# --------------------------------------------
+# Parser
+# --------------------------------------------
+# Für dumme: jeder Unterbefehl ist ein eigener ArgumentParser. Alle zu bauen
+# kostet ~10-20 ms, bei JEDEM Programmstart. Für "test show 12" brauchen wir
+# aber nur die von "test" -> jede Gruppe hat ihre eigene Bau-Funktion.
+
+def _befehl(gruppe, name, funktion, hilfe, json_option=True):
+    b = gruppe.add_parser(name, help=hilfe)
+    b.set_defaults(funktion=funktion)
+    if json_option:
+        b.add_argument("--json", action="store_true", help="Ausgabe als JSON")
+    return b
+
+
+def _aktionen(b):
+    return b.add_subparsers(dest="aktion", required=True, metavar="AKTION")
+
+
+def _kategorien_bauen(b):
+    g = _aktionen(b)
+    _befehl(g, "list", _kategorien_list, "alle Kategorien")
+    _befehl(g, "add", _kategorien_add, "Kategorie anlegen (gibt die ID aus)", False).add_argument("name")
+
+
+def _fragen_bauen(b):
+    g = _aktionen(b)
+    _befehl(g, "list", _fragen_list, "alle Fragen einer Kategorie").add_argument("kategorie", help="ID oder Name")
+    _befehl(g, "edit", _fragen_edit, "alle Fragen einer Kategorie in EINEM Editor", False).add_argument(
+        "kategorie", help="ID oder Name"
+    )
+
+
+def _frage_bauen(b):
+    g = _aktionen(b)
+    _befehl(g, "show", _frage_show, "Frage anzeigen").add_argument("id", type=int)
+    a = _befehl(g, "add", _frage_add, "Frage anlegen (gibt die ID aus)", False)
+    a.add_argument("kategorie", help="ID oder Name")
+    a.add_argument("text")
+    a.add_argument("loesung", nargs="?", default="")
+    a.add_argument("--ohne-duplikate", action="store_true", help="nicht nach ähnlichen Fragen suchen")
+    a = _befehl(g, "search", _frage_search, "Volltextsuche")
+    a.add_argument("suche")
+    a.add_argument("--kategorie", help="nur in dieser Kategorie (ID oder Name)")
+    a.add_argument("--limit", type=int, default=20)
+    _befehl(g, "edit", _frage_edit, "Frage im Editor bearbeiten", False).add_argument("id", type=int)
+
+
+def _test_bauen(b):
+    g = _aktionen(b)
+    _befehl(g, "list", _test_list, "alle Tests (neueste zuerst)")
+    a = _befehl(g, "show", _test_show, "Test mit Fragen anzeigen")
+    a.add_argument("id", type=int)
+    a.add_argument("--loesungen", action="store_true", help="Lösungen mit ausgeben")
+    a = _befehl(g, "add", _test_add, "Test anlegen (gibt die ID aus)", False)
+    a.add_argument("titel")
+    a.add_argument("datum", nargs="?")
+    a = _befehl(g, "add-fragen", _test_add_fragen, "Fragen an einen Test hängen")
+    a.add_argument("id", type=int)
+    a.add_argument("frage_ids", type=int, nargs="+")
+    a = _befehl(g, "generate", _test_generate, "Test zufällig erzeugen (gibt die ID aus)")
+    a.add_argument("titel")
+    a.add_argument("vorgabe", help='z.B. "5 aus Hydraulik, 3 aus 2"')
+    a.add_argument("--datum")
+    a.add_argument("--seed", type=int)
+    a.add_argument("--ohne-letzte", type=int, default=0, help="Fragen der letzten N Tests auslassen")
+    a = _befehl(g, "render", _test_render, "Test druckfertig als HTML/Markdown/LaTeX", False)
+    a.add_argument("id", type=int)
+    a.add_argument("--format", choices=("html", "markdown", "latex"), default="html")
+    a.add_argument("--loesungen", action="store_true", help="mit Lösungen")
+    a.add_argument("--ziel", help="Datei (Standard: Bildschirm)")
+    a = _befehl(g, "varianten", _test_varianten, "gemischte Varianten (z.B. pro Schüler) erzeugen")
+    a.add_argument("id", type=int)
+    a.add_argument("anzahl", type=int)
+    a.add_argument("--seed", type=int, default=0)
+    a.add_argument("--verzeichnis", help="jede Variante auch als Datei hierher")
+    a.add_argument("--format", choices=("html", "markdown", "latex"), default="html")
+    a.add_argument("--loesungen", action="store_true", help="Dateien mit Lösungen")
+    a.add_argument("--arbeiter", type=int, help="Anzahl Prozesse (Standard: alle Kerne)")
+    _befehl(g, "edit", _test_edit, "Test im Editor bearbeiten", False).add_argument("id", type=int)
+    _befehl(g, "edit-fragen", _test_edit_fragen, "alle Fragen des Tests in EINEM Editor", False).add_argument(
+        "id", type=int
+    )
+
+
+def _statistik_bauen(b):
+    g = _aktionen(b)
+    _befehl(g, "kategorien", _statistik_kategorien, "Fragen/Nutzungen pro Kategorie (über-/unterrepräsentiert)")
+    _befehl(g, "top", _statistik_top, "am häufigsten benutzte Fragen").add_argument("--limit", type=int, default=10)
+    a = _befehl(g, "unbenutzt", _statistik_unbenutzt, "Fragen, die in keinem Test sind")
+    a.add_argument("--limit", type=int, default=50)
+    a.add_argument("--nach", type=int, help="erst ab dieser Frage-ID (nächste Seite)")
+    _befehl(g, "frage", _statistik_frage, "Nutzung einer Frage").add_argument("id", type=int)
+    _befehl(g, "neu", _statistik_neu, "alle Zahlen komplett neu zählen", False)
+
+
+def _sync_bauen(b):
+    g = _aktionen(b)
+    _befehl(g, "status", _sync_status, "eigene Kennung und Stand der Partner")
+    a = _befehl(g, "export", _sync_export, "Änderungen seit --seit in eine Delta-Datei")
+    a.add_argument("datei", help='Ziel-Datei ("-" = stdout)')
+    a.add_argument("--seit", type=int, default=0, help="Stand beim Partner (siehe dort: sync status)")
+    a = _befehl(g, "import", _sync_import, "Delta-Datei einer anderen DB einspielen")
+    a.add_argument("datei", help='Delta-Datei ("-" = stdin)')
+    a.add_argument("--bei-konflikt", choices=("lokal", "fremd", "abbrechen"), default="lokal")
+    _befehl(g, "neue-kennung", _sync_neue_kennung, "nach dem Kopieren der DB-Datei (in der Kopie!)", False)
+
+
+def _import_bauen(b):
+    b.set_defaults(funktion=_import)
+    b.add_argument("datei")
+    b.add_argument("--format", choices=("csv", "jsonl", "text"))
+    b.add_argument("--kategorie", help="Kategorie-Name für das Text-Format")
+    b.add_argument("--duplikate", action="store_true", help="neue Fragen auf Duplikate prüfen")
+    b.add_argument("--json", action="store_true", help="Bericht als JSON")
+
+
+def _export_bauen(b):
+    b.set_defaults(funktion=_export)
+    b.add_argument("--kategorie", type=int, help="nur diese Kategorie-ID")
+    b.add_argument("--test", type=int, help="nur diesen Test")
+    b.add_argument("--format", choices=("jsonl", "csv", "markdown"), default="jsonl")
+    b.add_argument("--ziel", help="Datei (Standard: Bildschirm)")
+    b.add_argument("--ohne-loesung", action="store_true")
+
+
+def _stapel_bauen(b):
+    b.set_defaults(funktion=_stapel)
+    b.add_argument("datei", help='Befehls-Datei ("-" = stdin)')
+    b.add_argument("--block", type=int, default=0, help="COMMIT alle N Befehle (Standard: alles in einer Transaktion)")
+    b.add_argument("--json", action="store_true", help="Bericht als JSON")
+
+
+def _serve_bauen(b):
+    b.set_defaults(funktion=_serve)
+    b.add_argument("port", type=int, nargs="?", default=None, help="Standard: 8000")
+    b.add_argument("--host", default=None, help="Standard: 127.0.0.1")
+
+
+BEFEHLE = {
+    # Name: (Hilfe, Bau-Funktion)
+    "kategorien": ("Kategorien", _kategorien_bauen),
+    "fragen": ("Fragen einer Kategorie", _fragen_bauen),
+    "frage": ("eine Frage", _frage_bauen),
+    "test": ("Tests", _test_bauen),
+    "import": ("Fragen importieren (CSV/JSONL/Text)", _import_bauen),
+    "export": ("Fragen exportieren", _export_bauen),
+    "stapel": ("viele Befehle aus einer Datei in einer Transaktion", _stapel_bauen),
+    "statistik": ("Nutzung von Fragen und Kategorien", _statistik_bauen),
+    "sync": ("Änderungen mit einer anderen DB abgleichen", _sync_bauen),
+    "serve": ("HTTP/JSON-Server (nur lesen)", _serve_bauen),
+}
+
+
+def parser_bauen(nur=None):
+    """
+    Baut den argparse-Parser. nur="test" -> nur die Gruppe "test" komplett
+    bauen, die anderen Befehle kennt argparse dann nur beim Namen.
+    """
+
+    p = argparse.ArgumentParser(prog="python start.py", description="TestApp ohne Menü (ohne Befehl: Menü).")
+    befehle = p.add_subparsers(dest="befehl", required=True, metavar="BEFEHL")
+
+    for name, (hilfe, bauen) in BEFEHLE.items():
+        b = befehle.add_parser(name, help=hilfe)
+        if nur in (None, name):
+            bauen(b)
+
+    return p
+
+
+def main(argv):
+    """
+    Führt EINEN Befehl aus. Rückgabe: Exit-Code
+    """
+
+    nur = argv[0] if argv and argv[0] in BEFEHLE else None
+    a = parser_bauen(nur).parse_args(argv)
+
+    try:
+        return a.funktion(a)
+    except BrokenPipeError:
+        # z.B. "python start.py fragen list 3 | head": head hört früher auf zu lesen.
+        # Kein Traceback, und Python soll beim Beenden nicht nochmal stdout schreiben.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
@@ -0,0 +1,371 @@
+# messung.py
+# Misst, wie lange jede SQL-Abfrage dauert (nur wenn eingeschaltet).
+#
+# Für dumme:
+# - Ist ein Menüpunkt langsam, wissen wir sonst nicht, WELCHE Abfrage schuld ist.
+# - Eingeschaltet wird mit messung.einschalten() (oder Umgebungsvariable
+#   TESTAPP_MESSEN=1, oder Menüpunkt 16). Danach öffnet datenbank.verbindung()
+#   Verbindungen einer eigenen Klasse (MessVerbindung), die jede Abfrage stoppt.
+# - Ausgeschaltet benutzt datenbank ganz normale sqlite3-Verbindungen
+#   -> kostet dann GAR NICHTS.
+#
+# Was gemessen wird (pro "Aufrufstelle" = Datei:Zeile im Programm):
+# - Anzahl Aufrufe, Gesamtzeit, langsamster Aufruf, Zeilen
+# - Histogramm (wie viele Aufrufe < 0.1 ms, < 0.25 ms, ...)
+# - Befehle: wie viele SQL-Befehle SQLite wirklich ausgeführt hat
+#   (über set_trace_callback, zählt z.B. auch Trigger mit)
+# - Die Zeit zählt vom execute() bis die letzte Zeile geholt wurde.
+#
+# Langsame Abfragen (ab LANGSAM_MS) landen mit SQL (inkl. eingesetzter Werte)
+# und EXPLAIN QUERY PLAN in LOGDATEI.
+
+import bisect
+import contextlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import datenbank
+
+
+LANGSAM_MS = 100.0
+# Ab so vielen Millisekunden gilt eine Abfrage als langsam (-> Logdatei).
+
+LOGDATEI = "langsame_abfragen.log"
+
+GRENZEN_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+# Fächer vom Histogramm: "bis 0.05 ms", "bis 0.1 ms", ..., "über 1000 ms"
+
+_statistik = {}
+_statistik_lock = threading.Lock()
+_log_lock = threading.Lock()
+# Aufrufstelle -> {"anzahl", "summe_ms", "max_ms", "zeilen", "befehle", "sql", "histogramm"}
+
+_lokal = threading.local()
+# .befehle = Liste, in die der Trace-Callback gerade schreibt (oder None)
+
+_UEBERSPRINGEN = (
+    os.path.abspath(__file__),
+    os.path.abspath(contextlib.__file__),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "schnappschuss.py"),
+)
+# Diese Dateien sind nie die "Aufrufstelle" (messung.py selbst, der
+# @contextmanager-Mechanismus hinter transaktion() und schnappschuss.py,
+# das im Speicher-Modus zwischen Programm und Cursor sitzt).
+
+
+def _aufrufstelle():
+    """
+    Erste Stelle im Programm außerhalb von messung.py,
+    z.B. "fragen.py:58 fragen_von_kategorie_seite"
+    (BEGIN/COMMIT zählen bei "datenbank.py:... transaktion").
+    """
+
+    f = sys._getframe(1)
+    while f is not None and os.path.abspath(f.f_code.co_filename) in _UEBERSPRINGEN:
+        f = f.f_back
+    if f is None:
+        return "?"
+    return f"{os.path.basename(f.f_code.co_filename)}:{f.f_lineno} {f.f_code.co_name}"
+
+
+def _kurz(sql):
+    """SQL in einer Zeile (für den Bericht)."""
+    return " ".join(sql.split())[:200]
+
+
+class _Messpunkt:
+    """Eine laufende Messung (vom execute() bis zur letzten Zeile)."""
+
+    __slots__ = ("stelle", "sql", "params", "sekunden", "zeilen", "befehle", "viele")
+
+    def __init__(self, stelle, sql, params, sekunden, befehle, viele):
+        self.stelle = stelle
+        self.sql = sql
+        self.params = params
+        self.sekunden = sekunden
+        self.zeilen = 0
+        self.befehle = befehle
+        self.viele = viele
+
+
+class MessCursor(sqlite3.Cursor):
+    """
+    Cursor, der execute() und das Holen der Zeilen stoppt.
+    """
+
+    _punkt = None
+
+    def _ausfuehren(self, methode, sql, params, viele):
+        self._abschliessen()
+        stelle = _aufrufstelle()
+
+        vorher = getattr(_lokal, "befehle", None)
+        befehle = _lokal.befehle = []
+        start = time.perf_counter()
+        try:
+            methode(self, sql, params)
+        finally:
+            sekunden = time.perf_counter() - start
+            _lokal.befehle = vorher
+
+        self._punkt = _Messpunkt(stelle, sql, params, sekunden, befehle, viele)
+        if self.description is None:
+            # INSERT/UPDATE/DELETE: fertig, keine Zeilen zu holen
+            self._punkt.zeilen = max(self.rowcount, 0)
+            self._abschliessen()
+        return self
+
+    def execute(self, sql, params=()):
+        return self._ausfuehren(sqlite3.Cursor.execute, sql, params, False)
+
+    def executemany(self, sql, params):
+        return self._ausfuehren(sqlite3.Cursor.executemany, sql, params, True)
+
+    def _dazu(self, sekunden, zeilen, fertig):
+        punkt = self._punkt
+        if punkt is not None:
+            punkt.sekunden += sekunden
+            punkt.zeilen += zeilen
+            if fertig:
+                self._abschliessen()
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._dazu(time.perf_counter() - start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._dazu(time.perf_counter() - start, len(rows), not rows)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._dazu(time.perf_counter() - start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._dazu(time.perf_counter() - start, 0, True)
+            raise
+        self._dazu(time.perf_counter() - start, 1, False)
+        return row
+
+    def close(self):
+        self._abschliessen()
+        super().close()
+
+    def __del__(self):
+        # Für dumme: z.B. execute(...).fetchone() ohne bis zum Ende zu lesen.
+        # Dann ist die Messung fertig, sobald Python den Cursor wegwirft.
+        self._abschliessen()
+
+    def _abschliessen(self):
+        punkt = self._punkt
+        if punkt is None:
+            return
+        self._punkt = None
+        _eintragen(punkt, self.connection)
+
+
+class MessVerbindung(sqlite3.Connection):
+    """
+    Verbindung, deren Cursor messen. datenbank._neue_verbindung() benutzt
+    diese Klasse, solange die Messung eingeschaltet ist.
+    """
+
+    CURSOR_KLASSE = MessCursor
+    # Für schnappschuss.py: baut darauf seinen eigenen Cursor auf
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._weiter = None
+        super().set_trace_callback(self._trace)
+
+    def _trace(self, sql):
+        befehle = getattr(_lokal, "befehle", None)
+        if befehle is not None:
+            befehle.append(sql)
+        if self._weiter is not None:
+            self._weiter(sql)
+
+    def set_trace_callback(self, funktion):
+        # z.B. datenbank.abfragen_aufzeichnen(): läuft zusätzlich zu unserem Trace
+        self._weiter = funktion
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or self.CURSOR_KLASSE)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, params):
+        return self.cursor().executemany(sql, params)
+
+
+def _eintragen(punkt, conn):
+    ms = punkt.sekunden * 1000
+
+    with _statistik_lock:
+        e = _statistik.get(punkt.stelle)
+        if e is None:
+            e = _statistik[punkt.stelle] = {
+                "anzahl": 0,
+                "summe_ms": 0.0,
+                "max_ms": 0.0,
+                "zeilen": 0,
+                "befehle": 0,
+                "sql": _kurz(punkt.sql),
+                "histogramm": [0] * (len(GRENZEN_MS) + 1),
+            }
+        e["anzahl"] += 1
+        e["summe_ms"] += ms
+        e["zeilen"] += punkt.zeilen
+        e["befehle"] += len(punkt.befehle)
+        if ms > e["max_ms"]:
+            e["max_ms"] = ms
+        e["histogramm"][bisect.bisect_left(GRENZEN_MS, ms)] += 1
+
+    if ms >= LANGSAM_MS:
+        _langsam_loggen(punkt, ms, conn)
+
+
+def _langsam_loggen(punkt, ms, conn):
+    """
+    Schreibt eine langsame Abfrage mit Plan in LOGDATEI.
+    """
+
+    # Das SQL mit eingesetzten Werten kommt vom Trace. Dort stehen aber auch
+    # interne Befehle (Trigger, FTS5) -> den nehmen, der wie unser SQL anfängt.
+    sql = punkt.sql
+    anfang = punkt.sql.split(None, 1)[0].upper() if punkt.sql.strip() else ""
+    for befehl in punkt.befehle:
+        if "'main'." not in befehl and befehl.lstrip().upper().startswith(anfang):
+            sql = befehl
+            break
+    plan = []
+    if not punkt.viele:
+        try:
+            # Normaler Cursor (nicht MessCursor) -> wird selbst nicht gemessen
+            vorher = getattr(_lokal, "befehle", None)
+            _lokal.befehle = None
+            try:
+                rows = sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + punkt.sql, punkt.params).fetchall()
+            finally:
+                _lokal.befehle = vorher
+            plan = [r[3] for r in rows]
+        except sqlite3.Error as e:
+            plan = [f"(kein Plan: {e})"]
+
+    zeilen = [
+        f"{time.strftime('%Y-%m-%d %H:%M:%S')}  {ms:.1f} ms  {punkt.stelle}  "
+        f"({punkt.zeilen} Zeilen, {len(punkt.befehle)} Befehle)",
+        "  SQL: " + " ".join(sql.split()),
+    ]
+    zeilen += ["  PLAN: " + p for p in plan]
+
+    with _log_lock:
+        with open(LOGDATEI, "a", encoding="utf-8") as f:
+            f.write("\n".join(zeilen) + "\n\n")
+
+
+# --------------------------------------------
+# Ein/Aus und Bericht
+# --------------------------------------------
+def ist_an():
+    return datenbank.VERBINDUNGS_KLASSE is MessVerbindung
+
+
+def einschalten(langsam_ms=None, logdatei=None):
+    """
+    Schaltet die Messung ein. Offene Verbindungen werden geschlossen, damit
+    die nächste Verbindung schon eine MessVerbindung ist.
+    (Darum NICHT mitten in einer transaktion() aufrufen.)
+    """
+
+    global LANGSAM_MS, LOGDATEI
+    if langsam_ms is not None:
+        LANGSAM_MS = float(langsam_ms)
+    if logdatei is not None:
+        LOGDATEI = logdatei
+    if not ist_an():
+        datenbank.verbindungen_schliessen()
+        datenbank.VERBINDUNGS_KLASSE = MessVerbindung
+
+
+def ausschalten():
+    """Schaltet die Messung aus (die Zahlen bleiben bis zuruecksetzen())."""
+
+    if ist_an():
+        datenbank.verbindungen_schliessen()
+        datenbank.VERBINDUNGS_KLASSE = sqlite3.Connection
+
+
+def zuruecksetzen():
+    with _statistik_lock:
+        _statistik.clear()
+
+
+def _perzentil_ms(histogramm, p):
+    """Ungefähres Perzentil aus dem Histogramm (obere Grenze vom Fach)."""
+
+    ziel = sum(histogramm) * p / 100
+    summe = 0
+    for fach, anzahl in enumerate(histogramm):
+        summe += anzahl
+        if summe >= ziel and anzahl:
+            return GRENZEN_MS[fach] if fach < len(GRENZEN_MS) else float("inf")
+    return 0.0
+
+
+def bericht():
+    """
+    Rückgabe: Liste von Dicts (eins pro Aufrufstelle), teuerste zuerst.
+    """
+
+    with _statistik_lock:
+        kopie = {stelle: dict(e, histogramm=list(e["histogramm"])) for stelle, e in _statistik.items()}
+
+    zeilen = []
+    for stelle, e in kopie.items():
+        e["stelle"] = stelle
+        e["mittel_ms"] = e["summe_ms"] / e["anzahl"]
+        e["p50_ms"] = _perzentil_ms(e["histogramm"], 50)
+        e["p95_ms"] = _perzentil_ms(e["histogramm"], 95)
+        zeilen.append(e)
+
+    zeilen.sort(key=lambda e: -e["summe_ms"])
+    return zeilen
+
+
+def bericht_ausgeben(anzahl=20, out=None):
+    """
+    Druckt die teuersten Aufrufstellen als Tabelle.
+    """
+
+    out = out or sys.stdout
+    zeilen = bericht()
+    if not zeilen:
+        print("Noch nichts gemessen." + ("" if ist_an() else " (Messung ist aus)"), file=out)
+        return
+
+    print(f"{'Summe ms':>10} {'Anzahl':>7} {'Mittel':>8} {'p95≤':>7} {'Max':>8} {'Zeilen':>8}  Stelle / SQL", file=out)
+    for e in zeilen[:anzahl]:
+        print(
+            f"{e['summe_ms']:10.1f} {e['anzahl']:7d} {e['mittel_ms']:8.3f} {e['p95_ms']:7g} "
+            f"{e['max_ms']:8.2f} {e['zeilen']:8d}  {e['stelle']}",
+            file=out,
+        )
+        print(f"{'':53}{e['sql'][:70]}", file=out)
+    if len(zeilen) > anzahl:
+        print(f"... und {len(zeilen) - anzahl} weitere Stellen", file=out)
+    print(f"Langsame Abfragen (ab {LANGSAM_MS:g} ms): {os.path.abspath(LOGDATEI)}", file=out)
@@ -0,0 +1,285 @@
+# rendern.py
+# Macht aus einem Test ein druckbares Dokument: HTML, Markdown oder LaTeX,
+# mit oder ohne Lösungen.
+#
+# Für dumme:
+# - test_rendern(12, "html") -> fertiger Text (z.B. in eine Datei schreiben
+#   und im Browser drucken). "latex" kann man mit pdflatex übersetzen.
+# - Jede Frage wird einzeln "gerendert" (= in das Format umgewandelt).
+#   Das Ergebnis (Fragment) kommt in die Tabelle render_cache.
+# - Der Schlüssel ist ein Hash über Format + Fragetext + Lösung.
+#   Gleicher Inhalt = gleicher Schlüssel -> beim nächsten Test mit dieser
+#   Frage wird nichts neu gerendert. Wird die Frage geändert, gibt es einen
+#   neuen Schlüssel, der alte Eintrag wird einfach nicht mehr benutzt.
+# - Die Nummer der Frage steht NICHT im Fragment (macht <ol>, "1." bzw.
+#   \item selbst). Darum passt ein Fragment in jeden Test.
+#
+# Warum lohnt sich das? Wir drucken jede Woche viele Tests, die sich
+# großteils überschneiden. Alle Fragmente eines Tests holen wir mit EINER
+# Abfrage, neu gerendert werden nur die Fragen, die sich geändert haben.
+
+import hashlib
+import html
+import json
+import re
+
+from datenbank import transaktion, verbindung
+from tests import test_anzeigen
+
+
+FORMATE = ("html", "markdown", "latex")
+
+RENDER_VERSION = "1"
+# Hochzählen, wenn sich an _FRAGMENT_FUNKTIONEN etwas ändert:
+# dann passen alle alten Cache-Einträge nicht mehr (neuer Hash).
+
+MAX_EINTRAEGE = 100_000
+# Mehr Fragmente behalten wir nicht (die ältesten fliegen raus).
+
+
+def _absaetze(text):
+    """Text -> Liste von Absätzen (Leerzeile trennt), jeder als Liste von Zeilen."""
+    return [
+        [zeile.strip() for zeile in absatz.strip().splitlines()]
+        for absatz in re.split(r"\n\s*\n", str(text).strip())
+        if absatz.strip()
+    ]
+
+
+# --------------------------------------------
+# Eine Frage -> Fragment (pro Format)
+# --------------------------------------------
+def _html_text(text):
+    return "".join(
+        "<p>" + "<br>".join(html.escape(z) for z in absatz) + "</p>"
+        for absatz in _absaetze(text)
+    )
+
+
+def _html_fragment(frage, loesung, mit_loesung):
+    teile = [f'<li class="frage">{_html_text(frage)}']
+    if mit_loesung and loesung:
+        teile.append(f'<div class="loesung"><strong>Lösung:</strong>{_html_text(loesung)}</div>')
+    else:
+        teile.append('<div class="antwort"></div>')
+    teile.append("</li>\n")
+    return "".join(teile)
+
+
+_MD_SONDERZEICHEN = re.compile(r"([\\`*_{}\[\]<>#|])")
+
+
+def _md_text(text, einrueckung="   "):
+    # Markdown-Zeichen maskieren, Zeilen im Listeneintrag einrücken
+    absaetze = [
+        "  \n".join(_MD_SONDERZEICHEN.sub(r"\\\1", z) for z in absatz)
+        for absatz in _absaetze(text)
+    ]
+    return ("\n\n").join(absaetze).replace("\n", "\n" + einrueckung)
+
+
+def _markdown_fragment(frage, loesung, mit_loesung):
+    teile = [f"1. {_md_text(frage)}\n"]
+    if mit_loesung and loesung:
+        teile.append(f"\n   **Lösung:** {_md_text(loesung)}\n")
+    teile.append("\n")
+    return "".join(teile)
+
+
+_LATEX_ERSETZEN = {
+    "\\": r"\textbackslash{}",
+    "&": r"\&", "%": r"\%", "$": r"\$", "#": r"\#", "_": r"\_",
+    "{": r"\{", "}": r"\}",
+    "~": r"\textasciitilde{}", "^": r"\textasciicircum{}",
+}
+_LATEX_ZEICHEN = re.compile("|".join(re.escape(z) for z in _LATEX_ERSETZEN))
+
+
+def _latex_text(text):
+    return "\n\n".join(
+        " \\\\\n".join(_LATEX_ZEICHEN.sub(lambda m: _LATEX_ERSETZEN[m.group()], z) for z in absatz)
+        for absatz in _absaetze(text)
+    )
+
+
+def _latex_fragment(frage, loesung, mit_loesung):
+    teile = [f"\\item {_latex_text(frage)}\n"]
+    if mit_loesung and loesung:
+        teile.append(f"\n\\loesung{{{_latex_text(loesung)}}}\n")
+    else:
+        teile.append("\\antwortplatz\n")
+    teile.append("\n")
+    return "".join(teile)
+
+
+_FRAGMENT_FUNKTIONEN = {
+    "html": _html_fragment,
+    "markdown": _markdown_fragment,
+    "latex": _latex_fragment,
+}
+
+
+# --------------------------------------------
+# Kopf und Fuß vom Dokument (pro Format)
+# --------------------------------------------
+def _html_kopf(titel, datum, mit_loesung):
+    t = html.escape(titel)
+    zusatz = " – Lösungen" if mit_loesung else ""
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="de">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{t}{zusatz}</title>\n"
+        "<style>\n"
+        "body { font-family: sans-serif; max-width: 48em; margin: 2em auto; }\n"
+        "li.frage { margin-bottom: 1.5em; page-break-inside: avoid; }\n"
+        ".antwort { height: 6em; border-bottom: 1px dotted #999; }\n"
+        ".loesung { color: #064; }\n"
+        "</style>\n</head>\n<body>\n"
+        f"<h1>{t}{zusatz}</h1>\n"
+        f"<p>Datum: {html.escape(datum or '-')} &nbsp; Name: ______________________</p>\n"
+        "<ol>\n"
+    )
+
+
+def _html_fuss():
+    return "</ol>\n</body>\n</html>\n"
+
+
+def _markdown_kopf(titel, datum, mit_loesung):
+    zusatz = " – Lösungen" if mit_loesung else ""
+    return f"# {_md_text(titel, '')}{zusatz}\n\nDatum: {datum or '-'}\n\n"
+
+
+def _markdown_fuss():
+    return ""
+
+
+def _latex_kopf(titel, datum, mit_loesung):
+    zusatz = " -- Lösungen" if mit_loesung else ""
+    return (
+        "\\documentclass[a4paper,11pt]{article}\n"
+        "\\usepackage[utf8]{inputenc}\n"
+        "\\usepackage[T1]{fontenc}\n"
+        "\\usepackage[ngerman]{babel}\n"
+        "\\usepackage[margin=2cm]{geometry}\n"
+        "\\newcommand{\\loesung}[1]{\\par\\textbf{Lösung:} #1}\n"
+        "\\newcommand{\\antwortplatz}{\\par\\vspace{4em}}\n"
+        "\\begin{document}\n"
+        f"\\section*{{{_latex_text(titel)}{zusatz}}}\n"
+        f"Datum: {_latex_text(datum or '-')} \\hfill Name: \\rule{{6cm}}{{0.4pt}}\n"
+        "\\begin{enumerate}\n"
+    )
+
+
+def _latex_fuss():
+    return "\\end{enumerate}\n\\end{document}\n"
+
+
+_KOPF_FUSS = {
+    "html": (_html_kopf, _html_fuss),
+    "markdown": (_markdown_kopf, _markdown_fuss),
+    "latex": (_latex_kopf, _latex_fuss),
+}
+
+
+# --------------------------------------------
+# Cache
+# --------------------------------------------
+def _schluessel(format, mit_loesung, frage, loesung):
+    """
+    Inhalts-Hash für ein Fragment (32 Hex-Zeichen).
+    \\0 trennt die Teile, damit z.B. ("ab", "c") und ("a", "bc") nicht gleich sind.
+    """
+
+    inhalt = f"{RENDER_VERSION}\0{format}\0{int(bool(mit_loesung))}\0{frage}\0{loesung}"
+    return hashlib.blake2b(inhalt.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _fragmente(fragen, format, mit_loesung):
+    """
+    Fragmente für alle Fragen, aus dem Cache oder neu gerendert.
+
+    fragen: Liste von (id, question_text, solution)
+    Rückgabe: (Liste von Fragmenten in derselben Reihenfolge, Anzahl neu gerenderter)
+    """
+
+    schluessel = [_schluessel(format, mit_loesung, q, s or "") for _, q, s in fragen]
+
+    # Alle auf einmal nachschauen (EIN Parameter: die Liste als JSON)
+    conn = verbindung()
+    vorhanden = dict(conn.execute(
+        "SELECT schluessel, fragment FROM render_cache WHERE schluessel IN (SELECT value FROM json_each(?));",
+        (json.dumps(schluessel),),
+    ))
+
+    rendern = _FRAGMENT_FUNKTIONEN[format]
+    neu = {}
+    ergebnis = []
+    for k, (_, q, s) in zip(schluessel, fragen):
+        fragment = vorhanden.get(k)
+        if fragment is None:
+            fragment = neu.get(k)
+            if fragment is None:
+                fragment = neu[k] = rendern(q, s or "", mit_loesung)
+        ergebnis.append(fragment)
+
+    if neu:
+        with transaktion() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO render_cache (schluessel, fragment) VALUES (?, ?);",
+                neu.items(),
+            )
+            # Älteste Einträge wegwerfen (rowid = Reihenfolge des Anlegens)
+            conn.execute(
+                "DELETE FROM render_cache WHERE rowid <= (SELECT MAX(rowid) FROM render_cache) - ?;",
+                (MAX_EINTRAEGE,),
+            )
+
+    return ergebnis, len(neu)
+
+
+def cache_leeren():
+    """Löscht alle gespeicherten Fragmente. Rückgabe: Anzahl gelöschter"""
+    with transaktion() as conn:
+        return conn.execute("DELETE FROM render_cache;").rowcount
+
+
+# --------------------------------------------
+# Öffentlich
+# --------------------------------------------
+def dokument(titel, datum, fragmente, format="html", mit_loesung=False):
+    """
+    Setzt fertige Fragmente zu einem Dokument zusammen (Kopf + Fragmente + Fuß).
+    Braucht keine DB (z.B. für varianten.py in anderen Prozessen).
+    """
+
+    kopf, fuss = _KOPF_FUSS[format]
+    return kopf(titel, datum, mit_loesung) + "".join(fragmente) + fuss()
+
+
+def fragen_rendern(titel, datum, fragen, format="html", mit_loesung=False):
+    """
+    Rendert eine beliebige Liste von Fragen als Dokument.
+    fragen: Liste von (id, question_text, solution)
+    Rückgabe: Text
+    """
+
+    if format not in FORMATE:
+        raise ValueError(f"Unbekanntes Format: {format} (erlaubt: {', '.join(FORMATE)})")
+
+    fragmente, _ = _fragmente(fragen, format, mit_loesung)
+    return dokument(titel, datum, fragmente, format, mit_loesung)
+
+
+def test_rendern(test_id, format="html", mit_loesung=False):
+    """
+    Rendert einen Test (wie test_anzeigen) als HTML, Markdown oder LaTeX.
+    Rückgabe: Text, oder None wenn es den Test nicht gibt
+    """
+
+    test_row, fragen = test_anzeigen(test_id)
+    if test_row is None:
+        return None
+
+    _, titel, datum = test_row
+    return fragen_rendern(titel, datum, fragen, format, mit_loesung)
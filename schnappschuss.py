@@ -0,0 +1,651 @@
+# schnappschuss.py
+# Hält die ganze Datenbank als Kopie im Arbeitsspeicher (nur wenn eingeschaltet).
+#
+# Für dumme:
+# - Liegt die DB-Datei z.B. auf einem Netzlaufwerk, kostet jede Abfrage
+#   Zugriffe auf die Datei. Eingeschaltet wird die Datei EINMAL beim Start
+#   in den Speicher kopiert (Connection.backup), danach lesen alle
+#   Verbindungen von datenbank.verbindung() nur noch aus dem Speicher.
+# - Eingeschaltet wird mit schnappschuss.einschalten("sync") (oder
+#   Umgebungsvariable TESTAPP_SPEICHER=sync bzw. =spaeter, oder Menüpunkt 19).
+#   Ausgeschaltet kostet das Modul GAR NICHTS (wie messung.py).
+#
+# Schreiben: jede Transaktion merkt sich ihre schreibenden Befehle
+# (INSERT/UPDATE/DELETE/CREATE ... mit Parametern). Beim COMMIT werden
+# genau diese Befehle auch auf der Datei ausgeführt:
+# - "sync":    ZUERST auf der Datei (eigene Transaktion), erst wenn das
+#              geklappt hat COMMIT im Speicher. Geht die Datei schief ->
+#              ROLLBACK im Speicher, Fehler wie immer (nichts ist verloren).
+# - "spaeter": COMMIT im Speicher sofort, die Befehle kommen in eine
+#              Warteschlange. Ein Hintergrund-Thread schreibt sie gesammelt
+#              (viele Transaktionen in EINER Datei-Transaktion) auf die Datei.
+#              Beim Programmende wird die Schlange geleert (leeren()).
+#              Schneller, aber: stürzt der Rechner ab, fehlt das Letzte.
+# Trigger und ON DELETE CASCADE laufen auf der Datei von selbst noch einmal,
+# darum werden nur die Befehle vom Programm wiederholt, nicht deren Folgen.
+#
+# Kontrolle:
+# - pruefen() vergleicht Speicher und Datei (Zeilen + Prüfsumme pro Tabelle).
+#   Beim Programmende läuft eine schnelle Prüfung (nur Zeilen zählen).
+# - Schreibt ein ANDERES Programm in die Datei, merkt das der nächste
+#   Schreibvorgang (PRAGMA data_version) -> Fehler, und (sync) die Kopie
+#   wird neu geladen. Nur lesen merkt es nicht: dafür neu_laden().
+#   Wenn mehrere Programme gleichzeitig schreiben: besser ausgeschaltet lassen.
+# - Die Kopie darf höchstens 1 GB groß sein (Grenze der Speicher-DB von SQLite).
+
+import atexit
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+import datenbank
+
+
+MODI = ("sync", "spaeter")
+
+SAMMELN_SEKUNDEN = 0.05
+# "spaeter": so lange wartet der Hintergrund-Thread, um mehrere
+# Transaktionen in EINE Datei-Transaktion zu packen.
+
+MAX_SAMMELN = 500
+# "spaeter": höchstens so viele Transaktionen auf einmal auf die Datei
+
+PRUEFEN_BEIM_ENDE = True
+# Beim Programmende Zeilen pro Tabelle in Speicher und Datei vergleichen
+
+
+class SchnappschussFehler(sqlite3.OperationalError):
+    """
+    Speicher und Datei passen nicht (mehr) zusammen.
+    Ist ein sqlite3.Error -> wird überall wie ein DB-Fehler behandelt.
+    """
+
+
+class DateiGeaendert(SchnappschussFehler):
+    """Ein anderes Programm hat in die Datei geschrieben (Kopie ist veraltet)."""
+
+
+_modus = None
+# None = aus, sonst "sync" oder "spaeter"
+
+_name = None
+# URI der Speicher-DB, z.B. "file:/testapp-1234-1?vfs=memdb"
+
+_anker = None
+# Diese Verbindung bleibt immer offen: sonst verschwindet die Speicher-DB,
+# sobald die letzte Verbindung zu ist (z.B. in verbindungen_schliessen()).
+
+_datei = None
+_datei_name = None
+_datei_lock = threading.Lock()
+_datei_version = None
+# Verbindung zur echten Datei (nur zum Nachschreiben und Prüfen), ihr Name und
+# PRAGMA data_version: ändert sich die Zahl, hat ein anderes Programm geschrieben.
+
+_nummer = 0
+# Jedes Laden bekommt einen neuen Namen (alte Verbindungen sehen die alte Kopie)
+
+_klassen = {}
+# Verbindungsklasse -> dazu passende Spiegel-Klasse (siehe _klasse())
+
+_warteschlange = queue.Queue()
+_reihenfolge_lock = threading.Lock()
+_schreiber = None
+_fehler = None
+# "spaeter": Transaktionen, die noch auf die Datei müssen, der Hintergrund-
+# Thread und sein erster Fehler (danach wird nichts mehr nachgeschrieben).
+
+_statistik = {"transaktionen": 0, "befehle": 0, "datei_transaktionen": 0, "laden_ms": 0.0}
+
+_UNSICHER = None
+# Eintrag im Stapel: executemany() ist mittendrin abgebrochen, ein Teil
+# der Zeilen ist schon im Speicher. Ohne ROLLBACK (TO) kein COMMIT möglich.
+
+_ERSTES_WORT = re.compile(r"\s*(?:--[^\n]*\n\s*|/\*.*?\*/\s*)*(\w+)", re.S)
+
+_NICHT_SPIEGELN = frozenset(("SELECT", "VALUES", "EXPLAIN", "PRAGMA", "VACUUM", "ATTACH", "DETACH"))
+_DDL = frozenset(("CREATE", "DROP", "ALTER", "ANALYZE", "REINDEX"))
+# Lesen und Einstellungen der Verbindung (PRAGMA) müssen nicht auf die Datei.
+# DDL ändert total_changes nicht, muss aber trotzdem auf die Datei.
+
+
+_WOERTER = {}
+# SQL-Text -> erstes Wort. Das Programm benutzt immer wieder dieselben Texte,
+# so kostet das Nachschauen bei jedem execute() fast nichts.
+
+
+def _erstes_wort(sql):
+    wort = _WOERTER.get(sql)
+    if wort is None:
+        m = _ERSTES_WORT.match(sql)
+        wort = m.group(1).upper() if m else ""
+        if len(_WOERTER) >= 4096:
+            _WOERTER.clear()  # z.B. viele verschiedene "IN (?, ?, ...)"-Texte
+        _WOERTER[sql] = wort
+    return wort
+
+
+# --------------------------------------------
+# Verbindung, die ihre Schreibbefehle mitschreibt
+# --------------------------------------------
+class _SpiegelCursor:
+    """Mixin für den Cursor: alles geht über die Verbindung (_spiegeln)."""
+
+    def execute(self, sql, params=()):
+        return self.connection._spiegeln(super().execute, sql, params, False)
+
+    def executemany(self, sql, params):
+        if not isinstance(params, (list, tuple)):
+            params = list(params)  # ein Generator ließe sich nicht wiederholen
+        return self.connection._spiegeln(super().executemany, sql, params, True)
+
+
+class _SpiegelVerbindung:
+    """
+    Mixin für die Verbindung (vor VERBINDUNGS_KLASSE, siehe _klasse()).
+
+    _stapel = Schreibbefehle der laufenden Transaktion: (sql, params, viele, rowid)
+    _marken = offene SAVEPOINTs: (name, Position im Stapel)
+    """
+
+    _stapel = None
+    _marken = ()
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or self.CURSOR_KLASSE)
+
+    def execute(self, sql, params=()):
+        if _erstes_wort(sql) in _NICHT_SPIEGELN:
+            return super().execute(sql, params)  # Lesen: ohne Umweg über unseren Cursor
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, params):
+        return self.cursor().executemany(sql, params)
+
+    def _spiegeln(self, ausfuehren, sql, params, viele):
+        wort = _erstes_wort(sql)
+
+        if wort in _NICHT_SPIEGELN:
+            return ausfuehren(sql, params)
+
+        if wort == "BEGIN":
+            cur = ausfuehren(sql, params)
+            self._stapel = []
+            self._marken = []
+            return cur
+
+        if wort in ("COMMIT", "END"):
+            return self._commit(ausfuehren, sql, params)
+
+        if wort in ("SAVEPOINT", "RELEASE") or wort == "ROLLBACK" and _ist_rollback_to(sql):
+            return self._savepoint(ausfuehren, wort, sql, params)
+
+        if wort == "ROLLBACK":
+            self._stapel = None
+            self._marken = ()
+            return ausfuehren(sql, params)
+
+        if self._stapel is None:
+            # Schreiben ohne transaktion() -> selbst eine drumherum machen,
+            # damit auch dieser Befehl über _commit() auf die Datei kommt.
+            self.execute("BEGIN;")
+            try:
+                cur = self._spiegeln(ausfuehren, sql, params, viele)
+            except BaseException:
+                self.execute("ROLLBACK;")
+                raise
+            self.execute("COMMIT;")
+            return cur
+
+        vorher = self.total_changes
+        try:
+            cur = ausfuehren(sql, params)
+        except BaseException:
+            if viele and self.total_changes != vorher:
+                self._stapel.append(_UNSICHER)
+            raise
+
+        if self.total_changes != vorher or wort in _DDL:
+            rowid = None
+            if not viele and wort in ("INSERT", "REPLACE"):
+                rowid = cur.lastrowid
+            if isinstance(params, list) and not viele:
+                params = tuple(params)
+            self._stapel.append((sql, params, viele, rowid))
+        return cur
+
+    def _savepoint(self, ausfuehren, wort, sql, params):
+        if self._stapel is None:
+            raise SchnappschussFehler("SAVEPOINT/RELEASE geht im Speicher-Modus nur innerhalb von transaktion()")
+        cur = ausfuehren(sql, params)
+        name = sql.split()[-1].rstrip(";").lower()
+        if wort == "SAVEPOINT":
+            self._marken.append((name, len(self._stapel)))
+            return cur
+        # RELEASE x: x und alle inneren sind weg. ROLLBACK TO x: x bleibt offen,
+        # aber alles seit x ist auch im Stapel rückgängig.
+        for i in range(len(self._marken) - 1, -1, -1):
+            if self._marken[i][0] == name:
+                if wort == "RELEASE":
+                    del self._marken[i:]
+                else:
+                    del self._stapel[self._marken[i][1]:]
+                    del self._marken[i + 1:]
+                break
+        return cur
+
+    def _commit(self, ausfuehren, sql, params):
+        stapel, self._stapel = self._stapel, None
+        self._marken = ()
+        if not stapel:
+            return ausfuehren(sql, params)
+
+        datei_fertig = False
+        try:
+            if _UNSICHER in stapel:
+                raise SchnappschussFehler(
+                    "executemany() ist mittendrin abgebrochen (ohne ROLLBACK TO) -> "
+                    "kann nicht sicher auf die Datei geschrieben werden"
+                )
+            if _modus == "sync":
+                with _datei_lock:
+                    _auf_datei_schreiben([stapel])
+                    datei_fertig = True
+                    cur = ausfuehren(sql, params)
+            else:
+                with _reihenfolge_lock:
+                    # Reihenfolge in der Schlange = Reihenfolge der COMMITs im Speicher
+                    if _fehler is not None:
+                        raise SchnappschussFehler(f"Nachschreiben auf die Datei ist ausgefallen: {_fehler}")
+                    cur = ausfuehren(sql, params)
+                    _warteschlange.put(stapel)
+        except BaseException as e:
+            if self.in_transaction:
+                self.execute("ROLLBACK;")
+            for hook in datenbank._rollback_hooks:
+                hook()
+            if datei_fertig:
+                # Datei hat die Änderung, der Speicher nicht -> Kopie passt nicht mehr
+                print(f"⚠️  Speicher-COMMIT fehlgeschlagen ({e}), lade die DB neu.", file=sys.stderr)
+                neu_laden()
+            elif isinstance(e, DateiGeaendert):
+                neu_laden()
+            raise
+
+        _statistik["transaktionen"] += 1
+        _statistik["befehle"] += len(stapel)
+        return cur
+
+
+def _ist_rollback_to(sql):
+    return re.match(r"\s*ROLLBACK\s+(TRANSACTION\s+)?TO\b", sql, re.I) is not None
+
+
+def _klasse(basis):
+    """
+    Spiegel-Klasse für die aktuelle VERBINDUNGS_KLASSE (z.B. auch
+    messung.MessVerbindung: dann wird gemessen UND gespiegelt).
+    """
+
+    klasse = _klassen.get(basis)
+    if klasse is None:
+        cursor_basis = getattr(basis, "CURSOR_KLASSE", sqlite3.Cursor)
+        cursor_klasse = type("Spiegel" + cursor_basis.__name__, (_SpiegelCursor, cursor_basis), {})
+        klasse = _klassen[basis] = type(
+            "Spiegel" + basis.__name__, (_SpiegelVerbindung, basis), {"CURSOR_KLASSE": cursor_klasse}
+        )
+    return klasse
+
+
+def ziel(basis):
+    """Für datenbank._neue_verbindung(): (URI der Speicher-DB, Verbindungsklasse)."""
+    return _name, _klasse(basis)
+
+
+# --------------------------------------------
+# Datei <-> Speicher
+# --------------------------------------------
+def _datei_oeffnen():
+    global _datei_name
+
+    _datei_name = datenbank.DB_DATEI
+    conn = sqlite3.connect(
+        datenbank.DB_DATEI,
+        cached_statements=datenbank.STATEMENT_CACHE,
+        check_same_thread=False,  # sync: Thread vom COMMIT, spaeter: Hintergrund-Thread
+        isolation_level=None,
+    )
+    conn.execute("PRAGMA foreign_keys = ON;")
+    for name, wert in datenbank.PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {wert};")
+    datenbank.schema_aktualisieren(conn)
+    return conn
+
+
+def _laden():
+    """
+    Kopiert die Datei in eine NEUE Speicher-DB und setzt _name/_anker.
+
+    Für dumme (warum so umständlich):
+    - Die Datei ist im WAL-Modus, und das steht auch in der Kopie. Eine
+      Speicher-DB kann aber kein WAL -> andere Verbindungen könnten sie
+      danach nicht öffnen. Darum wird die Kopie sofort auf journal_mode=DELETE
+      umgestellt, solange nur der Anker sie offen hat (locking_mode=EXCLUSIVE).
+    """
+
+    global _name, _anker, _nummer, _datei_version
+
+    start = time.perf_counter()
+    _nummer += 1
+    name = f"file:/testapp-{os.getpid()}-{_nummer}?vfs=memdb"
+
+    anker = sqlite3.connect(name, uri=True, isolation_level=None, check_same_thread=False)
+    try:
+        anker.execute("PRAGMA locking_mode = EXCLUSIVE;")
+        with _datei_lock:
+            _datei.backup(anker)
+            _datei_version = _datei.execute("PRAGMA data_version;").fetchone()[0]
+        anker.execute("PRAGMA journal_mode = DELETE;")
+        anker.execute("PRAGMA locking_mode = NORMAL;")
+        anker.execute("SELECT 1 FROM sqlite_schema LIMIT 1;").fetchall()  # gibt die Sperre frei
+    except BaseException:
+        anker.close()
+        raise
+
+    alt = _anker
+    _name, _anker = name, anker
+    if alt is not None:
+        alt.close()
+    _statistik["laden_ms"] = (time.perf_counter() - start) * 1000
+
+
+def _auf_datei_schreiben(stapel_liste):
+    """
+    Führt die gemerkten Befehle in EINER Transaktion auf der Datei aus.
+    Nur mit _datei_lock aufrufen.
+    """
+
+    version = _datei.execute("PRAGMA data_version;").fetchone()[0]
+    if version != _datei_version:
+        raise DateiGeaendert(
+            "Die DB-Datei wurde von einem anderen Programm geändert -> Speicher-Kopie ist veraltet"
+        )
+
+    datenbank.schreibsperre_holen(_datei)
+    try:
+        for stapel in stapel_liste:
+            for sql, params, viele, rowid in stapel:
+                if viele:
+                    _datei.executemany(sql, params)
+                    continue
+                cur = _datei.execute(sql, params)
+                if rowid is not None and cur.lastrowid != rowid:
+                    # z.B. AUTOINCREMENT-Zähler verschieden -> ab hier würden IDs nicht passen
+                    raise SchnappschussFehler(
+                        f"Datei und Speicher sind auseinander (neue ID {cur.lastrowid} statt {rowid})"
+                    )
+    except BaseException:
+        _datei.execute("ROLLBACK;")
+        raise
+    _datei.execute("COMMIT;")
+    _statistik["datei_transaktionen"] += 1
+
+
+def _schreiber_schleife():
+    """Hintergrund-Thread für "spaeter": Schlange -> Datei."""
+
+    global _fehler
+
+    while True:
+        stapel = _warteschlange.get()
+        if stapel is None:
+            _warteschlange.task_done()
+            return
+
+        time.sleep(SAMMELN_SEKUNDEN)
+        liste = [stapel]
+        ende = False
+        while len(liste) < MAX_SAMMELN:
+            try:
+                naechster = _warteschlange.get_nowait()
+            except queue.Empty:
+                break
+            if naechster is None:
+                ende = True
+                break
+            liste.append(naechster)
+
+        try:
+            if _fehler is None:
+                with _datei_lock:
+                    _auf_datei_schreiben(liste)
+        except Exception as e:
+            _fehler = e
+            print(f"⚠️  Nachschreiben auf die DB-Datei fehlgeschlagen: {e}", file=sys.stderr)
+        finally:
+            for _ in range(len(liste) + ende):
+                _warteschlange.task_done()
+        if ende:
+            return
+
+
+# --------------------------------------------
+# Ein/Aus
+# --------------------------------------------
+def ist_an():
+    return _modus is not None
+
+
+def einschalten(modus="sync"):
+    """
+    Lädt die DB in den Speicher. Offene Verbindungen werden geschlossen,
+    die nächste kommt schon aus dem Speicher.
+    (Darum NICHT mitten in einer transaktion() aufrufen.)
+    """
+
+    global _modus, _datei, _schreiber, _fehler
+
+    if modus not in MODI:
+        raise ValueError(f"Unbekannter Modus: {modus} (erlaubt: {', '.join(MODI)})")
+    if ist_an():
+        leeren()
+        _modus = modus
+        return
+
+    datenbank.verbindungen_schliessen()
+    _datei = _datei_oeffnen()
+    try:
+        _laden()
+    except BaseException:
+        _datei.close()
+        _datei = None
+        raise
+
+    _fehler = None
+    _modus = modus
+    datenbank._schema_geprueft = True  # hat _datei_oeffnen() schon gemacht
+    datenbank._schnappschuss = sys.modules[__name__]
+    for hook in datenbank._rollback_hooks:
+        hook()  # Caches gehören zu den alten Verbindungen
+
+    if _schreiber is None or not _schreiber.is_alive():
+        _schreiber = threading.Thread(target=_schreiber_schleife, name="schnappschuss", daemon=True)
+        _schreiber.start()
+
+
+def ausschalten():
+    """Schreibt alles Offene auf die Datei, danach geht alles wieder direkt auf die Datei."""
+
+    global _modus, _datei, _anker, _name
+
+    if not ist_an():
+        return
+    try:
+        leeren()
+    finally:
+        datenbank.verbindungen_schliessen()
+        datenbank._schnappschuss = None
+        _modus = None
+        _warteschlange.put(None)  # Hintergrund-Thread beenden
+        _warteschlange.join()
+        for conn in (_anker, _datei):
+            conn.close()
+        _anker = _datei = _name = None
+        for hook in datenbank._rollback_hooks:
+            hook()
+
+
+def leeren():
+    """
+    Wartet, bis alle Transaktionen auf der Datei sind ("spaeter").
+    Ist dabei etwas schiefgegangen -> SchnappschussFehler.
+    """
+
+    _warteschlange.join()
+    if _fehler is not None:
+        raise SchnappschussFehler(f"Nachschreiben auf die Datei ist ausgefallen: {_fehler}")
+
+
+def neu_laden():
+    """
+    Lädt die Datei neu in den Speicher (z.B. wenn ein anderes Programm
+    geschrieben hat). Offene Verbindungen werden geschlossen.
+    """
+
+    global _datei, _fehler
+
+    if not ist_an():
+        return
+    _warteschlange.join()
+    datenbank.verbindungen_schliessen()
+    if _datei_name != datenbank.DB_DATEI:
+        # datenbank_wechseln(): ab jetzt eine andere Datei
+        with _datei_lock:
+            _datei.close()
+            _datei = _datei_oeffnen()
+    _laden()
+    _fehler = None  # die neue Kopie passt wieder zur Datei (der Fehler wurde schon gemeldet)
+    datenbank._schema_geprueft = True
+    for hook in datenbank._rollback_hooks:
+        hook()
+
+
+# --------------------------------------------
+# Prüfen
+# --------------------------------------------
+def _tabellen(conn):
+    # Virtuelle Tabellen (FTS5) selbst nicht: ihre Daten stehen in normalen
+    # Hilfstabellen (questions_fts_data, ...), die werden mitgeprüft.
+    return [
+        r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_schema WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%' AND sql NOT LIKE 'CREATE VIRTUAL%' ORDER BY name;"
+        )
+    ]
+
+
+def _fingerabdruck(conn, tabelle, gruendlich):
+    """(Zeilen, Prüfsumme) einer Tabelle. Prüfsumme unabhängig von der Reihenfolge."""
+
+    if not gruendlich:
+        return conn.execute(f'SELECT COUNT(*) FROM "{tabelle}";').fetchone()[0], 0
+    anzahl = summe = 0
+    for row in conn.execute(f'SELECT * FROM "{tabelle}";'):
+        anzahl += 1
+        summe += hash(row)
+    return anzahl, summe & 0xFFFFFFFFFFFFFFFF
+
+
+def pruefen(gruendlich=True):
+    """
+    Vergleicht Speicher und Datei Tabelle für Tabelle.
+
+    gruendlich: True = jede Zeile (Prüfsumme), False = nur Zeilen zählen
+
+    Rückgabe: Liste von (tabelle, (zeilen, summe) im Speicher, (zeilen, summe) in der Datei)
+    mit allen Unterschieden. Leere Liste = alles gleich.
+    """
+
+    if not ist_an():
+        return []
+    leeren()
+
+    with _datei_lock:
+        speicher = sqlite3.connect(_name, uri=True, isolation_level=None)
+        try:
+            # Beide Seiten in einer Lese-Transaktion -> fester Stand während dem Vergleich
+            speicher.execute("BEGIN;")
+            _datei.execute("BEGIN;")
+            try:
+                namen = sorted(set(_tabellen(speicher)) | set(_tabellen(_datei)))
+                unterschiede = []
+                for tabelle in namen:
+                    try:
+                        a = _fingerabdruck(speicher, tabelle, gruendlich)
+                    except sqlite3.OperationalError:
+                        a = None  # Tabelle fehlt
+                    try:
+                        b = _fingerabdruck(_datei, tabelle, gruendlich)
+                    except sqlite3.OperationalError:
+                        b = None
+                    if a != b:
+                        unterschiede.append((tabelle, a, b))
+            finally:
+                _datei.execute("COMMIT;")
+        finally:
+            speicher.close()
+
+    return unterschiede
+
+
+def status():
+    """Rückgabe: Dict mit Modus, Zahlen und offenen Transaktionen (für den Bericht)."""
+    return dict(
+        _statistik,
+        modus=_modus,
+        offen=_warteschlange.unfinished_tasks,
+        fehler=None if _fehler is None else str(_fehler),
+        datei=datenbank.DB_DATEI,
+    )
+
+
+def bericht_ausgeben(out=None):
+    out = out or sys.stdout
+    if not ist_an():
+        print("Speicher-Modus ist aus (alles direkt auf der Datei).", file=out)
+        return
+    s = status()
+    print(f"Speicher-Modus: {s['modus']} (Datei: {s['datei']}, geladen in {s['laden_ms']:.0f} ms)", file=out)
+    print(
+        f"  {s['transaktionen']} Transaktionen mit {s['befehle']} Befehlen gespiegelt, "
+        f"{s['datei_transaktionen']} Datei-Transaktionen, {s['offen']} noch offen",
+        file=out,
+    )
+    if s["fehler"]:
+        print(f"  ⚠️  Fehler: {s['fehler']}", file=out)
+
+
+def _beenden():
+    """atexit: Offenes auf die Datei schreiben, dann kurz prüfen."""
+
+    if not ist_an():
+        return
+    try:
+        leeren()
+        if PRUEFEN_BEIM_ENDE:
+            for tabelle, a, b in pruefen(gruendlich=False):
+                print(
+                    f"⚠️  Speicher und Datei verschieden: {tabelle} "
+                    f"({a[0] if a else '-'} / {b[0] if b else '-'} Zeilen)",
+                    file=sys.stderr,
+                )
+    except sqlite3.Error as e:
+        print(f"⚠️  Speicher-Modus: {e}", file=sys.stderr)
+
+
+atexit.register(_beenden)
+# Läuft VOR datenbank.verbindungen_schliessen() (atexit: zuletzt angemeldet = zuerst)
@@ -0,0 +1,205 @@
+# server.py
+# Kleiner HTTP-Server (nur lesen), damit mehrere Leute gleichzeitig
+# Kategorien, Fragen und Tests im Browser oder per Skript anschauen können.
+#
+# Für dumme:
+# - Start: "python start.py serve" (oder "python start.py serve 8080")
+# - Dann im Browser z.B. http://127.0.0.1:8000/kategorien
+# - Alles kommt als JSON zurück.
+#
+# Adressen:
+#   GET /kategorien                          -> alle Kategorien
+#   GET /kategorien/<id>/fragen?nach=&limit= -> Fragen einer Kategorie (seitenweise)
+#   GET /tests?vor=&limit=                   -> Tests, neueste zuerst (seitenweise)
+#   GET /tests/<id>                          -> ein Test mit seinen Fragen (wie test_anzeigen)
+#
+# Schnell bei vielen Lesern:
+# - Jede Anfrage läuft in einem eigenen Thread (ThreadingHTTPServer), die
+#   Threads teilen sich aber nur wenige DB-Verbindungen (leseverbindung()).
+# - ETag: jede Antwort bekommt eine "Versionsnummer" der DB. Schickt der
+#   Browser sie beim nächsten Mal mit (If-None-Match) und hat sich nichts
+#   geändert, antworten wir nur "304 Not Modified" (ohne DB-Abfrage).
+# - gzip: große Antworten werden komprimiert, wenn der Client das kann.
+
+import gzip
+import json
+import os
+import re
+import sqlite3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from datenbank import data_version, leseverbindung
+from fragen import fragen_von_kategorie_seite
+from kategorien import alle_kategorien, kategorie_name
+from tests import test_anzeigen, tests_seite
+
+
+HOST = "127.0.0.1"
+PORT = 8000
+
+MAX_LIMIT = 500
+# Mehr Zeilen pro Seite gibt es nicht (sonst könnte jemand alles auf einmal holen).
+
+GZIP_AB = 1024
+# Kleinere Antworten lohnt das Komprimieren nicht.
+
+WARTESCHLANGE = 256
+# So viele Verbindungen dürfen beim Betriebssystem auf "accept" warten.
+
+
+# --------------------------------------------
+# DB-Version für ETags
+# --------------------------------------------
+# Für dumme:
+# - datenbank.data_version() ändert sich, sobald jemand etwas in die DB
+#   schreibt. Der Server schreibt nie -> jede Änderung wird gezählt.
+# - _START kommt dazu, weil data_version nach einem Neustart wieder klein ist.
+
+_START = os.urandom(4).hex()
+
+
+def _zahl(werte, name, standard=None):
+    """Liest ?name=123 aus der Query. Fehlt -> standard. Kaputt -> ValueError."""
+    if name not in werte:
+        return standard
+    return int(werte[name][0])
+
+
+def _limit(werte):
+    """?limit= auf 1..MAX_LIMIT begrenzt (LIMIT -1 hieße für SQLite "alles", 0 gäbe leere Seiten)."""
+    return max(1, min(_zahl(werte, "limit", 50), MAX_LIMIT))
+
+
+# --------------------------------------------
+# Die Adressen
+# --------------------------------------------
+def _kategorien(treffer, werte):
+    return 200, [{"id": cid, "name": name} for cid, name in alle_kategorien()]
+
+
+def _fragen(treffer, werte):
+    cid = int(treffer.group(1))
+    if kategorie_name(cid) is None:
+        return 404, {"fehler": "Kategorie gibt es nicht"}
+
+    limit = _limit(werte)
+    seite = fragen_von_kategorie_seite(cid, _zahl(werte, "nach"), limit)
+    return 200, {
+        "kategorie": cid,
+        "fragen": [{"id": qid, "question_text": text} for qid, text in seite],
+        # Für die nächste Seite: ?nach=<weiter>
+        "weiter": seite[-1][0] if len(seite) == limit else None,
+    }
+
+
+def _tests(treffer, werte):
+    limit = _limit(werte)
+    seite = tests_seite(_zahl(werte, "vor"), limit)
+    return 200, {
+        "tests": [{"id": tid, "title": title, "test_date": date} for tid, title, date in seite],
+        "weiter": seite[-1][0] if len(seite) == limit else None,
+    }
+
+
+def _test(treffer, werte):
+    test_row, questions = test_anzeigen(int(treffer.group(1)))
+    if test_row is None:
+        return 404, {"fehler": "Test gibt es nicht"}
+
+    tid, title, date = test_row
+    return 200, {
+        "id": tid,
+        "title": title,
+        "test_date": date,
+        "fragen": [
+            {"id": qid, "question_text": text, "solution": loesung}
+            for qid, text, loesung in questions
+        ],
+    }
+
+
+ADRESSEN = [
+    (re.compile(r"^/kategorien/?$"), _kategorien),
+    (re.compile(r"^/kategorien/(\d+)/fragen/?$"), _fragen),
+    (re.compile(r"^/tests/?$"), _tests),
+    (re.compile(r"^/tests/(\d+)/?$"), _test),
+]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-Alive: mehrere Anfragen pro Verbindung
+
+    def do_GET(self):
+        teile = urlsplit(self.path)
+
+        for muster, funktion in ADRESSEN:
+            treffer = muster.match(teile.path)
+            if treffer is not None:
+                break
+        else:
+            self._senden(404, {"fehler": "Unbekannte Adresse"})
+            return
+
+        etag = f'W/"{_START}-{data_version()}"'
+        if etag in self.headers.get("If-None-Match", ""):
+            self._senden(304, None, etag)
+            return
+
+        try:
+            with leseverbindung():
+                status, daten = funktion(treffer, parse_qs(teile.query))
+        except ValueError:
+            self._senden(400, {"fehler": "Parameter müssen Zahlen sein"})
+            return
+        except sqlite3.Error as e:
+            self._senden(500, {"fehler": f"Datenbankfehler: {e}"})
+            return
+
+        self._senden(status, daten, etag if status == 200 else None)
+
+    def _senden(self, status, daten, etag=None):
+        body = b""
+        if daten is not None:
+            body = json.dumps(daten, ensure_ascii=False).encode("utf-8")
+
+        gzip_ok = "gzip" in self.headers.get("Accept-Encoding", "")
+        if gzip_ok and len(body) >= GZIP_AB:
+            body = gzip.compress(body, compresslevel=5)
+        else:
+            gzip_ok = False
+
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # immer nachfragen, aber ETag benutzen
+        self.send_header("Vary", "Accept-Encoding")
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            if gzip_ok:
+                self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keine Zeile pro Anfrage auf der Konsole (bei hunderten Lesern zu viel)
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = WARTESCHLANGE
+
+
+def starten(host=HOST, port=PORT):
+    """
+    Startet den Server und läuft, bis Ctrl+C gedrückt wird.
+    """
+
+    server = Server((host, port), Handler)
+    print(f"Server läuft auf http://{host}:{server.server_port}/kategorien  (Ende mit Ctrl+C)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
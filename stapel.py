@@ -0,0 +1,280 @@
+# stapel.py
+# Führt eine Datei mit vielen Befehlen auf einmal aus ("Stapel", engl. batch).
+#
+# Für dumme:
+# - Für große Wartungsarbeiten: statt 10.000x durchs Menü eine Datei wie
+#
+#       # Kommentar
+#       kategorien add Hydraulik
+#       q1 = frage add Hydraulik "Was ist Druck?" "Kraft pro Fläche"
+#       q2 = frage add Hydraulik "Was ist ein Ventil?"
+#       t = test add "Schularbeit 1" 2024-05-01
+#       test add-fragen $t $q1 $q2
+#       test rename $t "Schularbeit 1 (neu)" 2024-05-02
+#
+#   Start: "python start.py stapel datei.txt" (oder "-" für stdin)
+# - Die Befehle sehen aus wie bei der Kommandozeile (kommandozeile.py).
+# - "name = befehl ..." merkt sich die neue ID, "$name" setzt sie später ein.
+#
+# Warum schnell?
+# - Alles läuft auf EINER Verbindung in EINER Transaktion (nur ein COMMIT
+#   am Ende statt einem pro Befehl). Die Funktionen aus kategorien.py,
+#   fragen.py und tests.py machen in transaktion() einfach mit.
+# - Mit blockgroesse=N wird alle N Befehle ein COMMIT gemacht (für sehr
+#   große Dateien, damit andere Programme zwischendurch schreiben können).
+#
+# Fehler: beim ERSTEN Fehler wird der aktuelle Block zurückgerollt (ROLLBACK)
+# und abgebrochen. Ohne Blöcke heißt das: gar nichts wurde gespeichert.
+
+import re
+import shlex
+import time
+from collections import Counter
+
+from datenbank import transaktion
+from fragen import frage_anlegen, frage_update
+from kategorien import kategorie_anlegen, kategorie_id, kategorie_name
+from tests import fragen_zu_test, test_anlegen, test_fragen_setzen, test_holen, test_update
+
+
+BLOCKGROESSE = 0
+# 0 = alle Befehle in EINER Transaktion
+
+
+class StapelFehler(Exception):
+    """Ein Befehl im Stapel ist fehlgeschlagen (mit Zeilennummer)."""
+
+    def __init__(self, nr, zeile, meldung, gespeichert=0):
+        super().__init__(f"Zeile {nr}: {meldung}\n  {zeile}")
+        self.nr = nr
+        self.zeile = zeile
+        self.meldung = meldung
+        self.gespeichert = gespeichert  # so viele Befehle sind schon COMMITet (frühere Blöcke)
+
+
+# --------------------------------------------
+# Die einzelnen Befehle
+# Jede Funktion bekommt die Argumente (Strings) und gibt eine ID zurück
+# (oder None). Kaputte Eingaben -> ValueError mit Erklärung.
+# --------------------------------------------
+def _int(wert, was="ID"):
+    if not wert.lstrip("-").isdigit():
+        raise ValueError(f"{was} muss eine Zahl sein: {wert!r}")
+    return int(wert)
+
+
+def _kategorie(wert):
+    cid = kategorie_id(wert)
+    if cid is None and wert.isdigit() and kategorie_name(int(wert)) is not None:
+        cid = int(wert)
+    if cid is None:
+        raise ValueError(f"Kategorie '{wert}' gibt es nicht")
+    return cid
+
+
+def _anzahl(args, mindestens, hoechstens, form):
+    if not mindestens <= len(args) <= hoechstens:
+        raise ValueError(f"Falsche Anzahl Argumente, erwartet: {form}")
+
+
+def _kategorien_add(args):
+    _anzahl(args, 1, 1, "kategorien add NAME")
+    cid = kategorie_anlegen(args[0])
+    if cid is None:
+        raise ValueError("Leerer Kategorie-Name")
+    return cid
+
+
+def _frage_add(args):
+    _anzahl(args, 2, 3, "frage add KATEGORIE TEXT [LÖSUNG]")
+    qid = frage_anlegen(args[1], args[2] if len(args) > 2 else "", _kategorie(args[0]))
+    if qid is None:
+        raise ValueError("Leerer Fragetext")
+    return qid
+
+
+def _frage_update(args):
+    _anzahl(args, 2, 3, "frage update ID TEXT [LÖSUNG]")
+    qid = _int(args[0])
+    if not frage_update(qid, args[1], args[2] if len(args) > 2 else ""):
+        raise ValueError("Leerer Fragetext")
+    return qid
+
+
+def _test_add(args):
+    _anzahl(args, 1, 2, "test add TITEL [DATUM]")
+    tid = test_anlegen(args[0], args[1] if len(args) > 1 else None)
+    if tid is None:
+        raise ValueError("Leerer Titel")
+    return tid
+
+
+def _test_rename(args):
+    _anzahl(args, 2, 3, "test rename ID TITEL [DATUM]")
+    tid = _int(args[0])
+    alt = test_holen(tid)
+    if alt is None:
+        raise ValueError(f"Test {tid} gibt es nicht")
+    datum = args[2] if len(args) > 2 else alt[2]  # ohne Datum: altes Datum bleibt
+    if not test_update(tid, args[1], datum):
+        raise ValueError("Leerer Titel")
+    return tid
+
+
+def _test_add_fragen(args):
+    if len(args) < 2:
+        raise ValueError("Falsche Anzahl Argumente, erwartet: test add-fragen ID FRAGE_ID...")
+    tid = _int(args[0])
+    ergebnis = fragen_zu_test(tid, [_int(x, "Frage-ID") for x in args[1:]])
+    if ergebnis is None:
+        raise ValueError(f"Test {tid} gibt es nicht")
+    if ergebnis["unbekannt"]:
+        raise ValueError(f"Unbekannte Frage-IDs: {' '.join(str(x) for x in ergebnis['unbekannt'])}")
+    return tid
+
+
+def _test_set_fragen(args):
+    if len(args) < 1:
+        raise ValueError("Falsche Anzahl Argumente, erwartet: test set-fragen ID [FRAGE_ID...]")
+    tid = _int(args[0])
+    if test_holen(tid) is None:
+        raise ValueError(f"Test {tid} gibt es nicht")
+    unbekannt = test_fragen_setzen(tid, [_int(x, "Frage-ID") for x in args[1:]])
+    if unbekannt:
+        raise ValueError(f"Unbekannte Frage-IDs: {' '.join(str(x) for x in unbekannt)}")
+    return tid
+
+
+BEFEHLE = {
+    ("kategorien", "add"): _kategorien_add,
+    ("frage", "add"): _frage_add,
+    ("frage", "update"): _frage_update,
+    ("test", "add"): _test_add,
+    ("test", "rename"): _test_rename,
+    ("test", "add-fragen"): _test_add_fragen,
+    ("test", "set-fragen"): _test_set_fragen,
+}
+
+
+_WORT = re.compile(r"""\s*(?:"([^"\\]*)"|'([^']*)'|([^\s"'\\#]+))(?=\s|$)""")
+# ein Wort: "in Anführungszeichen", 'so' oder ohne Leerzeichen
+
+
+def _woerter(zeile):
+    """
+    Zerlegt eine Zeile wie die Shell. Der einfache Fall (Wörter und ganze
+    "..."/'...') geht per Regex, alles andere (\\, #, a"b") über shlex,
+    das ist ~10x langsamer.
+    """
+
+    teile = []
+    pos = 0
+    ende = len(zeile.rstrip())
+    while pos < ende:
+        m = _WORT.match(zeile, pos)
+        if m is None:
+            return shlex.split(zeile, comments=True)
+        a, b, c = m.groups()
+        teile.append(a if a is not None else b if b is not None else c)
+        pos = m.end()
+    return teile
+
+
+def _zerlegen(zeile, variablen):
+    """
+    Macht aus einer Zeile (ziel, name, befehl, args).
+    ziel = Variablenname bei "name = ...", sonst None
+    """
+
+    teile = _woerter(zeile)
+    ziel = None
+    if len(teile) >= 2 and teile[1] == "=":
+        ziel = teile[0]
+        if not ziel.isidentifier():
+            raise ValueError(f"Ungültiger Variablenname: {ziel!r}")
+        teile = teile[2:]
+
+    if len(teile) < 2:
+        raise ValueError("Unvollständiger Befehl")
+
+    name = f"{teile[0]} {teile[1]}"
+    befehl = BEFEHLE.get((teile[0], teile[1]))
+    if befehl is None:
+        erlaubt = ", ".join(" ".join(k) for k in BEFEHLE)
+        raise ValueError(f"Unbekannter Befehl '{name}' (erlaubt: {erlaubt})")
+
+    args = []
+    for t in teile[2:]:
+        if t.startswith("$"):
+            if t[1:] not in variablen:
+                raise ValueError(f"Variable {t} ist noch nicht gesetzt")
+            t = str(variablen[t[1:]])
+        args.append(t)
+
+    return ziel, name, befehl, args
+
+
+def stapel_ausfuehren(zeilen, blockgroesse=BLOCKGROESSE, fortschritt=None):
+    """
+    Führt alle Befehle aus `zeilen` (Datei, Liste, stdin, ...) aus.
+
+    blockgroesse: 0 = alles in einer Transaktion, sonst COMMIT alle N Befehle
+    fortschritt:  optionale Funktion fortschritt(anzahl) nach jedem Block
+
+    Rückgabe: {"befehle": n, "sekunden": s, "pro_befehl": {"frage add": n, ...}, "bloecke": n}
+    Bei einem Fehler: StapelFehler (der aktuelle Block ist zurückgerollt).
+    """
+
+    start = time.perf_counter()
+    variablen = {}
+    zaehler = Counter()
+    gespeichert = 0
+    bloecke = 0
+
+    quelle = enumerate(zeilen, start=1)
+    fertig = False
+
+    while not fertig:
+        im_block = Counter()
+        # Fehler im with-Block -> transaktion() macht ROLLBACK (nur dieser Block)
+        with transaktion():
+            for nr, zeile in quelle:
+                if not zeile.strip() or zeile.lstrip().startswith("#"):
+                    continue
+                try:
+                    ziel, name, befehl, args = _zerlegen(zeile, variablen)
+                    ergebnis = befehl(args)
+                except Exception as e:
+                    raise StapelFehler(nr, zeile.rstrip("\n"), str(e) or type(e).__name__, gespeichert) from e
+
+                if ziel is not None:
+                    variablen[ziel] = ergebnis
+                im_block[name] += 1
+                if blockgroesse and im_block.total() >= blockgroesse:
+                    break
+            else:
+                fertig = True
+
+        # Block ist COMMITet -> erst jetzt zählen seine Befehle
+        zaehler.update(im_block)
+        gespeichert += im_block.total()
+        if im_block:
+            bloecke += 1
+            if fortschritt is not None:
+                fortschritt(gespeichert)
+
+    return {
+        "befehle": gespeichert,
+        "sekunden": time.perf_counter() - start,
+        "pro_befehl": dict(zaehler),
+        "bloecke": bloecke,
+    }
+
+
+def bericht_ausgeben(bericht):
+    sek = bericht["sekunden"]
+    n = bericht["befehle"]
+    tempo = n / sek if sek > 0 else 0
+    print(f"✅ {n} Befehle in {bericht['bloecke']} Transaktion(en), {sek:.2f} s ({tempo:.0f} Befehle/s)")
+    for name, anzahl in sorted(bericht["pro_befehl"].items()):
+        print(f"   {name}: {anzahl}")
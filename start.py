@@ -3,22 +3,32 @@
 #
 # Für dumme:
 # - Wenn du "python start.py" ausführst, startet dieses Menü.
+# - Mit Befehl (z.B. "python start.py test show 12 --json") gibt es kein Menü,
+#   nur diesen einen Befehl (siehe kommandozeile.py).
 # - Das Menü ruft Funktionen aus kategorien.py / fragen.py / tests.py auf.
 
-from kategorien import alle_kategorien, kategorie_anlegen, kategorie_name
+from kategorien import kategorie_anlegen, kategorie_name, kategorien_seite
 from fragen import (
-    fragen_von_kategorie,
+    fragen_suchen,
+    fragen_von_kategorie_seite,
     frage_anlegen,
     frage_bearbeiten_mit_editor,
+    kategorie_fragen_bearbeiten,
 )
 from tests import (
-    alle_tests,
     test_anlegen,
     test_bearbeiten_mit_editor,
     test_anzeigen,
-    frage_zu_test,
+    tests_seite,
+    fragen_zu_test,
+    test_fragen_bearbeiten,
 )
 
+
+SEITENGROESSE = 20
+# So viele Zeilen zeigen die Listen auf einmal (danach: blättern).
+
+
 def eingabe(text):
     """
     Eingabe lesen und kaputte Unicode-Zeichen ersetzen (damit SQLite nicht crasht).
@@ -55,18 +65,78 @@ def menu_anzeigen():
         "8) Test bearbeiten (öffnet nvim)\n"
         "9) Fragen zu Test hinzufügen\n"
         "10) Test anzeigen (mit Fragen)\n"
+        "11) Fragen importieren (CSV/JSONL/Text)\n"
+        "12) Exportieren (Katalog/Kategorie/Test)\n"
+        "13) Fragen suchen (Volltext)\n"
+        "14) Test zufällig erzeugen\n"
+        "15) Doppelte Fragen finden\n"
+        "16) SQL-Messung (an/aus, Bericht)\n"
+        "17) Viele Fragen bearbeiten (Kategorie/Test, ein nvim)\n"
+        "18) Test drucken (HTML/Markdown/LaTeX)\n"
+        "19) DB im Arbeitsspeicher (an/aus, prüfen)\n"
+        "20) Statistik (Nutzung, Kategorien, nie benutzte Fragen)\n"
+        "21) Abgleich mit anderer DB (Änderungen exportieren/importieren)\n"
         "0) Ende\n"
     )
 
 
+def blaettern(hole_seite, schluessel, zeile_ausgeben, groesse=SEITENGROESSE):
+    """
+    Zeigt eine Liste seitenweise an (n = nächste, v = vorherige, leer = fertig).
+
+    Für dumme:
+    - hole_seite(start_schluessel, limit) holt EINE Seite aus der DB.
+    - schluessel(zeile) sagt, wo die nächste Seite anfängt (z.B. die ID).
+    - Wir merken uns die Start-Schlüssel der schon gezeigten Seiten in
+      einem Stapel. "v" nimmt einfach den vorherigen Start-Schlüssel.
+    - Die erste Seite ist dadurch sofort da, egal wie lang die Liste ist.
+
+    Rückgabe: Anzahl Zeilen auf der ersten Seite (0 = Liste ist leer)
+    """
+
+    stapel = [None]
+    erste_anzahl = None
+
+    while True:
+        # Eine Zeile mehr holen, damit wir wissen, ob es noch weitergeht
+        seite = hole_seite(stapel[-1], groesse + 1)
+        weiter = len(seite) > groesse
+        seite = seite[:groesse]
+
+        if erste_anzahl is None:
+            erste_anzahl = len(seite)
+            if erste_anzahl == 0:
+                return 0
+
+        for zeile in seite:
+            zeile_ausgeben(zeile)
+
+        optionen = []
+        if weiter:
+            optionen.append("n=nächste")
+        if len(stapel) > 1:
+            optionen.append("v=vorherige")
+        if not optionen:
+            return erste_anzahl
+
+        wahl = eingabe(f"  -- Seite {len(stapel)} ({', '.join(optionen)}, leer=weiter): ").lower()
+        if wahl == "n" and weiter:
+            stapel.append(schluessel(seite[-1]))
+        elif wahl == "v" and len(stapel) > 1:
+            stapel.pop()
+        else:
+            return erste_anzahl
+
+
 def aktion_kategorien_anzeigen():
-    kats = alle_kategorien()
-    if not kats:
-        print("Keine Kategorien vorhanden.")
-        return
     print("\nKategorien:")
-    for cid, name in kats:
-        print(f"  {cid}: {name}")
+    n = blaettern(
+        kategorien_seite,
+        lambda row: row[1],  # weiter nach dem Namen
+        lambda row: print(f"  {row[0]}: {row[1]}"),
+    )
+    if n == 0:
+        print("Keine Kategorien vorhanden.")
 
 
 def aktion_kategorie_anlegen():
@@ -93,14 +163,14 @@ def aktion_fragen_anzeigen():
         print("Diese Kategorie-ID gibt es nicht.")
         return
 
-    fragen = fragen_von_kategorie(cid)
     print(f"\nFragen in Kategorie '{name}':")
-    if not fragen:
+    n = blaettern(
+        lambda nach_id, limit: fragen_von_kategorie_seite(cid, nach_id, limit),
+        lambda row: row[0],  # weiter nach der ID
+        lambda row: print(f"  {row[0]}: {row[1]}"),
+    )
+    if n == 0:
         print("  (keine)")
-        return
-
-    for qid, text in fragen:
-        print(f"  {qid}: {text}")
 
 
 def aktion_frage_anlegen():
@@ -120,12 +190,20 @@ def aktion_frage_anlegen():
     text = eingabe("Fragetext: ")
     loesung = eingabe("Lösung (optional): ")
 
+    from duplikate import NEBENBEI_MAX, index_aktualisieren, wahrscheinliche_duplikate
+
+    index_aktualisieren(max_zeilen=NEBENBEI_MAX)  # nicht die ganze Bank nach einem Import
+    aehnlich = wahrscheinliche_duplikate(text)  # VOR dem Anlegen (sonst findet sie sich selbst)
+
     qid = frage_anlegen(text, loesung, cid)
     if qid is None:
         print("Keine Frage angelegt.")
         return
 
     print(f"✅ Frage angelegt, ID: {qid}")
+    if aehnlich:
+        liste = ", ".join(f"{andere} ({a:.0%})" for andere, a in aehnlich)
+        print(f"⚠️  Wahrscheinlich doppelt, ähnliche Frage(n): {liste}")
 
 
 def aktion_frage_bearbeiten():
@@ -138,17 +216,35 @@ def aktion_frage_bearbeiten():
     frage_bearbeiten_mit_editor(int(qid))
 
 
-def aktion_tests_anzeigen():
-    tests = alle_tests()
-    if not tests:
-        print("Keine Tests vorhanden.")
-        return
+def aktion_fragen_sammel_bearbeiten():
+    """
+    Für dumme:
+    - Alle Fragen einer Kategorie (oder eines Tests) kommen in EINE Datei.
+    - Einmal nvim, alles ändern, speichern -> nur geänderte Fragen werden gespeichert.
+    """
 
-    print("\nTests (neueste zuerst):")
-    for tid, title, date in tests:
+    was = eingabe("Welche Fragen? (k=Kategorie, t=Test, leer=Abbruch): ").lower()
+    if was == "k":
+        aktion_kategorien_anzeigen()
+        kategorie_fragen_bearbeiten(eingabe_int("Kategorie-ID: "))
+    elif was == "t":
+        aktion_tests_anzeigen()
+        test_fragen_bearbeiten(eingabe_int("Test-ID: "))
+    elif was != "":
+        print("Ungültige Auswahl.")
+
+
+def aktion_tests_anzeigen():
+    def ausgeben(row):
+        tid, title, date = row
         d = date if date else "-"
         print(f"  {tid}: {title} ({d})")
 
+    print("\nTests (neueste zuerst):")
+    n = blaettern(tests_seite, lambda row: row[0], ausgeben)
+    if n == 0:
+        print("Keine Tests vorhanden.")
+
 
 def aktion_test_anlegen():
     title = eingabe("Test-Titel: ")
@@ -203,13 +299,24 @@ def aktion_fragen_zu_test():
         print("Keine IDs eingegeben.")
         return
 
+    ids = []
     for p in parts:
         if not p.isdigit():
             print(f"Ungültige ID übersprungen: {p}")
             continue
-        frage_zu_test(tid, int(p))
+        ids.append(int(p))
+
+    # Alle auf einmal (eine Transaktion statt einem COMMIT pro ID)
+    ergebnis = fragen_zu_test(tid, ids)
+    if ergebnis is None:
+        print("Diese Test-ID gibt es nicht.")
+        return
 
-    print("✅ Fragen zum Test hinzugefügt.")
+    print(f"✅ {len(ergebnis['hinzugefuegt'])} Frage(n) zum Test hinzugefügt.")
+    if ergebnis["schon_drin"]:
+        print(f"   Schon im Test: {' '.join(str(x) for x in ergebnis['schon_drin'])}")
+    if ergebnis["unbekannt"]:
+        print(f"   Unbekannte IDs: {' '.join(str(x) for x in ergebnis['unbekannt'])}")
 
 
 def aktion_test_anzeigen_mit_fragen():
@@ -244,6 +351,372 @@ def aktion_test_anzeigen_mit_fragen():
         # print(f"     Lösung: {sol}")
 
 
+def aktion_fragen_importieren():
+    """
+    Für dumme:
+    - Du gibst eine Datei an (.csv, .jsonl oder Text im Editor-Format)
+    - Alle Fragen werden in EINER Transaktion gespeichert
+    - Kaputte Zeilen werden übersprungen und am Ende aufgelistet
+    """
+
+    from importieren import bericht_ausgeben, format_erkennen, fragen_importieren
+
+    pfad = eingabe("Datei (leer=Abbruch): ")
+    if pfad == "":
+        return
+
+    standard = None
+    if format_erkennen(pfad) == "text":
+        aktion_kategorien_anzeigen()
+        standard = eingabe("Kategorie-Name für alle Fragen: ")
+        if standard == "":
+            print("Ohne Kategorie kein Import.")
+            return
+
+    pruefen = eingabe("Neue Fragen auf Duplikate prüfen? (j/N): ").lower() == "j"
+
+    def fortschritt(anzahl, fehler):
+        print(f"\r  {anzahl} Fragen gespeichert, {fehler} Fehler ...", end="", flush=True)
+
+    try:
+        bericht = fragen_importieren(
+            pfad, standard_kategorie=standard, fortschritt=fortschritt, duplikate_pruefen=pruefen,
+        )
+    except OSError as e:
+        print(f"Datei kann nicht gelesen werden: {e}")
+        return
+
+    print()
+    bericht_ausgeben(bericht)
+
+
+def aktion_exportieren():
+    """
+    Für dumme:
+    - Leer lassen = ganzer Katalog
+    - Oder Kategorie-ID bzw. Test-ID angeben
+    - Format: jsonl, csv oder markdown
+    """
+
+    from exportieren import FORMATE, exportieren
+
+    was = eingabe("Was exportieren? (k=Kategorie, t=Test, leer=alles): ").lower()
+    kategorie_id = None
+    test_id = None
+
+    if was == "k":
+        aktion_kategorien_anzeigen()
+        kategorie_id = eingabe_int("Kategorie-ID: ")
+    elif was == "t":
+        aktion_tests_anzeigen()
+        test_id = eingabe_int("Test-ID: ")
+    elif was != "":
+        print("Ungültige Auswahl.")
+        return
+
+    format = eingabe(f"Format ({'/'.join(FORMATE)}, leer=jsonl): ").lower() or "jsonl"
+    if format not in FORMATE:
+        print("Unbekanntes Format.")
+        return
+
+    ziel = eingabe("Zieldatei (leer=Bildschirm): ")
+
+    try:
+        n = exportieren(ziel or None, format, kategorie_id=kategorie_id, test_id=test_id)
+    except OSError as e:
+        print(f"Datei kann nicht geschrieben werden: {e}")
+        return
+
+    print(f"\n✅ {n} Fragen exportiert.")
+
+
+def aktion_test_drucken():
+    """
+    Für dumme:
+    - Macht aus einem Test eine Datei zum Ausdrucken.
+    - html: im Browser öffnen und drucken, latex: mit pdflatex übersetzen.
+    """
+
+    from rendern import FORMATE, test_rendern
+
+    aktion_tests_anzeigen()
+    tid = eingabe_int("Test-ID: ")
+
+    format = eingabe(f"Format ({'/'.join(FORMATE)}, leer=html): ").lower() or "html"
+    if format not in FORMATE:
+        print("Unbekanntes Format.")
+        return
+
+    mit_loesung = eingabe("Mit Lösungen? (j/N): ").lower() == "j"
+
+    text = test_rendern(tid, format, mit_loesung)
+    if text is None:
+        print("Diese Test-ID gibt es nicht.")
+        return
+
+    endung = {"html": "html", "markdown": "md", "latex": "tex"}[format]
+    vorschlag = f"test_{tid}{'_loesungen' if mit_loesung else ''}.{endung}"
+    ziel = eingabe(f"Zieldatei (leer={vorschlag}): ") or vorschlag
+
+    try:
+        with open(ziel, "w", encoding="utf-8") as f:
+            f.write(text)
+    except OSError as e:
+        print(f"Datei kann nicht geschrieben werden: {e}")
+        return
+
+    print(f"✅ Gespeichert: {ziel}")
+
+
+def aktion_fragen_suchen():
+    """
+    Für dumme:
+    - Suchwörter eingeben (alle müssen vorkommen, hydr* = Wortanfang)
+    - Optional nur in einer Kategorie suchen
+    """
+
+    query = eingabe("Suchbegriff(e) (leer=Abbruch): ")
+    if query == "":
+        return
+
+    cid = eingabe("Nur in Kategorie-ID (leer=alle): ")
+    if cid != "" and not cid.isdigit():
+        print("Ungültige ID.")
+        return
+
+    treffer = fragen_suchen(query, category_id=int(cid) if cid else None)
+    if not treffer:
+        print("Keine Treffer.")
+        return
+
+    print(f"\n{len(treffer)} Treffer:")
+    for qid, kat_id, frage_snip, loesung_snip in treffer:
+        print(f"  {qid} [{kategorie_name(kat_id)}]: {frage_snip}")
+        if "[" in (loesung_snip or ""):
+            print(f"       Lösung: {loesung_snip}")
+
+
+def aktion_test_generieren():
+    """
+    Für dumme:
+    - Vorgabe z.B. "5 aus Hydraulik, 3 aus Elektrik" (oder Kategorie-IDs)
+    - seed = gleiche Zahl -> gleicher Test (leer = jedes Mal anders)
+    - Fragen aus den letzten N Tests können ausgeschlossen werden
+    """
+
+    from testgenerator import test_generieren
+
+    aktion_kategorien_anzeigen()
+    vorgabe = eingabe("Vorgabe (z.B. 5 aus Hydraulik, 3 aus 2; leer=Abbruch): ")
+    if vorgabe == "":
+        return
+
+    title = eingabe("Test-Titel: ")
+    date = eingabe("Test-Datum (YYYY-MM-DD, optional): ") or None
+
+    seed = eingabe("Seed (Zahl, optional): ")
+    if seed != "" and not seed.lstrip("-").isdigit():
+        print("Seed muss eine Zahl sein.")
+        return
+
+    ohne = eingabe("Fragen aus den letzten N Tests ausschließen (leer=0): ")
+    if ohne != "" and not ohne.isdigit():
+        print("Bitte eine Zahl eingeben.")
+        return
+
+    try:
+        tid, ids = test_generieren(
+            title, date, vorgabe,
+            seed=int(seed) if seed else None,
+            ohne_letzte_tests=int(ohne) if ohne else 0,
+        )
+    except ValueError as e:
+        print(f"Kein Test angelegt: {e}")
+        return
+
+    print(f"✅ Test angelegt, ID: {tid} ({len(ids)} Fragen: {' '.join(str(x) for x in ids)})")
+
+
+def aktion_duplikate():
+    """
+    Für dumme:
+    - Frage-ID eingeben -> ähnliche Fragen zu dieser Frage
+    - leer lassen -> Bericht über ALLE Gruppen von fast gleichen Fragen
+    """
+
+    from duplikate import aehnliche_fragen, duplikat_cluster, index_aktualisieren
+
+    qid = eingabe("Frage-ID (leer=alle Duplikat-Gruppen): ")
+    index_aktualisieren()  # neue/geänderte Fragen nachrechnen
+
+    if qid != "":
+        if not qid.isdigit():
+            print("Ungültige ID.")
+            return
+        treffer = aehnliche_fragen(int(qid))
+        if not treffer:
+            print("Keine ähnlichen Fragen gefunden.")
+            return
+        print("\nÄhnliche Fragen:")
+        for andere, a in treffer:
+            print(f"  {andere} ({a:.0%})")
+        return
+
+    print("Suche Duplikat-Gruppen ...")
+    gruppen = duplikat_cluster()
+    if not gruppen:
+        print("Keine Duplikate gefunden.")
+        return
+
+    print(f"\n{len(gruppen)} Gruppe(n) mit fast gleichen Fragen:")
+    for g in gruppen[:50]:
+        print(f"  {len(g)} Fragen: {' '.join(str(x) for x in g[:20])}{' ...' if len(g) > 20 else ''}")
+    if len(gruppen) > 50:
+        print(f"  ... und {len(gruppen) - 50} weitere")
+
+
+def aktion_messung():
+    """
+    Für dumme:
+    - Messung aus -> einschalten (danach ganz normal weiterarbeiten)
+    - Messung an  -> Bericht anzeigen: welche Abfragen wie lange gedauert haben
+    """
+
+    import messung
+
+    if not messung.ist_an():
+        grenze = eingabe(f"Langsam ab wie vielen ms? (leer={messung.LANGSAM_MS:g}): ")
+        try:
+            messung.einschalten(langsam_ms=float(grenze) if grenze else None)
+        except ValueError:
+            print("Bitte eine Zahl eingeben.")
+            return
+        print(f"✅ Messung ist an. Langsame Abfragen -> {messung.LOGDATEI}")
+        return
+
+    print()
+    messung.bericht_ausgeben()
+    wahl = eingabe("\n(z=zurücksetzen, a=ausschalten, leer=weiter): ").lower()
+    if wahl == "z":
+        messung.zuruecksetzen()
+        print("Zahlen zurückgesetzt.")
+    elif wahl == "a":
+        messung.ausschalten()
+        print("Messung ist aus.")
+
+
+def aktion_speicher():
+    """
+    Für dumme:
+    - Aus -> einschalten: die DB wird in den Arbeitsspeicher kopiert,
+      Lesen geht dann nur noch dort (siehe schnappschuss.py)
+    - An  -> Zahlen anzeigen, Speicher und Datei vergleichen, neu laden, ausschalten
+    """
+
+    import schnappschuss
+
+    if not schnappschuss.ist_an():
+        wahl = eingabe("Schreiben: s=sofort auch auf die Datei, l=später gesammelt (leer=s): ").lower()
+        modus = {"": "sync", "s": "sync", "l": "spaeter"}.get(wahl)
+        if modus is None:
+            print("Ungültige Auswahl.")
+            return
+        schnappschuss.einschalten(modus)
+        print(f"✅ DB liegt im Arbeitsspeicher (Modus: {modus}).")
+        return
+
+    print()
+    schnappschuss.bericht_ausgeben()
+    wahl = eingabe("\n(p=prüfen, n=neu laden, a=ausschalten, leer=weiter): ").lower()
+    try:
+        if wahl == "p":
+            unterschiede = schnappschuss.pruefen()
+            if not unterschiede:
+                print("✅ Speicher und Datei sind gleich.")
+            for tabelle, speicher, datei in unterschiede:
+                print(f"⚠️  {tabelle}: Speicher {speicher[0] if speicher else '-'} Zeilen, "
+                      f"Datei {datei[0] if datei else '-'} Zeilen")
+        elif wahl == "n":
+            schnappschuss.neu_laden()
+            print("✅ Neu geladen.")
+        elif wahl == "a":
+            schnappschuss.ausschalten()
+            print("Speicher-Modus ist aus.")
+    except schnappschuss.SchnappschussFehler as e:
+        print(f"❌ {e}")
+
+
+def aktion_statistik():
+    """
+    Für dumme: alle Zahlen kommen fertig aus question_stats/category_stats
+    (siehe statistik.py), darum ist das auch bei riesigen DBs sofort da.
+    """
+
+    import statistik
+
+    g = statistik.gesamt()
+    print(f"\n{g['fragen']} Fragen, {g['nutzungen']} Nutzungen in Tests, {g['unbenutzt']} nie benutzt.\n")
+
+    print(f"{'Kategorie':24} {'Fragen':>7} {'Nutzung':>8} {'nie':>6} {'Faktor':>7}")
+    for z in statistik.kategorien_statistik():
+        faktor = "-" if z["faktor"] is None else f"{z['faktor']:.2f}"
+        markierung = {"über": "  ⬆ zu oft", "unter": "  ⬇ zu selten"}.get(z["bewertung"], "")
+        print(f"{z['name'][:24]:24} {z['fragen']:7d} {z['nutzungen']:8d} {z['unbenutzt']:6d} {faktor:>7}{markierung}")
+
+    print("\nAm häufigsten benutzt:")
+    for qid, text, n, letzter in statistik.meistbenutzte_fragen(10):
+        print(f"  {qid}: {n}x (zuletzt Test {letzter}) {text[:60]}")
+
+    if g["unbenutzt"] and eingabe("\nNie benutzte Fragen anzeigen? (j/N): ").lower() == "j":
+        blaettern(
+            statistik.unbenutzte_fragen_seite,
+            lambda zeile: zeile[0],
+            lambda zeile: print(f"  {zeile[0]}: [{kategorie_name(zeile[2])}] {zeile[1][:60]}"),
+        )
+
+
+def aktion_abgleich():
+    """
+    Für dumme: B holt die Änderungen von A so:
+    - in B: Stand von A ablesen (steht hier unter "Partner")
+    - in A: e) exportieren, "seit" = dieser Stand
+    - in B: i) importieren
+    """
+
+    import abgleich
+
+    st = abgleich.status()
+    print(f"\nDiese DB: Kennung {st['kennung']}, Änderungen bis {st['seq']}")
+    for kennung, bis, zeitpunkt in st["partner"]:
+        print(f"  Partner {kennung}: übernommen bis {bis} ({zeitpunkt})")
+
+    wahl = eingabe("\n(e=exportieren, i=importieren, leer=zurück): ").lower()
+    try:
+        if wahl == "e":
+            seit = eingabe("Seit (Stand beim Partner, leer=0 = alles): ")
+            if seit and not seit.isdigit():
+                print("Ungültige Zahl.")
+                return
+            datei = eingabe("Datei (leer=delta.gz): ") or "delta.gz"
+            info = abgleich.delta_exportieren(datei, int(seit or 0))
+            print(f"✅ {info['aenderungen']} Änderungen ({info['von']}..{info['bis']}) -> {datei}")
+        elif wahl == "i":
+            datei = eingabe("Datei (leer=delta.gz): ") or "delta.gz"
+            regel = {"": "lokal", "l": "lokal", "f": "fremd", "a": "abbrechen"}.get(
+                eingabe("Bei Konflikt: l=unsere Version behalten, f=fremde nehmen, a=abbrechen (leer=l): ").lower()
+            )
+            if regel is None:
+                print("Ungültige Auswahl.")
+                return
+            abgleich.bericht_ausgeben(abgleich.delta_importieren(datei, regel))
+    except abgleich.AbgleichKonflikt as e:
+        print(f"❌ {e}")
+        for tabelle, lid, grund in e.konflikte[:20]:
+            print(f"  {tabelle} {lid if lid is not None else '-'}: {grund}")
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+
+
 def main():
     """
     Hauptschleife vom Menü.
@@ -276,15 +749,42 @@ def main():
             aktion_fragen_zu_test()
         elif choice == "10":
             aktion_test_anzeigen_mit_fragen()
+        elif choice == "11":
+            aktion_fragen_importieren()
+        elif choice == "12":
+            aktion_exportieren()
+        elif choice == "13":
+            aktion_fragen_suchen()
+        elif choice == "14":
+            aktion_test_generieren()
+        elif choice == "15":
+            aktion_duplikate()
+        elif choice == "16":
+            aktion_messung()
+        elif choice == "17":
+            aktion_fragen_sammel_bearbeiten()
+        elif choice == "18":
+            aktion_test_drucken()
+        elif choice == "19":
+            aktion_speicher()
+        elif choice == "20":
+            aktion_statistik()
+        elif choice == "21":
+            aktion_abgleich()
         else:
             print("Ungültige Auswahl.")
 
 
 if __name__ == "__main__":
+    import sys
+
     # Für dumme:
     # Ctrl+C soll das Programm sauber beenden, ohne Traceback.
     try:
+        if len(sys.argv) > 1:
+            # Befehl angegeben (z.B. "python start.py test show 12") -> kein Menü
+            from kommandozeile import main as befehl_ausfuehren
+            sys.exit(befehl_ausfuehren(sys.argv[1:]))
         main()
     except KeyboardInterrupt:
         print("\nAbbruch (Ctrl+C).")
-
@@ -0,0 +1,173 @@
+# statistik.py
+# Wie oft wurde welche Frage benutzt? Welche Kategorien kommen zu oft / zu
+# selten in Tests vor? Welche Fragen wurden nie benutzt?
+#
+# Für dumme:
+# - Früher hätte jede dieser Fragen ein GROUP BY über ALLE Zeilen von
+#   test_questions und questions gebraucht (bei vielen Tests langsam).
+# - Jetzt stehen die Zahlen fertig in zwei kleinen Tabellen:
+#     question_stats: pro Frage  -> in wie vielen Tests, neuester Test
+#     category_stats: pro Kategorie -> Fragen, Nutzungen, nie benutzte Fragen
+# - Trigger (Migration 6 in datenbank.py) ändern die Zahlen bei JEDEM
+#   INSERT/DELETE/UPDATE mit, egal ob aus dem Menü, Import oder Stapel.
+#   Nachschauen ist dann nur noch ein Zugriff über den Primärschlüssel.
+# - Sollte doch etwas nicht stimmen (z.B. DB von Hand repariert):
+#   neu_berechnen() zählt alles einmal komplett neu.
+
+from datenbank import transaktion, verbindung
+
+
+ABWEICHUNG = 1.5
+# Ab diesem Faktor gilt eine Kategorie als über- bzw. (1/1.5) unterrepräsentiert
+
+
+def frage_statistik(frage_id):
+    """
+    Rückgabe: (anzahl_tests, letzter_test) oder None, wenn es die Frage nicht gibt.
+    letzter_test = ID vom neuesten Test mit dieser Frage (None = nie benutzt)
+    """
+
+    return verbindung().execute(
+        "SELECT anzahl_tests, letzter_test FROM question_stats WHERE question_id = ?;",
+        (frage_id,),
+    ).fetchone()
+
+
+def gesamt():
+    """
+    Rückgabe: {"fragen": n, "nutzungen": n, "unbenutzt": n}
+    (Summe über category_stats = eine Zeile pro Kategorie, nicht pro Frage)
+    """
+
+    fragen, nutzungen, unbenutzt = verbindung().execute(
+        """
+        SELECT IFNULL(SUM(anzahl_fragen), 0), IFNULL(SUM(anzahl_nutzungen), 0),
+               IFNULL(SUM(unbenutzte_fragen), 0)
+        FROM category_stats;
+        """
+    ).fetchone()
+    return {"fragen": fragen, "nutzungen": nutzungen, "unbenutzt": unbenutzt}
+
+
+def kategorien_statistik():
+    """
+    Zahlen pro Kategorie (auch Kategorien ohne Fragen), sortiert nach Name.
+
+    Rückgabe: Liste von Dicts mit
+      id, name, fragen, nutzungen, unbenutzt,
+      anteil_fragen, anteil_nutzungen   (0..1, Anteil an allen)
+      faktor     = anteil_nutzungen / anteil_fragen (1 = genau "fair" benutzt)
+      bewertung  = "über" / "unter" / "" (siehe ABWEICHUNG)
+    """
+
+    rows = verbindung().execute(
+        """
+        SELECT c.id, c.name,
+               IFNULL(s.anzahl_fragen, 0), IFNULL(s.anzahl_nutzungen, 0), IFNULL(s.unbenutzte_fragen, 0)
+        FROM categories c
+        LEFT JOIN category_stats s ON s.category_id = c.id
+        ORDER BY c.name;
+        """
+    ).fetchall()
+
+    alle_fragen = sum(r[2] for r in rows)
+    alle_nutzungen = sum(r[3] for r in rows)
+
+    ergebnis = []
+    for cid, name, fragen, nutzungen, unbenutzt in rows:
+        anteil_fragen = fragen / alle_fragen if alle_fragen else 0.0
+        anteil_nutzungen = nutzungen / alle_nutzungen if alle_nutzungen else 0.0
+        faktor = anteil_nutzungen / anteil_fragen if anteil_fragen else None
+        bewertung = ""
+        if faktor is not None and alle_nutzungen:
+            if faktor >= ABWEICHUNG:
+                bewertung = "über"
+            elif faktor <= 1 / ABWEICHUNG:
+                bewertung = "unter"
+        ergebnis.append({
+            "id": cid,
+            "name": name,
+            "fragen": fragen,
+            "nutzungen": nutzungen,
+            "unbenutzt": unbenutzt,
+            "anteil_fragen": anteil_fragen,
+            "anteil_nutzungen": anteil_nutzungen,
+            "faktor": faktor,
+            "bewertung": bewertung,
+        })
+    return ergebnis
+
+
+def meistbenutzte_fragen(limit=10):
+    """
+    Die am häufigsten benutzten Fragen (über idx_question_stats_anzahl, von hinten).
+    Rückgabe: Liste von (id, question_text, anzahl_tests, letzter_test)
+    """
+
+    return verbindung().execute(
+        """
+        SELECT q.id, q.question_text, s.anzahl_tests, s.letzter_test
+        FROM (
+            -- Zuerst die Top-N aus dem Index, DANACH die Texte (sonst liest SQLite alle Fragen)
+            SELECT question_id, anzahl_tests, letzter_test
+            FROM question_stats
+            WHERE anzahl_tests > 0
+            ORDER BY anzahl_tests DESC, question_id DESC
+            LIMIT ?
+        ) s
+        JOIN questions q ON q.id = s.question_id
+        ORDER BY s.anzahl_tests DESC, s.question_id DESC;
+        """,
+        (limit,),
+    ).fetchall()
+
+
+def unbenutzte_fragen_seite(nach_id=None, limit=50):
+    """
+    Eine Seite nie benutzter Fragen (Keyset-Pagination über id).
+    Liest nur die Einträge mit anzahl_tests = 0 im Index, nicht alle Fragen.
+
+    Rückgabe: Liste von (id, question_text, category_id)
+    """
+
+    return verbindung().execute(
+        """
+        SELECT q.id, q.question_text, q.category_id
+        FROM question_stats s
+        JOIN questions q ON q.id = s.question_id
+        WHERE s.anzahl_tests = 0 AND s.question_id > ?
+        ORDER BY s.question_id
+        LIMIT ?;
+        """,
+        (nach_id if nach_id is not None else -1, limit),
+    ).fetchall()
+
+
+def neu_berechnen():
+    """
+    Zählt alle Statistiken komplett neu (wie beim ersten Anlegen in Migration 6).
+    Rückgabe: Anzahl Fragen
+    """
+
+    with transaktion() as conn:
+        conn.execute("DELETE FROM question_stats;")
+        conn.execute("DELETE FROM category_stats;")
+        conn.execute(
+            """
+            INSERT INTO question_stats (question_id, anzahl_tests, letzter_test)
+            SELECT q.id, COUNT(tq.test_id), MAX(tq.test_id)
+            FROM questions q
+            LEFT JOIN test_questions tq ON tq.question_id = q.id
+            GROUP BY q.id;
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO category_stats (category_id, anzahl_fragen, anzahl_nutzungen, unbenutzte_fragen)
+            SELECT q.category_id, COUNT(*), SUM(s.anzahl_tests), SUM(s.anzahl_tests = 0)
+            FROM questions q
+            JOIN question_stats s ON s.question_id = q.id
+            GROUP BY q.category_id;
+            """
+        )
+        return conn.execute("SELECT COUNT(*) FROM question_stats;").fetchone()[0]
@@ -0,0 +1,196 @@
+# testgenerator.py
+# Erzeugt einen Test mit zufällig gezogenen Fragen.
+#
+# Für dumme:
+# - Vorgabe z.B. "5 aus Hydraulik, 3 aus Elektrik"
+#   = 5 zufällige Fragen aus Kategorie Hydraulik + 3 aus Elektrik.
+#   Statt dem Namen geht auch die Kategorie-ID ("5 aus 2").
+# - Optional: keine Fragen, die in den letzten N Tests schon vorkamen.
+# - Mit gleichem seed kommt bei gleicher DB genau derselbe Test raus.
+#
+# Warum nicht "ORDER BY RANDOM() LIMIT 5"?
+# - Dafür müsste SQLite JEDE Frage der Kategorie lesen und sortieren.
+#   Bei 100.000 Fragen ist das viel zu langsam für hunderte Tests.
+#
+# Wie wir ziehen:
+# 1) ID-Bereich: kleinste und größte ID der Kategorie holen (über den Index,
+#    sofort). Dann zufällige Zahl im Bereich würfeln und nachschauen, ob es
+#    genau diese Frage in der Kategorie gibt (Primärschlüssel, sofort).
+#    Wenn nicht: nochmal würfeln. Jede Frage hat so die gleiche Chance.
+# 2) Liegen die IDs zu weit verstreut (zu viele Fehlversuche), nehmen wir
+#    Reservoir-Sampling: einmal durch den Index der Kategorie laufen
+#    (nur IDs, nichts wird komplett in den Speicher geladen).
+
+import random
+import re
+
+from datenbank import transaktion, verbindung
+from kategorien import kategorie_id, kategorie_name
+from tests import test_anlegen, test_fragen_setzen
+
+
+VERSUCHE_PRO_FRAGE = 30
+# So oft würfeln wir pro gesuchter Frage, bevor wir auf Reservoir-Sampling umsteigen.
+
+
+def vorgabe_parsen(text):
+    """
+    Macht aus "5 aus Hydraulik, 3 aus 2" eine Liste [(kategorie_id, anzahl), ...].
+    Unbekannte Kategorien oder kaputte Teile -> ValueError mit Erklärung.
+    """
+
+    vorgabe = []
+    for teil in re.split(r"[,;\n]", text):
+        teil = teil.strip()
+        if teil == "":
+            continue
+
+        m = re.match(r"^(\d+)\s+aus\s+(.+)$", teil, re.IGNORECASE)
+        if m is None:
+            raise ValueError(f"Kann '{teil}' nicht lesen (Format: <Anzahl> aus <Kategorie>)")
+
+        anzahl = int(m.group(1))
+        kat = m.group(2).strip()
+
+        cid = kategorie_id(kat)
+        if cid is None and kat.isdigit() and kategorie_name(int(kat)) is not None:
+            cid = int(kat)
+        if cid is None:
+            raise ValueError(f"Kategorie '{kat}' gibt es nicht")
+
+        vorgabe.append((cid, anzahl))
+
+    if not vorgabe:
+        raise ValueError("Leere Vorgabe")
+    return vorgabe
+
+
+def zuletzt_benutzte_fragen(letzte_tests):
+    """
+    IDs aller Fragen, die in den letzten `letzte_tests` Tests vorkommen.
+    """
+
+    if not letzte_tests:
+        return set()
+
+    conn = verbindung()
+    rows = conn.execute(
+        """
+        SELECT tq.question_id
+        FROM (SELECT id FROM tests ORDER BY id DESC LIMIT ?) t
+        JOIN test_questions tq ON tq.test_id = t.id;
+        """,
+        (int(letzte_tests),),
+    )
+    return {int(r[0]) for r in rows}
+
+
+def _reservoir(conn, category_id, anzahl, verboten, rng):
+    """
+    Reservoir-Sampling (Algorithmus R): zieht `anzahl` zufällige IDs aus
+    einem Strom, ohne den Strom komplett zu speichern.
+    """
+
+    auswahl = []
+    gesehen = 0
+    cur = conn.execute(
+        "SELECT id FROM questions WHERE category_id = ? ORDER BY id;", (category_id,)
+    )
+    for (qid,) in cur:
+        if qid in verboten:
+            continue
+        gesehen += 1
+        if len(auswahl) < anzahl:
+            auswahl.append(qid)
+        else:
+            j = rng.randrange(gesehen)
+            if j < anzahl:
+                auswahl[j] = qid
+    return auswahl
+
+
+def stichprobe(category_id, anzahl, verboten=(), rng=None):
+    """
+    Zieht `anzahl` verschiedene zufällige Frage-IDs aus einer Kategorie.
+    IDs in `verboten` werden nie gezogen.
+
+    Rückgabe: Liste von IDs (kann kürzer sein, wenn es nicht genug Fragen gibt)
+    """
+
+    rng = rng or random.Random()
+    verboten = set(verboten)
+    if anzahl <= 0:
+        return []
+
+    conn = verbindung()
+
+    # MIN/MAX über den Index (category_id, id) -> direkt, ohne Scan
+    lo, hi = conn.execute(
+        "SELECT MIN(id), MAX(id) FROM questions WHERE category_id = ?;", (category_id,)
+    ).fetchone()
+    if lo is None:
+        return []
+
+    auswahl = []
+    schon = set(verboten)
+    versuche = VERSUCHE_PRO_FRAGE * anzahl
+
+    while len(auswahl) < anzahl and versuche > 0:
+        versuche -= 1
+        kandidat = rng.randint(lo, hi)
+        if kandidat in schon:
+            continue
+        treffer = conn.execute(
+            "SELECT 1 FROM questions WHERE id = ? AND category_id = ?;",
+            (kandidat, category_id),
+        ).fetchone()
+        if treffer is not None:
+            auswahl.append(kandidat)
+            schon.add(kandidat)
+
+    if len(auswahl) < anzahl:
+        # IDs zu verstreut (oder Kategorie fast leer) -> einmal durch den Index.
+        # Der Rest wird aus allen noch nicht gezogenen IDs gezogen.
+        auswahl += _reservoir(conn, category_id, anzahl - len(auswahl), schon, rng)
+
+    return auswahl
+
+
+def test_generieren(titel, datum, vorgabe, seed=None, ohne_letzte_tests=0):
+    """
+    Legt einen neuen Test an und füllt ihn mit zufälligen Fragen.
+
+    Parameter:
+    - vorgabe: Text ("5 aus Hydraulik, 3 aus 2") oder Liste [(kategorie_id, anzahl), ...]
+    - seed: gleiche Zahl -> gleicher Test (bei gleicher DB)
+    - ohne_letzte_tests: Fragen aus den letzten N Tests werden nicht genommen
+
+    Rückgabe: (test_id, [frage_ids])
+    ValueError, wenn die Vorgabe kaputt ist oder es nicht genug Fragen gibt.
+    """
+
+    if isinstance(vorgabe, str):
+        vorgabe = vorgabe_parsen(vorgabe)
+
+    rng = random.Random(seed)
+
+    with transaktion():
+        verboten = zuletzt_benutzte_fragen(ohne_letzte_tests)
+
+        ids = []
+        for category_id, anzahl in vorgabe:
+            gezogen = stichprobe(category_id, anzahl, verboten, rng)
+            if len(gezogen) < anzahl:
+                raise ValueError(
+                    f"Kategorie '{kategorie_name(category_id)}' hat nur {len(gezogen)} "
+                    f"passende Fragen (gewünscht: {anzahl})"
+                )
+            ids += gezogen
+            verboten.update(gezogen)  # gleiche Frage nicht zweimal (falls Kategorie doppelt)
+
+        test_id = test_anlegen(titel, datum)
+        if test_id is None:
+            raise ValueError("Titel darf nicht leer sein")
+        test_fragen_setzen(test_id, ids)
+
+    return test_id, ids
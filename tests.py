@@ -4,11 +4,11 @@
 # Ein "Test" ist z.B. "Schularbeit 1" am Datum X.
 # Ein Test hat viele Fragen -> das machen wir über die Tabelle test_questions (m:n)
 
+import json         # Für ID-Listen als EIN Parameter (json_each)
 import os           # Für EDITOR-Variable (z.B. nvim)
-import subprocess   # Um nvim zu starten
-import tempfile     # Für eine temporäre Datei zum Editieren
 
-from datenbank import verbindung
+from datenbank import VersionsKonflikt, verbindung, transaktion, version_pruefen
+from fragen import fragen_bearbeiten_mit_editor
 
 
 def alle_tests():
@@ -17,32 +17,74 @@ def alle_tests():
     Rückgabe: Liste von (id, title, test_date)
     """
 
-    conn = verbindung()   # DB öffnen
+    conn = verbindung()   # DB-Verbindung holen (bleibt offen)
     cur = conn.cursor()   # Cursor holen
 
     cur.execute("SELECT id, title, test_date FROM tests ORDER BY id DESC;")
     daten = cur.fetchall()
 
-    conn.close()          # DB wieder schließen
     return daten
 
 
-def test_holen(test_id):
+def tests_seite(vor_id=None, limit=50):
+    """
+    Eine Seite Tests, neueste zuerst (Keyset-Pagination über id DESC).
+
+    vor_id=None -> erste Seite, sonst: Tests mit id < vor_id
+    Rückgabe: Liste von (id, title, test_date)
+    """
+
+    conn = verbindung()
+
+    if vor_id is None:
+        cur = conn.execute(
+            "SELECT id, title, test_date FROM tests ORDER BY id DESC LIMIT ?;", (limit,)
+        )
+    else:
+        cur = conn.execute(
+            "SELECT id, title, test_date FROM tests WHERE id < ? ORDER BY id DESC LIMIT ?;",
+            (vor_id, limit),
+        )
+
+    return cur.fetchall()
+
+
+def alle_tests_iter(seitengroesse=500):
+    """
+    Wie alle_tests(), aber als Generator (Seite für Seite).
+    """
+
+    vor = None
+    while True:
+        seite = tests_seite(vor, seitengroesse)
+        yield from seite
+        if len(seite) < seitengroesse:
+            return
+        vor = seite[-1][0]
+
+
+def test_holen(test_id, mit_version=False):
     """
     Holt einen Test aus der DB.
     Rückgabe: (id, title, test_date) oder None
+    mit_version=True -> (id, title, test_date, version) (für test_update(..., version=...))
     """
 
     conn = verbindung()
     cur = conn.cursor()
 
-    cur.execute(
-        "SELECT id, title, test_date FROM tests WHERE id = ? LIMIT 1;",
-        (test_id,),
-    )
+    if mit_version:
+        cur.execute(
+            "SELECT id, title, test_date, version FROM tests WHERE id = ? LIMIT 1;",
+            (test_id,),
+        )
+    else:
+        cur.execute(
+            "SELECT id, title, test_date FROM tests WHERE id = ? LIMIT 1;",
+            (test_id,),
+        )
     row = cur.fetchone()
 
-    conn.close()
     return row
 
 
@@ -61,24 +103,26 @@ def test_anlegen(title, test_date):
         if test_date == "":
             test_date = None
 
-    conn = verbindung()
-    cur = conn.cursor()
+    with transaktion() as conn:
+        cur = conn.cursor()
 
-    cur.execute(
-        "INSERT INTO tests (title, test_date) VALUES (?, ?);",
-        (title, test_date),
-    )
+        cur.execute(
+            "INSERT INTO tests (title, test_date) VALUES (?, ?);",
+            (title, test_date),
+        )
 
-    new_id = cur.lastrowid  # SQLite gibt uns die neue ID
-    conn.commit()
-    conn.close()
+        new_id = cur.lastrowid  # SQLite gibt uns die neue ID
 
     return int(new_id)
 
 
-def test_update(test_id, new_title, new_test_date):
+def test_update(test_id, new_title, new_test_date, version=None):
     """
     Aktualisiert Titel und Datum eines Tests.
+
+    version = die Version beim Lesen (test_holen(..., mit_version=True)).
+    Passt sie nicht mehr -> VersionsKonflikt, nichts wird überschrieben.
+    Mit version zählt die Version immer hoch (auch wenn Titel/Datum gleich bleiben).
     """
 
     new_title = new_title.strip()
@@ -90,16 +134,19 @@ def test_update(test_id, new_title, new_test_date):
         if new_test_date == "":
             new_test_date = None
 
-    conn = verbindung()
-    cur = conn.cursor()
-
-    cur.execute(
-        "UPDATE tests SET title = ?, test_date = ? WHERE id = ?;",
-        (new_title, new_test_date, test_id),
-    )
+    with transaktion() as conn:
+        if version is None:
+            conn.execute(
+                "UPDATE tests SET title = ?, test_date = ? WHERE id = ?;",
+                (new_title, new_test_date, test_id),
+            )
+        else:
+            cur = conn.execute(
+                "UPDATE tests SET title = ?, test_date = ?, version = version + 1 WHERE id = ? AND version = ?;",
+                (new_title, new_test_date, test_id, version),
+            )
+            version_pruefen(cur, "tests", test_id, version)
 
-    conn.commit()
-    conn.close()
     return True
 
 
@@ -114,16 +161,72 @@ def frage_zu_test(test_id, question_id):
       Wenn es schon existiert, passiert einfach nichts.
     """
 
-    conn = verbindung()
-    cur = conn.cursor()
+    with transaktion() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO test_questions (test_id, question_id) VALUES (?, ?);",
+            (test_id, question_id),
+        )
 
-    cur.execute(
-        "INSERT OR IGNORE INTO test_questions (test_id, question_id) VALUES (?, ?);",
-        (test_id, question_id),
-    )
 
-    conn.commit()
-    conn.close()
+def fragen_zu_test(test_id, question_ids):
+    """
+    Fügt VIELE Fragen auf einmal zu einem Test hinzu (eine Transaktion).
+
+    Für dumme:
+    - frage_zu_test() in einer Schleife = ein COMMIT pro Frage.
+    - Hier prüfen wir alle IDs mit EINER Abfrage und speichern alle neuen
+      mit executemany() in EINER Transaktion.
+    - Die ID-Liste geben wir als JSON-Text an SQLite, json_each() macht
+      daraus wieder eine "Tabelle". So braucht es nicht 500 Fragezeichen.
+
+    Rückgabe: Dict mit Listen (Reihenfolge wie eingegeben, ohne Duplikate)
+      {"hinzugefuegt": [...], "schon_drin": [...], "unbekannt": [...]}
+    oder None, wenn es den Test nicht gibt.
+    """
+
+    ids = []
+    seen = set()
+    for qid in question_ids:
+        qid = int(qid)
+        if qid not in seen:
+            seen.add(qid)
+            ids.append(qid)
+
+    ergebnis = {"hinzugefuegt": [], "schon_drin": [], "unbekannt": []}
+
+    with transaktion() as conn:
+        if conn.execute("SELECT 1 FROM tests WHERE id = ?;", (test_id,)).fetchone() is None:
+            return None
+
+        if not ids:
+            return ergebnis
+
+        # EINE Abfrage: welche IDs gibt es, und welche sind schon im Test?
+        rows = conn.execute(
+            """
+            SELECT j.value, tq.question_id IS NOT NULL
+            FROM json_each(?) j
+            JOIN questions q ON q.id = j.value
+            LEFT JOIN test_questions tq ON tq.test_id = ? AND tq.question_id = j.value;
+            """,
+            (json.dumps(ids), test_id),
+        ).fetchall()
+        vorhanden = {int(qid): bool(drin) for qid, drin in rows}
+
+        for qid in ids:
+            if qid not in vorhanden:
+                ergebnis["unbekannt"].append(qid)
+            elif vorhanden[qid]:
+                ergebnis["schon_drin"].append(qid)
+            else:
+                ergebnis["hinzugefuegt"].append(qid)
+
+        conn.executemany(
+            "INSERT OR IGNORE INTO test_questions (test_id, question_id) VALUES (?, ?);",
+            [(test_id, qid) for qid in ergebnis["hinzugefuegt"]],
+        )
+
+    return ergebnis
 
 
 def fragen_ids_von_test(test_id):
@@ -141,8 +244,6 @@ def fragen_ids_von_test(test_id):
     )
     rows = cur.fetchall()
 
-    conn.close()
-
     # rows sieht so aus: [(1,), (5,), (9,)]
     # darum bauen wir eine einfache Liste daraus
     return [int(r[0]) for r in rows]
@@ -169,13 +270,14 @@ def test_anzeigen(test_id):
         FROM test_questions tq
         JOIN questions q ON q.id = tq.question_id
         WHERE tq.test_id = ?
-        ORDER BY q.id;
+        -- tq.question_id == q.id, aber so kann SQLite direkt die Reihenfolge
+        -- vom PRIMARY KEY (test_id, question_id) nehmen (kein extra Sortieren).
+        ORDER BY tq.question_id;
         """,
         (test_id,),
     )
 
     questions = cur.fetchall()
-    conn.close()
 
     return test_row, questions
 
@@ -210,35 +312,49 @@ def test_fragen_setzen(test_id, neue_frage_ids):
     Das heißt:
     - Fragen, die fehlen -> werden hinzugefügt
     - Fragen, die zu viel sind -> werden entfernt
-    """
 
-    # 1) Aktueller Zustand
-    aktuell = set(fragen_ids_von_test(test_id))
-    neu = set(neue_frage_ids)
+    Für dumme:
+    - Früher: pro Frage ein eigenes INSERT/DELETE und viele COMMITs.
+    - Jetzt: EIN DELETE und EIN INSERT ... SELECT in EINER Transaktion.
+      Entweder ist der Test danach komplett neu gesetzt, oder gar nicht.
+    - Die Liste geht wieder als JSON-Text an SQLite (json_each).
 
-    # 2) Was muss dazu?
-    hinzufuegen = neu - aktuell
-
-    # 3) Was muss weg?
-    entfernen = aktuell - neu
-
-    # 4) Änderungen durchführen
-    # Hinzufügen
-    for qid in hinzufuegen:
-        frage_zu_test(test_id, qid)
+    Rückgabe: Liste der IDs, die es als Frage nicht gibt (werden ignoriert)
+    """
 
-    # Entfernen
-    conn = verbindung()
-    cur = conn.cursor()
+    ids = json.dumps(sorted({int(x) for x in neue_frage_ids}))
+
+    with transaktion() as conn:
+        # Alles weg, was NICHT in der neuen Liste steht
+        conn.execute(
+            """
+            DELETE FROM test_questions
+            WHERE test_id = ?
+              AND question_id NOT IN (SELECT value FROM json_each(?));
+            """,
+            (test_id, ids),
+        )
 
-    for qid in entfernen:
-        cur.execute(
-            "DELETE FROM test_questions WHERE test_id = ? AND question_id = ?;",
-            (test_id, qid),
+        # Alles dazu, was fehlt (nur Fragen, die es wirklich gibt)
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO test_questions (test_id, question_id)
+            SELECT ?, q.id
+            FROM json_each(?) j
+            JOIN questions q ON q.id = j.value;
+            """,
+            (test_id, ids),
         )
 
-    conn.commit()
-    conn.close()
+        unbekannt = conn.execute(
+            """
+            SELECT j.value FROM json_each(?) j
+            WHERE NOT EXISTS (SELECT 1 FROM questions q WHERE q.id = j.value);
+            """,
+            (ids,),
+        ).fetchall()
+
+    return [int(r[0]) for r in unbekannt]
 
 
 def test_bearbeiten_mit_editor(test_id):
@@ -254,15 +370,18 @@ def test_bearbeiten_mit_editor(test_id):
     - tests.title / tests.test_date aktualisiert
     - test_questions passend gesetzt (exakt)
 
+    Hat jemand anderes den Test (Titel, Datum oder Fragen) geändert, während
+    der Editor offen war, wird nichts überschrieben.
+
     Rückgabe: True wenn gespeichert, False sonst.
     """
 
-    row = test_holen(test_id)
+    row = test_holen(test_id, mit_version=True)
     if row is None:
         print("Diese Test-ID gibt es nicht.")
         return False
 
-    _, title, test_date = row
+    _, title, test_date, version = row
     test_date = test_date or ""  # falls NULL in DB
 
     frage_ids = fragen_ids_von_test(test_id)
@@ -283,6 +402,10 @@ def test_bearbeiten_mit_editor(test_id):
         f"questions: {' '.join(str(x) for x in frage_ids)}\n"
     )
 
+    # Nur hier gebraucht -> erst hier importieren (schnellerer Programmstart)
+    import subprocess   # Um nvim zu starten
+    import tempfile     # Für eine temporäre Datei zum Editieren
+
     editor = os.getenv("EDITOR", "nvim")
 
     # Temp-Datei anlegen
@@ -291,6 +414,7 @@ def test_bearbeiten_mit_editor(test_id):
         tf.write(initial)
         filename = tf.name
 
+    behalten = False
     try:
         # Editor öffnen
         result = subprocess.run([editor, filename])
@@ -330,17 +454,49 @@ def test_bearbeiten_mit_editor(test_id):
 
         neue_frage_ids = _parse_id_liste(new_q_raw) if new_q_raw else []
 
-        # Speichern in DB
-        test_update(test_id, new_title, new_date)
-        test_fragen_setzen(test_id, neue_frage_ids)
+        # Speichern in DB: Titel/Datum UND Fragen in EINER Transaktion
+        try:
+            with transaktion():
+                test_update(test_id, new_title, new_date, version=version)
+                # Die Fragen haben keine eigene Version (test_questions ändern viele,
+                # z.B. Menü, Stapel, Abgleich) -> Liste von damals mit jetzt vergleichen
+                jetzt = fragen_ids_von_test(test_id)
+                if jetzt != frage_ids:
+                    raise VersionsKonflikt("test_questions", test_id, frage_ids, jetzt)
+                unbekannt = test_fragen_setzen(test_id, neue_frage_ids)
+        except VersionsKonflikt as e:
+            # Nichts überschreiben, aber die Arbeit nicht wegwerfen
+            behalten = True
+            if e.jetzt is None:
+                print("⚠️  Der Test wurde inzwischen gelöscht. Nichts gespeichert.")
+            else:
+                print("⚠️  Der Test wurde inzwischen von jemand anderem geändert. Nichts gespeichert.")
+            print(f"Deine Änderungen liegen noch in: {filename}")
+            return False
 
         print("✅ Test gespeichert.")
+        if unbekannt:
+            print(f"   Unbekannte Frage-IDs ignoriert: {' '.join(str(x) for x in unbekannt)}")
         return True
 
     finally:
-        # Temp-Datei löschen
-        try:
-            os.remove(filename)
-        except OSError:
-            pass
+        # Temp-Datei löschen (außer bei Konflikt)
+        if not behalten:
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+
+def test_fragen_bearbeiten(test_id):
+    """
+    Alle Fragen eines Tests in EINEM Editor bearbeiten (Text + Lösung).
+    Rückgabe: wie fragen.fragen_bearbeiten_mit_editor(), None wenn es den Test nicht gibt
+    """
+
+    test_row, questions = test_anzeigen(test_id)
+    if test_row is None:
+        print("Diese Test-ID gibt es nicht.")
+        return None
 
+    return fragen_bearbeiten_mit_editor(questions, f"Fragen von Test {test_id} ({test_row[1]}) bearbeiten")
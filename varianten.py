@@ -0,0 +1,308 @@
+# varianten.py
+# Erzeugt aus einem Test viele Varianten (z.B. eine pro Schüler):
+# andere Reihenfolge der Fragen und der Antwortmöglichkeiten.
+#
+# Für dumme:
+# - varianten_erzeugen(12, 30) -> 30 Varianten von Test 12, gespeichert in
+#   der Tabelle test_variants (nur die Reihenfolge, nicht der ganze Text).
+# - Mit verzeichnis="druck/" kommt zusätzlich jede Variante als eigene
+#   Datei dorthin (HTML/Markdown/LaTeX, siehe rendern.py).
+# - Gleicher seed -> genau dieselben Varianten (z.B. um Variante 17
+#   nochmal zu drucken). Jede Variante hat ihren eigenen Seed, der aus
+#   seed + Test-ID + Nummer berechnet wird.
+#
+# Antwortmöglichkeiten: stehen im Fragetext Zeilen wie
+#     a) Pumpe
+#     b) Ventil
+#     c) Zylinder
+# werden diese gemischt und neu beschriftet. Steht in der Lösung nur
+# "b" (oder "a, c"), wird die Lösung passend umgeschrieben.
+#
+# Warum mehrere Prozesse?
+# - Das Zusammenbauen und Schreiben von hunderten Dokumenten ist reine
+#   Python-Arbeit. Ein Prozess nutzt nur einen Kern (GIL), mit
+#   ProcessPoolExecutor arbeiten alle Kerne gleichzeitig.
+# - Der Test wird nur EINMAL aus der DB geladen und jedem Prozess beim
+#   Start mitgegeben (initializer). Die Arbeit wird in Blöcken verteilt
+#   (nicht jede Variante einzeln -> weniger Hin und Her zwischen Prozessen).
+# - Die Prozesse fassen die DB nicht an. Gespeichert wird am Ende vom
+#   Hauptprozess, alle Varianten mit EINEM executemany.
+
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import rendern
+from datenbank import transaktion, verbindung
+from tests import test_anzeigen
+
+
+ARBEITER = os.cpu_count() or 1
+# So viele Prozesse (Standard: ein Prozess pro Kern)
+
+PARALLEL_AB = 20
+# Weniger Varianten lohnen den Start der Prozesse nicht
+
+BLOECKE_PRO_ARBEITER = 4
+# Jeder Prozess bekommt ~4 Blöcke: gleicht aus, wenn ein Block länger dauert
+
+_OPTION = re.compile(r"^\s*([a-zA-Z])[).]\s+(\S.*?)\s*$")
+_NUR_BUCHSTABEN = re.compile(r"^\s*[a-zA-Z](\s*[,;/ ]\s*[a-zA-Z])*\s*$")
+
+
+# --------------------------------------------
+# Antwortmöglichkeiten
+# --------------------------------------------
+def _optionen(text):
+    """
+    Sucht die Antwortmöglichkeiten "a) ...", "b) ...", ... im Fragetext.
+    Sie müssen direkt untereinander stehen und bei a anfangen.
+
+    Rückgabe: (zeilen_davor, [optionen], zeilen_danach) oder None (keine/nur eine)
+    """
+
+    zeilen = str(text).splitlines()
+    for start, zeile in enumerate(zeilen):
+        m = _OPTION.match(zeile)
+        if m is None or m.group(1).lower() != "a":
+            continue
+        optionen = []
+        for z in zeilen[start:]:
+            m = _OPTION.match(z)
+            if m is None or m.group(1).lower() != chr(ord("a") + len(optionen)):
+                break
+            optionen.append(m.group(2))
+        if len(optionen) >= 2:
+            return zeilen[:start], optionen, zeilen[start + len(optionen):]
+        return None
+    return None
+
+
+def _loesung_umschreiben(loesung, perm):
+    """
+    "b" -> neuer Buchstabe von b nach dem Mischen. perm[neu] = alt.
+    Andere Lösungen (Text) bleiben wie sie sind.
+    """
+
+    if not loesung or _NUR_BUCHSTABEN.match(loesung) is None:
+        return loesung
+    alt = [ord(b) - ord("a") for b in re.findall(r"[a-zA-Z]", loesung.lower())]
+    if any(x >= len(perm) for x in alt):
+        return loesung
+    neu = sorted(perm.index(x) for x in alt)
+    return ", ".join(chr(ord("a") + x) for x in neu)
+
+
+def _frage_mit_optionen(frage, loesung, teile, perm):
+    """Fragetext mit gemischten, neu beschrifteten Optionen + passende Lösung."""
+    davor, optionen, danach = teile
+    neu = [f"{chr(ord('a') + i)}) {optionen[alt]}" for i, alt in enumerate(perm)]
+    return "\n".join(davor + neu + danach), _loesung_umschreiben(loesung, perm)
+
+
+# --------------------------------------------
+# Eine Variante
+# --------------------------------------------
+def _seed(basis, test_id, nummer):
+    """Eigener, reproduzierbarer Seed pro Variante (63 Bit)."""
+    h = hashlib.blake2b(f"{basis}\0{test_id}\0{nummer}".encode(), digest_size=8)
+    return int.from_bytes(h.digest(), "big") >> 1
+
+
+def _reihenfolge(fragen, optionen, seed):
+    """
+    Würfelt eine Variante: [[frage_index, [optionen-reihenfolge]], ...]
+    (frage_index = Position in `fragen`, wird beim Speichern zur Frage-ID)
+    """
+
+    rng = random.Random(seed)
+    indizes = list(range(len(fragen)))
+    rng.shuffle(indizes)
+
+    ergebnis = []
+    for i in indizes:
+        perm = []
+        if optionen[i] is not None:
+            perm = list(range(len(optionen[i][1])))
+            rng.shuffle(perm)
+        ergebnis.append([i, perm])
+    return ergebnis
+
+
+# --------------------------------------------
+# Arbeit in den Prozessen
+# --------------------------------------------
+_daten = None
+# Der Test (einmal pro Prozess gesetzt, siehe _init)
+
+
+def _init(daten):
+    global _daten
+    _daten = daten
+
+
+def _block_erzeugen(nummern):
+    """
+    Erzeugt die Varianten `nummern` (und schreibt ggf. die Dateien).
+    Rückgabe: Liste von (test_id, nummer, seed, reihenfolge_json) zum Speichern
+    """
+
+    d = _daten
+    fragen, optionen, fragmente = d["fragen"], d["optionen"], d["fragmente"]
+    fragment = rendern._FRAGMENT_FUNKTIONEN[d["format"]]
+
+    zeilen = []
+    for nummer in nummern:
+        seed = _seed(d["seed"], d["test_id"], nummer)
+        reihenfolge = _reihenfolge(fragen, optionen, seed)
+
+        if d["verzeichnis"] is not None:
+            teile = []
+            for i, perm in reihenfolge:
+                if perm:
+                    # Gemischte Optionen: dieses Fragment gibt es nur in dieser Variante
+                    _, q, s = fragen[i]
+                    q, s = _frage_mit_optionen(q, s, optionen[i], perm)
+                    teile.append(fragment(q, s or "", d["mit_loesung"]))
+                else:
+                    teile.append(fragmente[i])
+            text = rendern.dokument(
+                f"{d['titel']} – Variante {nummer}", d["datum"], teile, d["format"], d["mit_loesung"]
+            )
+            name = dateiname(d["test_id"], nummer, d["format"], d["mit_loesung"])
+            with open(os.path.join(d["verzeichnis"], name), "w", encoding="utf-8") as f:
+                f.write(text)
+
+        gespeichert = [[fragen[i][0], perm] for i, perm in reihenfolge]
+        zeilen.append((d["test_id"], nummer, seed, json.dumps(gespeichert, separators=(",", ":"))))
+    return zeilen
+
+
+def dateiname(test_id, nummer, format="html", mit_loesung=False):
+    """z.B. test12_variante007.html"""
+    endung = {"html": "html", "markdown": "md", "latex": "tex"}[format]
+    return f"test{test_id}_variante{nummer:03d}{'_loesungen' if mit_loesung else ''}.{endung}"
+
+
+def _bloecke(anzahl, arbeiter):
+    """1..anzahl in ungefähr gleich große Blöcke teilen."""
+    groesse = max(1, -(-anzahl // (arbeiter * BLOECKE_PRO_ARBEITER)))
+    return [range(a, min(a + groesse, anzahl + 1)) for a in range(1, anzahl + 1, groesse)]
+
+
+# --------------------------------------------
+# Öffentlich
+# --------------------------------------------
+def varianten_erzeugen(test_id, anzahl, seed=0, verzeichnis=None, format="html",
+                       mit_loesung=False, arbeiter=None):
+    """
+    Erzeugt `anzahl` Varianten von Test `test_id` (Nummer 1..anzahl).
+    Alte Varianten dieses Tests werden ersetzt.
+
+    verzeichnis: wenn angegeben, jede Variante auch als Datei (format wie rendern.py)
+    arbeiter:    Anzahl Prozesse (Standard: ARBEITER, 1 = alles in diesem Prozess)
+
+    Rückgabe: {"varianten": n, "sekunden": s, "arbeiter": n, "dateien": n}
+    oder None, wenn es den Test nicht gibt.
+    """
+
+    if format not in rendern.FORMATE:
+        raise ValueError(f"Unbekanntes Format: {format} (erlaubt: {', '.join(rendern.FORMATE)})")
+
+    start = time.perf_counter()
+
+    test_row, fragen = test_anzeigen(test_id)
+    if test_row is None:
+        return None
+
+    daten = {
+        "test_id": test_id,
+        "titel": test_row[1],
+        "datum": test_row[2],
+        "seed": seed,
+        "fragen": fragen,
+        "optionen": [_optionen(q) for _, q, _ in fragen],
+        "format": format,
+        "mit_loesung": mit_loesung,
+        "verzeichnis": verzeichnis,
+        "fragmente": None,
+    }
+
+    if verzeichnis is not None:
+        os.makedirs(verzeichnis, exist_ok=True)
+        # Fragen ohne Optionen sehen in jeder Variante gleich aus:
+        # einmal rendern (bzw. aus dem render_cache holen), nicht 500x.
+        daten["fragmente"], _ = rendern._fragmente(fragen, format, mit_loesung)
+
+    arbeiter = max(1, arbeiter or ARBEITER)
+    if anzahl < PARALLEL_AB:
+        arbeiter = 1
+
+    zeilen = []
+    if arbeiter == 1:
+        _init(daten)
+        zeilen = _block_erzeugen(range(1, anzahl + 1))
+    else:
+        with ProcessPoolExecutor(max_workers=arbeiter, initializer=_init, initargs=(daten,)) as pool:
+            for block in pool.map(_block_erzeugen, _bloecke(anzahl, arbeiter)):
+                zeilen += block
+
+    with transaktion() as conn:
+        conn.execute("DELETE FROM test_variants WHERE test_id = ?;", (test_id,))
+        conn.executemany(
+            "INSERT INTO test_variants (test_id, nummer, seed, reihenfolge) VALUES (?, ?, ?, ?);",
+            zeilen,
+        )
+
+    return {
+        "varianten": len(zeilen),
+        "sekunden": time.perf_counter() - start,
+        "arbeiter": arbeiter,
+        "dateien": len(zeilen) if verzeichnis is not None else 0,
+    }
+
+
+def variante_holen(test_id, nummer):
+    """
+    Eine gespeicherte Variante mit den AKTUELLEN Fragetexten.
+
+    Rückgabe: (test_row, fragen) wie test_anzeigen(), Fragen in der Reihenfolge
+    der Variante und mit gemischten Optionen. (None, []) wenn es sie nicht gibt.
+    """
+
+    row = verbindung().execute(
+        "SELECT reihenfolge FROM test_variants WHERE test_id = ? AND nummer = ?;",
+        (test_id, nummer),
+    ).fetchone()
+    if row is None:
+        return None, []
+
+    test_row, fragen = test_anzeigen(test_id)
+    if test_row is None:
+        return None, []
+
+    nach_id = {f[0]: f for f in fragen}
+    ergebnis = []
+    for qid, perm in json.loads(row[0]):
+        frage = nach_id.get(qid)
+        if frage is None:
+            continue  # Frage wurde inzwischen aus dem Test genommen
+        _, q, s = frage
+        teile = _optionen(q)
+        # Nur mischen, wenn die Optionen noch zur gespeicherten Reihenfolge passen
+        if perm and teile is not None and len(teile[1]) == len(perm):
+            q, s = _frage_mit_optionen(q, s, teile, perm)
+        ergebnis.append((qid, q, s))
+
+    return test_row, ergebnis
+
+
+def varianten_von_test(test_id):
+    """Rückgabe: Liste von (nummer, seed) aller gespeicherten Varianten."""
+    return verbindung().execute(
+        "SELECT nummer, seed FROM test_variants WHERE test_id = ? ORDER BY nummer;", (test_id,)
+    ).fetchall()
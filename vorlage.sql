@@ -1,6 +1,8 @@
 -- vorlage.sql
 -- Dieses SQL-Skript erstellt alle Tabellen, die wir brauchen.
--- Wir führen es EINMAL aus, um datenbank.db zu "befüllen" (Schema anlegen).
+-- datenbank.py führt es automatisch aus, wenn datenbank.db neu ist (PRAGMA user_version = 0).
+-- Spätere Änderungen (Indizes, neue Tabellen, ...) stehen NICHT hier,
+-- sondern als nummerierte Migrationen in datenbank.MIGRATIONEN.
 
 -- WICHTIG (für dumme):
 -- SQLite hat Foreign Keys NICHT automatisch aktiv.